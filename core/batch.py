@@ -0,0 +1,139 @@
+# core/batch.py
+"""
+Simulaciones headless por lote para balancear poderes.
+
+Un job es un dict serializable (se manda a otro proceso):
+    {"id": 0,
+     "level": "levels.test_level:TestLevel",
+     "powers": {"rayo": {"cooldown_ms": 150, "damage": 2}},   # overrides por poder
+     "rotation": ["rayo", "golpe"],    # poderes a lanzar, en ciclo
+     "cast_every_ms": 200,             # intervalo entre intentos de lanzamiento
+     "hz": 30, "max_seconds": 60}
+El jugador se mueve solo hacia el enemigo vivo más cercano (política "seek").
+Cada proceso del pool corre jobs completos e independientes: escala con los núcleos.
+"""
+import os, time
+from concurrent.futures import ProcessPoolExecutor
+from core.input import pack_intents
+
+POWER_PARAMS = ("energy_cost", "cooldown_ms", "speed", "damage", "lifespan")
+
+
+def _init_worker():
+    from core.headless import init_headless
+    init_headless()
+
+
+class SeekPolicy:
+    """Camina hacia el enemigo vivo más cercano; salta si está más arriba o si se atasca."""
+    def __init__(self, level):
+        self.level = level
+        self._last_x = None
+
+    def __call__(self) -> int:
+        p = self.level.player
+        target, best = None, None
+        for e in self.level.enemies:
+            d = abs(e.rect.centerx - p.rect.centerx) + abs(e.rect.centery - p.rect.centery)
+            if best is None or d < best:
+                target, best = e, d
+        if target is None:
+            return 0
+        dx = target.rect.centerx - p.rect.centerx
+        stuck = abs(dx) > 8 and p.rect.x == self._last_x
+        self._last_x = p.rect.x
+        # el salto va por flanco: soltarlo un tick entre saltos
+        jump = (stuck or target.rect.bottom < p.rect.top + 40) and not p.input.down("jump")
+        return pack_intents({"move_left": dx < -8, "move_right": dx > 8, "jump": jump})
+
+
+def run_job(job: dict) -> dict:
+    from core.headless import HeadlessGame
+    from core.replay import load_level_class
+    from engine.powers import CasterPowers
+
+    level = load_level_class(job.get("level", "levels.test_level:TestLevel"))(HeadlessGame())
+    player = level.player
+    book = player.powers.book
+    for name, params in job.get("powers", {}).items():
+        if book.id_of(name) < 0:
+            raise ValueError(f"[batch] poder desconocido: {name}")
+        for k in params:
+            if k not in POWER_PARAMS:
+                raise ValueError(f"[batch] parámetro desconocido: {k}")
+    rotation = job.get("rotation") or ["golpe"]
+    # definiciones modificadas sólo para este lanzador (el libro compartido no se toca)
+    unlocked = set(player.powers.unlocked_names()) | set(job.get("powers", {})) | set(rotation)
+    player.powers = CasterPowers(book.with_overrides(job.get("powers", {})), unlocked=unlocked)
+    rotation_ids = [player.powers.book.id_of(n) for n in rotation]
+    every = job.get("cast_every_ms", 200)
+    dt = 1.0 / job.get("hz", 30)
+    max_ms = job.get("max_seconds", 60) * 1000.0
+
+    level.input_source = SeekPolicy(level)
+    level.voice_source = lambda: []
+    level.rewind = None   # sin historia de rebobinado: sólo cuesta tiempo por tick
+
+    start_enemies = len(level.enemies)
+    stats = {"casts": 0, "rejected_cooldown": 0, "rejected_energy": 0, "energy_used": 0.0}
+    next_cast, rot_i = 0.0, 0
+    t0 = time.perf_counter()
+    cleared_ms = None
+    while level.clock.ms < max_ms:
+        level.update(dt)
+        if not level.enemies:
+            cleared_ms = level.clock.ms
+            break
+        now = level.now_ms()
+        if now >= next_cast:
+            next_cast = now + every
+            pid = rotation_ids[rot_i % len(rotation_ids)]
+            rot_i += 1
+            spec = player.powers.book.specs[pid]
+            if not player.powers.ready(pid, now):
+                stats["rejected_cooldown"] += 1
+            elif not player.energy_pool.can_spend(spec.energy_cost):
+                stats["rejected_energy"] += 1
+            elif player.try_power(pid, level):
+                stats["casts"] += 1
+                stats["energy_used"] += spec.energy_cost
+
+    return {"id": job.get("id"), "params": job.get("powers", {}), "rotation": rotation,
+            "time_to_clear": None if cleared_ms is None else cleared_ms / 1000.0,
+            "enemies_killed": start_enemies - len(level.enemies), "enemies_left": len(level.enemies),
+            "sim_seconds": level.clock.seconds,
+            "wall_seconds": time.perf_counter() - t0, **stats}
+
+
+def run_batch(jobs, workers: int = None):
+    """Corre los jobs en un pool de procesos; devuelve resultados en el orden de los jobs."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker()
+        return [run_job(j) for j in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(run_job, jobs, chunksize=1))
+
+
+def aggregate(results) -> list:
+    """Agrupa por combinación de parámetros (+rotación) y promedia."""
+    groups = {}
+    for r in results:
+        key = (repr(sorted((n, sorted(p.items())) for n, p in r["params"].items())), tuple(r["rotation"]))
+        groups.setdefault(key, []).append(r)
+    out = []
+    for (_, rotation), rs in groups.items():
+        cleared = [r["time_to_clear"] for r in rs if r["time_to_clear"] is not None]
+        n = len(rs)
+        out.append({
+            "params": rs[0]["params"], "rotation": list(rotation), "runs": n,
+            "clear_rate": len(cleared) / n,
+            "mean_time_to_clear": sum(cleared) / len(cleared) if cleared else None,
+            "mean_killed": sum(r["enemies_killed"] for r in rs) / n,
+            "mean_casts": sum(r["casts"] for r in rs) / n,
+            "mean_energy_used": sum(r["energy_used"] for r in rs) / n,
+            "mean_rejected_cooldown": sum(r["rejected_cooldown"] for r in rs) / n,
+            "mean_rejected_energy": sum(r["rejected_energy"] for r in rs) / n,
+        })
+    out.sort(key=lambda a: (a["mean_time_to_clear"] is None, a["mean_time_to_clear"] or 0))
+    return out
@@ -0,0 +1,56 @@
+# core/clock.py
+from core.config import SIM_MAX_STEP
+
+
+class GameClock:
+    """
+    Reloj de simulación. No lee el reloj real: avanza sólo con tick(dt).
+    SceneManager convierte el dt real de cada frame en pasos simulados con steps():
+    pausa → ningún paso; cámara lenta / avance rápido → dt escalado, partido en pasos
+    de a lo sumo 'max_step' para que la física no dé saltos grandes.
+    """
+    def __init__(self, max_step: float = SIM_MAX_STEP):
+        self.ms = 0.0          # tiempo simulado acumulado
+        self.ticks = 0
+        self.scale = 1.0
+        self.paused = False
+        self.max_step = max_step
+
+    @property
+    def now_ms(self) -> int:
+        return int(self.ms)
+
+    @property
+    def seconds(self) -> float:
+        return self.ms / 1000.0
+
+    def tick(self, dt: float):
+        """Avanza el tiempo simulado (lo llama la escena al inicio de su update)."""
+        self.ms += dt * 1000.0
+        self.ticks += 1
+
+    def steps(self, real_dt: float) -> list:
+        if self.paused or real_dt <= 0:
+            return []
+        total = real_dt * self.scale
+        out = []
+        while total > self.max_step:
+            out.append(self.max_step)
+            total -= self.max_step
+        if total > 1e-9:
+            out.append(total)
+        return out
+
+    # ---------- Controles ----------
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def toggle_pause(self) -> bool:
+        self.paused = not self.paused
+        return self.paused
+
+    def set_scale(self, scale: float):
+        self.scale = max(0.0, scale)
@@ -1,11 +1,22 @@
 # core/config.py
 VIRTUAL_W, VIRTUAL_H = 1920, 1080   # 16:9 virtual
 FPS = 60
+SIM_MAX_STEP = 0.05     # s: paso máximo de simulación (también tope del dt real)
+REWIND_SECONDS = 10         # historia de snapshots por tick (0 = sin rebobinado)
+REWIND_KEYFRAME_EVERY = 60  # ticks entre snapshots completos (el resto son deltas)
+REWIND_STEP = 1.0           # s que retrocede cada pulsación de Backspace
 
 # Voz
 MIC_DEVICE_INDEX = None
 MIC_LANGUAGE = "es-ES"
 
+# Red (servidor headless autoritativo + clientes que sólo dibujan; ver core/net.py)
+NET_PORT        = 47777
+NET_TICK_HZ     = 30      # ticks de simulación (y snapshots) por segundo en el servidor
+NET_INTERP_MS   = 100     # el cliente dibuja este tiempo atrás del último snapshot (≈3 ticks)
+NET_MAX_PAYLOAD = 1200    # bytes por datagrama (bajo el MTU típico); lo que no entra va el tick siguiente
+NET_TIMEOUT_S   = 5.0     # cliente sin paquetes este tiempo → se lo da de baja
+
 # Ventana
 FULLSCREEN  = False   
 BORDERLESS  = True 
@@ -13,6 +24,10 @@ USE_SCALED = True          # escala la resolución lógica a la pantalla
 # Escalado final
 SCALE_MODE = "integer_smooth"   # "integer_smooth" | "smooth_only" | "pixel_crisp"
 LETTERBOX  = True                # barras si no llena exacto
+PRESENT_PIPELINED = False        # escalar + flip en un hilo aparte (ver core/present.py)
+DYNAMIC_RES = True               # baja la resolución interna si no se llega a FPS
+RES_SCALES  = (1.0, 0.85, 0.75, 0.6, 0.5)   # escalones de resolución interna
+RES_UPSCALE = "nearest"          # filtro al reescalar con escala < 1 ("nearest" | "smooth"; smooth cuesta 3-7x)
 
 
 # Colores
@@ -29,16 +44,40 @@ DASH_COOLDOWN   = 0.65       # s
 GRAVITY         = 1400       # px/s^2
 MAX_FALL_SPEED  = 900        # px/s
 
+# Entrada: una pulsación se recuerda este tiempo si aún no se puede ejecutar
+JUMP_BUFFER_MS   = 120       # salto pulsado justo antes de aterrizar
+ATTACK_BUFFER_MS = 150       # ataque pulsado durante el cooldown del golpe
+
 # (Opcional) Energía defaults (por si luego quieres leerlos desde aquí)
 ENERGY_MAX      = 100.0
 ENERGY_REGEN    = 12.0       # por segundo
+POWERS_FILE     = "engine/data/powers.json"   # tabla de definiciones de poderes
+STATUS_FILE     = "engine/data/status.json"   # tag de poder → estado alterado
 
 #Sprites
 ASSETS_DIR   = "assets"
 PLAYER_W, PLAYER_H = 128, 128
 DRAW_HITBOX  = False
 SPRITE_SMOOTHING = False   # True = smoothscale, False = scale “crisp”
+IMAGE_CACHE_MB   = 64      # presupuesto de la caché de imágenes (lo fijado por escenas no cuenta para expulsar)
+SCENE_WARM_SLOTS = 2       # escenas recién construidas que se guardan listas (reintento instantáneo)
+PARTICLES_MAX    = 8000    # partículas vivas a la vez (~4 ms de dibujo a 1080p); las ráfagas se recortan
 
 # HUD
 HUD_FONT_SMALL = 20
-HUD_FONT_BIG   = 24
\ No newline at end of file
+HUD_FONT_BIG   = 24
+HUD_FONT_LABEL = 18
+HUD_FONT_TITLE = 22
+TEXT_CACHE_SIZE = 256   # superficies de texto en caché (LRU)
+
+# Cámara / mundo
+CAMERA_DEADZONE = (480, 270)   # px (ancho, alto) centrados en la vista
+SPATIAL_CELL    = 256          # tamaño de celda del índice espacial de tiles
+BROADPHASE_CELL = 128          # celda del broadphase de entidades (más chica: enemigos/balas miden <128 px)
+
+# Streaming de niveles por chunks
+LEVELS_DIR        = "levels/data"
+CHUNK_TILES       = 16   # tiles por lado de cada chunk
+CHUNK_LOAD_RADIUS = 1    # chunks extra alrededor de la vista que se precargan
+CHUNK_KEEP_RADIUS = 2    # más allá de esto se descargan
+LEVEL_CACHE_DIR   = "levels/.cache"   # niveles compilados (.lvlc), regenerables
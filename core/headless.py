@@ -0,0 +1,28 @@
+# core/headless.py
+"""
+Arranque sin ventana para benchmarks, simulaciones por lote y replays.
+Usa el driver 'dummy' de SDL: se puede crear el display (convert_alpha funciona)
+pero nada se muestra.
+"""
+import os
+import pygame
+from core.config import VIRTUAL_W, VIRTUAL_H
+
+
+def init_headless():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+    from core.resources import load_fonts
+    load_fonts()
+
+
+class HeadlessGame:
+    """Sustituto mínimo de main.Game: lo que los niveles leen de 'game'."""
+    def __init__(self):
+        init_headless()
+        self.screen = pygame.Surface((VIRTUAL_W, VIRTUAL_H))
+        self.canvas = pygame.Surface((VIRTUAL_W, VIRTUAL_H)).convert_alpha()
+        self.voice = None
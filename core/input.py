@@ -1,5 +1,18 @@
 # core/input.py
+"""
+Entrada por eventos.
+
+KeyboardInput (plataforma) consume la cola de eventos de SDL antes de simular y entrega
+un entero por tick: bits bajos = teclas mantenidas + las pulsadas desde el último tick
+(un toque más corto que un frame igual cuenta un tick); bits desde PRESS_SHIFT = teclas
+pulsadas desde el último tick (así soltar y volver a pulsar entre dos ticks no se pierde).
+ActionState (simulación) deriva los flancos pressed/released y guarda, en tiempo de juego,
+cuándo se pulsó cada acción para los buffers de salto/ataque. Como todo sale de la
+máscara, grabación y replay siguen siendo deterministas.
+"""
+import time
 import pygame
+from core import metrics
 
 KEYMAP = {
     "LEFT": pygame.K_a,
@@ -17,21 +30,127 @@ KEYMAP = {
     "MENU": pygame.K_ESCAPE,
 }
 
+# Orden fijo de intents: bit i de la máscara = INTENT_NAMES[i] (grabación/replay)
+INTENT_NAMES = ("move_left", "move_right", "move_down", "jump", "attack", "skill1", "skill2",
+                "interact", "dash", "power_prev", "power_next", "open_map", "open_menu")
+BIT = {name: 1 << i for i, name in enumerate(INTENT_NAMES)}
+PRESS_SHIFT = 16
+HELD_MASK = (1 << PRESS_SHIFT) - 1
+
+# tecla lógica (KEYMAP) → intent
+_KEY_INTENT = (("LEFT", "move_left"), ("RIGHT", "move_right"), ("DOWN", "move_down"),
+               ("JUMP", "jump"), ("ATTACK", "attack"), ("SKILL1", "skill1"), ("SKILL2", "skill2"),
+               ("INTERACT", "interact"), ("DASH", "dash"), ("POWER_PREV", "power_prev"),
+               ("POWER_NEXT", "power_next"), ("MAP", "open_map"), ("MENU", "open_menu"))
+
+
 def read_intents() -> dict:
-    """Devuelve un diccionario de 'intents' booleanos para el frame actual."""
+    """Devuelve un diccionario de 'intents' booleanos para el frame actual (sondeo, sin flancos)."""
     keys = pygame.key.get_pressed()
-    return {
-        "move_left":  keys[KEYMAP["LEFT"]],
-        "move_right": keys[KEYMAP["RIGHT"]],
-        "move_down":  keys[KEYMAP["DOWN"]],
-        "jump":       keys[KEYMAP["JUMP"]],
-        "attack":     keys[KEYMAP["ATTACK"]],
-        "skill1":     keys[KEYMAP["SKILL1"]],
-        "skill2":     keys[KEYMAP["SKILL2"]],
-        "interact":   keys[KEYMAP["INTERACT"]],
-        "dash":       keys[KEYMAP["DASH"]],
-        "power_prev": keys[KEYMAP["POWER_PREV"]],
-        "power_next": keys[KEYMAP["POWER_NEXT"]],
-        "open_map":   keys[KEYMAP["MAP"]],
-        "open_menu":  keys[KEYMAP["MENU"]],
-    }
+    return {intent: keys[KEYMAP[key]] for key, intent in _KEY_INTENT}
+
+def pack_intents(intents: dict) -> int:
+    mask = 0
+    for i, name in enumerate(INTENT_NAMES):
+        if intents.get(name):
+            mask |= 1 << i
+    return mask
+
+def unpack_intents(mask: int) -> dict:
+    return {name: bool(mask >> i & 1) for i, name in enumerate(INTENT_NAMES)}
+
+
+class KeyboardInput:
+    """
+    Eventos KEYDOWN/KEYUP → máscara. La escena le pasa los eventos en handle_events
+    (antes del update) y el nivel la lee con poll() en cada paso de simulación.
+    """
+    STALE_S = 0.5   # pulsaciones que nunca se ejecutaron: no cuentan para la latencia
+
+    def __init__(self, keymap=KEYMAP):
+        self.held = 0
+        self._taps = 0      # pulsadas desde el último poll (aunque ya se hayan soltado)
+        self._stamps = {}   # bit -> perf_counter del KEYDOWN aún sin ejecutar
+        self._bits = {keymap[key]: BIT[intent] for key, intent in _KEY_INTENT}
+
+    def feed(self, events):
+        now = time.perf_counter()
+        bits = self._bits
+        for e in events:
+            if e.type == pygame.KEYDOWN:
+                bit = bits.get(e.key)
+                if bit and not self.held & bit:   # ignora autorepetición
+                    self.held |= bit
+                    self._taps |= bit
+                    self._stamps[bit] = now
+            elif e.type == pygame.KEYUP:
+                bit = bits.get(e.key)
+                if bit:
+                    self.held &= ~bit
+            elif e.type == pygame.WINDOWFOCUSLOST:
+                # sin foco no llegan los KEYUP: soltar todo para que no queden teclas pegadas
+                self.held = 0
+
+    def poll(self) -> int:
+        taps = self._taps
+        mask = self.held | taps | taps << PRESS_SHIFT
+        self._taps = 0
+        if self._stamps:
+            old = time.perf_counter() - self.STALE_S
+            for bit in [b for b, t in self._stamps.items() if t < old]:
+                del self._stamps[bit]
+        return mask
+
+    def acted(self, fired: int):
+        """La simulación avisa qué acciones ejecutó este tick: latencia evento → acción."""
+        if not fired or not self._stamps:
+            return
+        now = time.perf_counter()
+        for bit in [b for b in self._stamps if fired & b]:
+            ms = (now - self._stamps.pop(bit)) * 1000.0
+            metrics.gauge("input_latency_ms", round(ms, 2))
+            metrics.incr("input_actions")
+
+
+class ActionState:
+    """Estado de acciones de un tick (lo mantiene el jugador; tiempos en ms de juego)."""
+    __slots__ = ("held", "pressed", "released", "fired", "_pressed_at")
+
+    def __init__(self):
+        self.held = 0
+        self.pressed = 0
+        self.released = 0
+        self.fired = 0          # acciones ejecutadas este tick (para la latencia)
+        self._pressed_at = {}   # bit -> now_ms de la última pulsación sin consumir
+
+    def step(self, bits: int, now_ms: float):
+        prev = self.held
+        self.held = held = bits & HELD_MASK
+        self.pressed = (held & ~prev) | bits >> PRESS_SHIFT
+        self.released = prev & ~held
+        self.fired = 0
+        p = self.pressed
+        while p:
+            bit = p & -p
+            self._pressed_at[bit] = now_ms
+            p ^= bit
+
+    def down(self, name: str) -> bool:
+        return bool(self.held & BIT[name])
+
+    def just_pressed(self, name: str) -> bool:
+        return bool(self.pressed & BIT[name])
+
+    def just_released(self, name: str) -> bool:
+        return bool(self.released & BIT[name])
+
+    def buffered(self, name: str, now_ms: float, window_ms: float) -> bool:
+        """¿Se pulsó 'name' hace a lo sumo window_ms y todavía no se consumió?"""
+        t = self._pressed_at.get(BIT[name])
+        return t is not None and now_ms - t <= window_ms
+
+    def consume(self, name: str):
+        """Marca la acción como ejecutada: sale del buffer y cuenta para la latencia."""
+        bit = BIT[name]
+        self._pressed_at.pop(bit, None)
+        self.fired |= bit
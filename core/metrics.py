@@ -0,0 +1,53 @@
+# core/metrics.py
+"""
+Instrumentación liviana (global): contadores, gauges y tasas por segundo.
+  incr("x")        → contador acumulado + tasa por segundo (rate("x"))
+  gauge("y", v)    → último valor
+  end_frame()      → el loop principal lo llama una vez por frame para cerrar ventanas de 1 s
+"""
+import time
+
+_counters = {}
+_gauges = {}
+_rates = {}
+_window = {}
+_window_t0 = time.perf_counter()
+
+
+def incr(name: str, n: int = 1):
+    _counters[name] = _counters.get(name, 0) + n
+    _window[name] = _window.get(name, 0) + n
+
+
+def gauge(name: str, value):
+    _gauges[name] = value
+
+
+def rate(name: str) -> float:
+    return _rates.get(name, 0.0)
+
+
+def end_frame():
+    global _window_t0
+    now = time.perf_counter()
+    elapsed = now - _window_t0
+    if elapsed < 1.0:
+        return
+    for name in set(_rates) | set(_window):
+        _rates[name] = _window.get(name, 0) / elapsed
+    _window.clear()
+    _window_t0 = now
+
+
+def snapshot() -> dict:
+    out = dict(_gauges)
+    for name, total in list(_counters.items()):   # el loader de escenas también cuenta
+        out[name] = total
+        out[name + "/s"] = round(_rates.get(name, 0.0), 1)
+    return out
+
+
+def reset():
+    global _window_t0
+    _counters.clear(); _gauges.clear(); _rates.clear(); _window.clear()
+    _window_t0 = time.perf_counter()
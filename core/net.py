@@ -0,0 +1,596 @@
+# core/net.py
+"""
+Modo red: servidor headless autoritativo + clientes que sólo dibujan.
+
+El servidor corre el nivel a tick fijo (NET_TICK_HZ) y cada tick manda a cada cliente,
+por UDP, un snapshot cuantizado (enteros de 8/16 bits por campo) con sólo las entidades
+que cambiaron respecto del último snapshot que ese cliente confirmó (ack). Para cada
+cliente se recuerda lo que efectivamente se le mandó en cada tick, así un datagrama
+recortado por NET_MAX_PAYLOAD o perdido no desincroniza: lo que faltó sigue siendo
+diferencia y sale en el próximo. Sin ack (cliente nuevo o ack ya descartado) la base es
+vacía: snapshot completo.
+
+El cliente reconstruye el estado de cada tick, confirma el último y dibuja interpolando
+entre los dos snapshots alrededor de (tiempo del servidor - NET_INTERP_MS).
+
+LevelBase tiene un solo jugador: lo controla el primer cliente que se une; los demás
+miran, y todos pueden lanzar poderes por voz (las frases viajan como texto). Si el
+jugador se va, el control pasa al espectador más antiguo: cada SNAPSHOT lleva el rol
+vigente del destinatario, así el cambio llega aunque se pierdan datagramas.
+
+Un datagrama mal formado o truncado se descarta (y se cuenta en net_bad_packets) sin
+cortar la sesión.
+
+Paquetes (little-endian):
+  cliente → servidor
+    HELLO     <B>
+    INPUT     <B I seq I ack I intents B nº frases> [<B len> utf-8]...
+    BYE       <B>
+  servidor → cliente
+    WELCOME   <B B rol H hz B len> nivel ("módulo:Clase")
+    SNAPSHOT  <B I tick I base I ms I seq B rol H cambios H bajas> registros <I id>...
+"""
+import socket, struct, time
+from collections import deque
+import pygame
+from core import metrics, resources
+from core.config import (NET_PORT, NET_TICK_HZ, NET_INTERP_MS, NET_MAX_PAYLOAD, NET_TIMEOUT_S,
+                         COLOR_BG, COLOR_HUD)
+from core.input import HELD_MASK, PRESS_SHIFT, KeyboardInput
+from core.scene import Scene
+
+HELLO, INPUT, BYE, WELCOME, SNAPSHOT = 1, 2, 3, 4, 5
+ROLE_PLAYER, ROLE_SPECTATOR = 0, 1
+KIND_PLAYER, KIND_ENEMY, KIND_BULLET = 0, 1, 2
+
+# flags de cada registro
+F_ALIVE, F_MOVING, F_DASHING, F_HURT, F_GROUND = 1, 2, 4, 8, 16
+
+_INPUT    = struct.Struct("<BIIIB")
+_WELCOME  = struct.Struct("<BBHB")
+_SNAP     = struct.Struct("<BIIIIBHH")
+_REC      = struct.Struct("<IBhhBBBBbBB")   # id, tipo, x, y, w, h, hp, status, facing, flags, aux
+_ID       = struct.Struct("<I")
+
+SNAP_TELEPORT = 200   # px: saltos mayores no se interpolan (respawn, rebobinado)
+
+
+def _q16(v) -> int:
+    return max(-32768, min(32767, int(v)))
+
+
+def _u8(v) -> int:
+    return max(0, min(255, int(v)))
+
+
+def net_id(entity) -> int:
+    """Id estable mientras la entidad viva: slot y generación de su handle del registro."""
+    h = entity.handle
+    return (h.gen & 0xFFFF) << 16 | (h.slot & 0xFFFF)
+
+
+def world_state(level) -> dict:
+    """id → registro cuantizado (tupla sin el id) de lo que un cliente necesita dibujar."""
+    now = level.clock.ms
+    p = level.player
+    flags = ((F_ALIVE if p.alive else 0) | (F_MOVING if abs(p.vel.x) > 1e-3 else 0) |
+             (F_DASHING if p.is_dashing else 0) | (F_HURT if p.is_hurt(now) else 0) |
+             (F_GROUND if p.on_ground else 0))
+    r = p.rect
+    out = {net_id(p): (KIND_PLAYER, _q16(r.x), _q16(r.y), _u8(r.w), _u8(r.h), _u8(p.hp),
+                       p.status & 0xFF, p.facing, flags, _u8(p.energy_pool.energy))}
+    for e in level.enemies:
+        if e.alive:
+            r = e.rect
+            out[net_id(e)] = (KIND_ENEMY, _q16(r.x), _q16(r.y), _u8(r.w), _u8(r.h), _u8(e.hp),
+                              e.status & 0xFF, e.facing, F_ALIVE, _u8(e.max_hp))
+    for b in level.bullets:
+        if b.alive:
+            r = b.rect
+            out[net_id(b)] = (KIND_BULLET, _q16(r.x), _q16(r.y), _u8(r.w), _u8(r.h), 0,
+                              0, 1 if b.vel.x >= 0 else -1, F_ALIVE, 0)
+    return out
+
+
+def encode_snapshot(tick: int, base_tick: int, ms: float, seq: int, base: dict, cur: dict,
+                    budget: int = NET_MAX_PAYLOAD, role: int = ROLE_SPECTATOR):
+    """(datagrama, estado que el cliente tendrá si le llega): bajas primero, cambios hasta llenar."""
+    room = budget - _SNAP.size
+    removed = [i for i in base if i not in cur][:room // _ID.size]
+    room -= len(removed) * _ID.size
+    changed = [(i, rec) for i, rec in cur.items() if base.get(i) != rec]
+    fit = room // _REC.size
+    if len(changed) > fit:
+        # no entra todo: los jugadores siempre; el resto por turnos (ventana que avanza con el tick)
+        first = [c for c in changed if c[1][0] == KIND_PLAYER]
+        rest = [c for c in changed if c[1][0] != KIND_PLAYER]
+        k = (tick * max(1, fit - len(first))) % len(rest) if rest else 0
+        changed = (first + rest[k:] + rest[:k])[:fit]
+    view = dict(base)
+    for i in removed:
+        del view[i]
+    parts = [_SNAP.pack(SNAPSHOT, tick, base_tick, int(ms), seq, role, len(changed), len(removed))]
+    for i, rec in changed:
+        view[i] = rec
+        parts.append(_REC.pack(i, *rec))
+    parts.extend(_ID.pack(i) for i in removed)
+    return b"".join(parts), view
+
+
+def decode_snapshot(data: bytes):
+    """(tick, base, ms, seq, rol, {id: registro}, [ids dados de baja]); ValueError si está truncado."""
+    _, tick, base, ms, seq, role, n_changed, n_removed = _SNAP.unpack_from(data, 0)
+    if len(data) < _SNAP.size + n_changed * _REC.size + n_removed * _ID.size:
+        raise ValueError("[net] snapshot truncado")
+    off = _SNAP.size
+    changed = {}
+    for _ in range(n_changed):
+        rec = _REC.unpack_from(data, off)
+        changed[rec[0]] = rec[1:]
+        off += _REC.size
+    removed = [_ID.unpack_from(data, off + k * _ID.size)[0] for k in range(n_removed)]
+    return tick, base, ms, seq, role, changed, removed
+
+
+def _pack_phrases(phrases) -> bytes:
+    out = bytearray()
+    for phrase in phrases[:255]:
+        raw = phrase.encode("utf-8")[:255]
+        out.append(len(raw))
+        out += raw
+    return bytes(out)
+
+
+def _unpack_phrases(data: bytes, off: int, n: int) -> list:
+    """Frases <B len> utf-8; ValueError si el datagrama no trae los bytes que anuncia."""
+    out = []
+    for _ in range(n):
+        if off >= len(data) or off + 1 + data[off] > len(data):
+            raise ValueError("[net] frases truncadas")
+        size = data[off]
+        out.append(data[off + 1:off + 1 + size].decode("utf-8", "replace"))
+        off += 1 + size
+    return out
+
+
+BAD_PACKET = (struct.error, ValueError, IndexError)   # datagrama ajeno, truncado o de otra versión
+
+
+# ─────────────────────────────────────────────────────────
+# Servidor
+# ─────────────────────────────────────────────────────────
+class _Peer:
+    __slots__ = ("addr", "role", "ack", "seq", "held", "presses", "last_seen", "sent",
+                 "bytes_out", "bytes_in", "full_bytes", "snapshots")
+
+    def __init__(self, addr, role):
+        self.addr = addr
+        self.role = role
+        self.ack = 0           # último tick que el cliente confirmó tener entero
+        self.seq = 0           # último input aplicado (se devuelve en cada snapshot)
+        self.held = 0
+        self.presses = 0       # pulsaciones acumuladas desde el último tick
+        self.last_seen = time.perf_counter()
+        self.sent = {}         # tick -> estado que el cliente tiene si recibió ese snapshot
+        self.bytes_out = self.bytes_in = self.full_bytes = self.snapshots = 0
+
+
+class NetServer:
+    """
+    Dueño del nivel: lee inputs de los clientes, simula a tick fijo y manda snapshots.
+    step() hace un tick (para tests y herramientas); serve() lo repite con el reloj real.
+    """
+    def __init__(self, level, port: int = NET_PORT, hz: int = NET_TICK_HZ, host: str = "127.0.0.1"):
+        self.level = level
+        level.rewind = None   # el servidor no rebobina: ahorra el snapshot por tick
+        level.input_source = self._owner_intents
+        level.voice_source = self._take_phrases
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.addr = self.sock.getsockname()
+        self.hz = hz
+        self.dt = 1.0 / hz
+        self.peers = {}        # addr -> _Peer
+        self.owner = None      # _Peer que controla al jugador
+        self.tick = 0
+        self.tick_ms = 0.0     # costo del último tick (red + simulación + snapshots)
+        self._phrases = []
+        self._level_key = self._key_of(level)
+
+    @staticmethod
+    def _key_of(level) -> bytes:
+        from core.replay import level_key
+        return level_key(level).encode("utf-8")[:255]
+
+    # ---------- entrada ----------
+    def poll(self):
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, ConnectionResetError):
+                return
+            if not data:
+                continue
+            try:
+                self._handle(data, addr)
+            except BAD_PACKET:
+                metrics.incr("net_bad_packets")   # el puerto es público: no corta la sesión
+
+    def _handle(self, data: bytes, addr):
+        kind = data[0]
+        peer = self.peers.get(addr)
+        if kind == HELLO:
+            if peer is None:
+                role = ROLE_PLAYER if self.owner is None else ROLE_SPECTATOR
+                peer = self.peers[addr] = _Peer(addr, role)
+                if role == ROLE_PLAYER:
+                    self.owner = peer
+                print(f"[net] se unió {addr[0]}:{addr[1]} ({'jugador' if role == ROLE_PLAYER else 'espectador'})")
+            peer.last_seen = time.perf_counter()
+            self.sock.sendto(_WELCOME.pack(WELCOME, peer.role, self.hz, len(self._level_key)) + self._level_key, addr)
+        elif peer is None:
+            return
+        elif kind == INPUT and len(data) >= _INPUT.size:
+            _, seq, ack, mask, n = _INPUT.unpack_from(data, 0)
+            peer.last_seen = time.perf_counter()
+            peer.bytes_in += len(data)
+            if ack > peer.ack:
+                peer.ack = ack
+            if seq <= peer.seq:
+                return   # duplicado o fuera de orden
+            peer.seq = seq
+            if peer is self.owner:
+                peer.held = mask & HELD_MASK
+                peer.presses |= mask >> PRESS_SHIFT
+            if n:
+                self._phrases.extend(_unpack_phrases(data, _INPUT.size, n))
+        elif kind == BYE:
+            self._drop(peer)
+
+    def _drop(self, peer):
+        self.peers.pop(peer.addr, None)
+        if peer is self.owner:
+            # el control pasa al espectador más antiguo (si hay)
+            self.owner = next(iter(self.peers.values()), None)
+            if self.owner is not None:
+                self.owner.role = ROLE_PLAYER
+        print(f"[net] se fue {peer.addr[0]}:{peer.addr[1]}")
+
+    def _owner_intents(self) -> int:
+        peer = self.owner
+        if peer is None:
+            return 0
+        mask = peer.held | peer.presses << PRESS_SHIFT
+        peer.presses = 0
+        return mask
+
+    def _take_phrases(self) -> list:
+        phrases, self._phrases = self._phrases, []
+        return phrases
+
+    # ---------- tick ----------
+    def step(self):
+        t0 = time.perf_counter()
+        self.poll()
+        for peer in [p for p in self.peers.values() if t0 - p.last_seen > NET_TIMEOUT_S]:
+            self._drop(peer)
+        self.level.update(self.dt)
+        self.tick += 1
+        self._broadcast()
+        self.tick_ms = (time.perf_counter() - t0) * 1000.0
+        metrics.gauge("net_tick_ms", round(self.tick_ms, 3))
+        metrics.gauge("net_clients", len(self.peers))
+
+    def _broadcast(self):
+        if not self.peers:
+            return
+        cur = world_state(self.level)
+        full = _SNAP.size + len(cur) * _REC.size
+        ms = self.level.clock.ms
+        for peer in self.peers.values():
+            base = peer.sent.get(peer.ack)
+            base_tick = peer.ack if base is not None else 0
+            data, view = encode_snapshot(self.tick, base_tick, ms, peer.seq, base or {}, cur, role=peer.role)
+            peer.sent[self.tick] = view
+            # lo anterior al ack ya no puede ser base; y sin acks no se guarda más de 1 s
+            for t in [t for t in peer.sent if t < peer.ack or t <= self.tick - self.hz]:
+                del peer.sent[t]
+            try:
+                self.sock.sendto(data, peer.addr)
+            except OSError:
+                continue
+            peer.bytes_out += len(data)
+            peer.full_bytes += full
+            peer.snapshots += 1
+            metrics.incr("net_bytes_out", len(data))
+
+    def serve(self, seconds: float = None, report_every: float = 5.0):
+        """Bucle de tiempo real a self.hz (sin ventana); Ctrl+C para terminar."""
+        t_next = t_start = t_report = time.perf_counter()
+        worst = 0.0
+        try:
+            while seconds is None or time.perf_counter() - t_start < seconds:
+                self.step()
+                worst = max(worst, self.tick_ms)
+                t_next += self.dt
+                now = time.perf_counter()
+                if now < t_next:
+                    time.sleep(t_next - now)
+                elif now - t_next > 0.25:
+                    t_next = now   # muy atrasado: no intentar recuperar ticks en ráfaga
+                if report_every and now - t_report >= report_every:
+                    secs = now - t_report
+                    per = ", ".join(f"{p.bytes_out / secs / 1024:.1f} KB/s" for p in self.peers.values())
+                    print(f"[net] tick {self.tick}: peor {worst:.2f} ms; clientes: {per or '-'}")
+                    for p in self.peers.values():
+                        p.bytes_out = 0
+                    t_report, worst = now, 0.0
+        except KeyboardInterrupt:
+            pass
+
+    def close(self):
+        self.sock.close()
+
+
+def run_server(level_key: str = "levels.test_level:TestLevel", port: int = NET_PORT,
+               hz: int = NET_TICK_HZ, host: str = "0.0.0.0", seconds: float = None):
+    from core.headless import HeadlessGame
+    from core.replay import load_level_class
+    level = load_level_class(level_key)(HeadlessGame())
+    server = NetServer(level, port, hz, host)
+    print(f"[net] servidor {level_key} en {server.addr[0]}:{server.addr[1]} a {hz} Hz")
+    try:
+        server.serve(seconds)
+    finally:
+        server.close()
+
+
+# ─────────────────────────────────────────────────────────
+# Cliente
+# ─────────────────────────────────────────────────────────
+class NetClient:
+    """Manda intents/frases, reconstruye los snapshots y los interpola para dibujar."""
+    def __init__(self, server=("127.0.0.1", NET_PORT), interp_ms: float = NET_INTERP_MS):
+        self.server = server
+        self.interp_ms = interp_ms
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.role = None
+        self.level_key = None
+        self.hz = 0
+        self.seq = 0
+        self.latest = 0                 # último tick reconstruido (el que se confirma)
+        self.states = {}                # tick -> {id: registro} (bases de los deltas)
+        self.timeline = deque(maxlen=32)  # (ms del servidor, estado) para interpolar
+        self._offset = None             # ms del servidor - ms locales (suavizado)
+        self._sent_at = {}              # seq -> perf_counter del envío (rtt)
+        self.rtt_ms = 0.0
+        self.bytes_in = self.bytes_out = self.snapshots = self.dropped = 0
+
+    def connect(self, timeout: float = 3.0):
+        t0 = time.perf_counter()
+        while self.level_key is None:
+            if time.perf_counter() - t0 > timeout:
+                raise ConnectionError(f"[net] sin respuesta de {self.server[0]}:{self.server[1]}")
+            self.sock.sendto(bytes((HELLO,)), self.server)
+            time.sleep(0.05)
+            self.poll()
+        return self
+
+    def send_input(self, mask: int = 0, phrases=()):
+        self.seq += 1
+        data = _INPUT.pack(INPUT, self.seq, self.latest, mask, min(len(phrases), 255)) + _pack_phrases(list(phrases))
+        self._sent_at[self.seq] = time.perf_counter()
+        if len(self._sent_at) > 256:
+            for s in [s for s in self._sent_at if s < self.seq - 128]:
+                del self._sent_at[s]
+        try:
+            self.sock.sendto(data, self.server)
+        except OSError:
+            return
+        self.bytes_out += len(data)
+
+    def poll(self):
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(65536)
+            except (BlockingIOError, ConnectionResetError):
+                return
+            if not data:
+                continue
+            self.bytes_in += len(data)
+            try:
+                if data[0] == WELCOME:
+                    _, role, hz, n = _WELCOME.unpack_from(data, 0)
+                    if len(data) < _WELCOME.size + n:
+                        raise ValueError("[net] WELCOME truncado")
+                    self.level_key = data[_WELCOME.size:_WELCOME.size + n].decode("utf-8")
+                    self.role, self.hz = role, hz
+                elif data[0] == SNAPSHOT:
+                    self._apply(data)
+            except BAD_PACKET:
+                self.dropped += 1
+                metrics.incr("net_bad_packets")
+
+    def _apply(self, data: bytes):
+        tick, base, ms, seq, role, changed, removed = decode_snapshot(data)
+        if tick <= self.latest:
+            return   # viejo o duplicado
+        self.role = role   # puede cambiar: el control pasa a un espectador si el jugador se va
+        if base:
+            prev = self.states.get(base)
+            if prev is None:
+                self.dropped += 1   # su base ya no está: el próximo vendrá contra el ack vigente
+                return
+            state = dict(prev)
+        else:
+            state = {}
+        for i in removed:
+            state.pop(i, None)
+        state.update(changed)
+        self.states[tick] = state
+        for t in [t for t in self.states if t < base or t <= tick - 64]:
+            del self.states[t]
+        self.latest = tick
+        self.snapshots += 1
+        self.timeline.append((ms, state))
+        now = time.perf_counter() * 1000.0
+        offset = ms - now
+        self._offset = offset if self._offset is None else self._offset + 0.1 * (offset - self._offset)
+        sent = self._sent_at.pop(seq, None)
+        if sent is not None:
+            # incluye la espera hasta el tick del servidor que lo aplicó
+            self.rtt_ms = (time.perf_counter() - sent) * 1000.0
+
+    def server_now(self) -> float:
+        return time.perf_counter() * 1000.0 + (self._offset or 0.0)
+
+    def sample(self, render_ms: float = None) -> dict:
+        """Estado interpolado en render_ms (por defecto: ahora - interp_ms), posiciones en float."""
+        tl = self.timeline
+        if not tl:
+            return {}
+        t = (self.server_now() - self.interp_ms) if render_ms is None else render_ms
+        if t <= tl[0][0]:
+            return dict(tl[0][1])
+        if t >= tl[-1][0]:
+            return dict(tl[-1][1])
+        for k in range(len(tl) - 1, 0, -1):
+            ms_a, a = tl[k - 1]
+            ms_b, b = tl[k]
+            if ms_a <= t:
+                break
+        alpha = (t - ms_a) / (ms_b - ms_a) if ms_b > ms_a else 1.0
+        out = {}
+        for i, rb in b.items():
+            ra = a.get(i)
+            if ra is None or abs(rb[1] - ra[1]) > SNAP_TELEPORT or abs(rb[2] - ra[2]) > SNAP_TELEPORT:
+                out[i] = rb
+            else:
+                out[i] = (rb[0], ra[1] + (rb[1] - ra[1]) * alpha, ra[2] + (rb[2] - ra[2]) * alpha) + rb[3:]
+        return out
+
+    def close(self):
+        try:
+            self.sock.sendto(bytes((BYE,)), self.server)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+# ─────────────────────────────────────────────────────────
+# Escena del cliente
+# ─────────────────────────────────────────────────────────
+class NetClientScene(Scene):
+    """
+    Dibuja el estado interpolado del servidor sobre el terreno del mismo nivel (construido
+    en local sólo por sus tiles; sus entidades no se simulan).
+    """
+    ENEMY_COLOR = (255, 120, 120)
+    FROZEN_COLOR = (150, 220, 255)
+    BULLET_COLOR = (255, 255, 255)
+
+    def __init__(self, game, client: NetClient):
+        from core.replay import load_level_class
+        from engine.camera import Camera
+        from engine.entity import Entity
+        from engine.render import RenderQueue
+        super().__init__(game)
+        self.client = client
+        self.keyboard = KeyboardInput()
+        self.terrain = load_level_class(client.level_key)(game)
+        self.terrain.rewind = None
+        self.focus = Entity(0, 0, 1, 1)   # lo que sigue la cámara: el jugador interpolado
+        self.camera = Camera(bounds=self.terrain.world_bounds)
+        self.camera.follow(self.focus)
+        self.render_queue = RenderQueue()
+        self.render_scale = 1.0
+        self.view = {}
+        self.show_metrics = False
+        self._kbps = 0.0
+        self._bytes_mark = (time.perf_counter(), 0)
+
+    def assets(self):
+        from core.resources import PLAYER_ASSETS
+        return PLAYER_ASSETS
+
+    def handle_events(self, events):
+        self.keyboard.feed(events)
+        for e in events:
+            if e.type == pygame.KEYDOWN and e.key == pygame.K_F3:
+                self.show_metrics = not self.show_metrics
+
+    def update(self, dt):
+        self.clock.tick(dt)
+        c = self.client
+        c.poll()
+        voice = getattr(self.game, "voice", None)
+        phrases = voice.get_commands() if voice else []
+        mask = self.keyboard.poll() if c.role == ROLE_PLAYER else 0
+        c.send_input(mask, phrases)   # los espectadores también: llevan el ack y la voz
+        self.view = c.sample()
+        for rec in self.view.values():
+            if rec[0] == KIND_PLAYER:
+                self.focus.rect.update(int(rec[1]), int(rec[2]), rec[3], rec[4])
+                break
+        self.camera.update(dt)
+        streamer = getattr(self.terrain, "streamer", None)
+        if streamer is not None:
+            streamer.update(self.camera.view)
+        t, mark = self._bytes_mark
+        now = time.perf_counter()
+        if now - t >= 1.0:
+            self._kbps = (c.bytes_in - mark) / (now - t) / 1024.0
+            self._bytes_mark = (now, c.bytes_in)
+
+    def draw_world(self, screen):
+        from engine.render import Layer
+        from engine.status import FROZEN
+        from entities.player import player_clips
+        q = self.render_queue
+        k = self.render_scale
+        q.begin(self.camera.offset, k, self.clock.ms)
+        if k == 1.0:
+            screen.fill(COLOR_BG)
+        else:
+            screen.fill(COLOR_BG, (0, 0, round(screen.get_width() * k), round(screen.get_height() * k)))
+        view = self.camera.view
+        self.terrain.submit_tiles(q, view)
+        clips = player_clips()
+        for kind, x, y, w, h, hp, status, facing, flags, aux in self.view.values():
+            rect = pygame.Rect(round(x), round(y), w, h)
+            if not view.colliderect(rect):
+                continue
+            if kind == KIND_PLAYER:
+                clip = clips["run"] if flags & (F_MOVING | F_DASHING) else clips["idle"]
+                q.sprite(clip.frame_at(self.clock.ms), rect.topleft, Layer.PLAYER, flip_x=facing < 0)
+            elif kind == KIND_ENEMY:
+                q.fill(rect, self.FROZEN_COLOR if status & FROZEN else self.ENEMY_COLOR, Layer.ENEMIES)
+            else:
+                q.fill(rect, self.BULLET_COLOR, Layer.BULLETS)
+        q.flush(screen)
+
+    def draw_ui(self, screen, dst_rect=None):
+        c = self.client
+        player = next((r for r in self.view.values() if r[0] == KIND_PLAYER), None)
+        lines = []
+        if player is not None:
+            lines.append(f"HP {player[5]}  Energía {player[9]}")
+        lines.append(f"{'jugador' if c.role == ROLE_PLAYER else 'espectador'}  rtt {c.rtt_ms:.0f} ms  "
+                     f"{self._kbps:.1f} KB/s  tick {c.latest}")
+        if self.show_metrics:
+            lines.append(f"snapshots {c.snapshots}  descartados {c.dropped}  interp {c.interp_ms:.0f} ms")
+        y = 16
+        for line in lines:
+            surf = resources.render_text(line, COLOR_HUD, "hud")
+            screen.blit(surf, (16, y))
+            y += surf.get_height()
+
+    def draw(self, screen):
+        self.draw_world(screen)
+        self.draw_ui(screen)
+
+    def dispose(self):
+        self.terrain.dispose()
+        self.client.close()
@@ -0,0 +1,201 @@
+# core/present.py
+"""
+Presentación del frame: escalar el canvas lógico a la ventana, HUD nítido encima y flip.
+
+SerialPresenter hace todo en el hilo principal (comportamiento clásico).
+PipelinedPresenter usa dos canvas y un hilo de presentación: mientras ese hilo escala y
+hace flip del frame N (transform/blit de pygame sueltan el GIL), el hilo principal ya
+simula y dibuja el N+1. El HUD se ejecuta en el hilo principal sobre una superficie que
+sólo graba los blits (las superficies de widgets/texto son inmutables una vez cacheadas)
+y el hilo de presentación los repite sobre la ventana.
+"""
+import threading, time, queue
+import pygame
+from core.config import VIRTUAL_W, VIRTUAL_H, SCALE_MODE, LETTERBOX, RES_UPSCALE
+from core import metrics
+
+
+def scale_rect(win_w, win_h):
+    """(dst_w, dst_h, ox, oy, método) del canvas escalado dentro de la ventana según SCALE_MODE."""
+    if SCALE_MODE == "pixel_crisp":
+        # factor entero máximo
+        scale = min(win_w // VIRTUAL_W, win_h // VIRTUAL_H)
+        if scale < 1: scale = 1
+        dst_w, dst_h = VIRTUAL_W * scale, VIRTUAL_H * scale
+        ox = (win_w - dst_w) // 2 if LETTERBOX else 0
+        oy = (win_h - dst_h) // 2 if LETTERBOX else 0
+        return dst_w, dst_h, ox, oy, "nearest"
+
+    if SCALE_MODE == "integer_smooth":
+        scale = min(win_w // VIRTUAL_W, win_h // VIRTUAL_H)
+        if scale >= 1:
+            dst_w, dst_h = VIRTUAL_W * scale, VIRTUAL_H * scale
+            ox = (win_w - dst_w) // 2 if LETTERBOX else 0
+            oy = (win_h - dst_h) // 2 if LETTERBOX else 0
+            return dst_w, dst_h, ox, oy, "smooth"
+        # si no cabe entero, cae a smooth a pantalla completa con letterbox
+
+    # smooth_only
+    ratio = min(win_w / VIRTUAL_W, win_h / VIRTUAL_H)
+    dst_w, dst_h = int(VIRTUAL_W * ratio), int(VIRTUAL_H * ratio)
+    ox = (win_w - dst_w) // 2 if LETTERBOX else 0
+    oy = (win_h - dst_h) // 2 if LETTERBOX else 0
+    return dst_w, dst_h, ox, oy, "smooth"
+
+
+class _Scaler:
+    """Escala a una superficie destino reutilizada (sin asignar 1 superficie por frame)."""
+    def __init__(self):
+        self._dst = None
+
+    def __call__(self, canvas, dst_w, dst_h, method):
+        if (dst_w, dst_h) == canvas.get_size():
+            return canvas
+        if self._dst is None or self._dst.get_size() != (dst_w, dst_h):
+            self._dst = pygame.Surface((dst_w, dst_h), 0, canvas)
+        if method == "nearest":
+            return pygame.transform.scale(canvas, (dst_w, dst_h), self._dst)
+        return pygame.transform.smoothscale(canvas, (dst_w, dst_h), self._dst)
+
+
+class _Presenter:
+    def __init__(self):
+        self.presented = 0           # frames con flip hecho
+        self.latency_ms_total = 0.0  # suma de (fin de simulación → flip terminado)
+
+    def _done(self, t_ready):
+        ms = (time.perf_counter() - t_ready) * 1000.0
+        self.presented += 1
+        self.latency_ms_total += ms
+        metrics.gauge("present_latency_ms", round(ms, 2))
+
+    @property
+    def mean_latency_ms(self) -> float:
+        return self.latency_ms_total / self.presented if self.presented else 0.0
+
+
+def _compose(screen, canvas, scaler, draw_ui, render_scale=1.0):
+    win_w, win_h = screen.get_size()
+    dst_w, dst_h, ox, oy, method = scale_rect(win_w, win_h)
+    if render_scale != 1.0:
+        # el mundo se dibujó en la esquina superior izquierda a menor resolución
+        canvas = canvas.subsurface((0, 0, round(VIRTUAL_W * render_scale), round(VIRTUAL_H * render_scale)))
+        # ya se está pagando calidad por tiempo: el filtro suave se come buena parte de lo ahorrado
+        method = RES_UPSCALE
+    scaled = scaler(canvas, dst_w, dst_h, method)
+    # limpia pantalla y blitea con letterbox
+    screen.fill((0, 0, 0))
+    screen.blit(scaled, (ox, oy))
+    # HUD “post-scale” (nítido 1:1 sobre la pantalla final)
+    if draw_ui:
+        draw_ui(screen, (ox, oy, dst_w, dst_h))
+
+
+class SerialPresenter(_Presenter):
+    pipelined = False
+
+    def __init__(self):
+        super().__init__()
+        self.canvas = pygame.Surface((VIRTUAL_W, VIRTUAL_H)).convert_alpha()
+        self._scale = _Scaler()
+
+    def begin_frame(self) -> pygame.Surface:
+        return self.canvas
+
+    def present(self, canvas, draw_ui, t_ready=None, render_scale=1.0):
+        """
+        draw_ui(screen, dst_rect) o None; t_ready = perf_counter al terminar la simulación;
+        render_scale = fracción del canvas usada por el mundo (resolución dinámica).
+        """
+        _compose(pygame.display.get_surface(), canvas, self._scale, draw_ui, render_scale)
+        pygame.display.flip()
+        self._done(t_ready if t_ready is not None else time.perf_counter())
+
+    def stop(self):
+        pass
+
+
+class UIRecording:
+    """
+    Superficie "de mentira" para draw_ui: graba blit/blits/fill y los repite después.
+    Sólo vale para UI que dibuja superficies ya hechas (HUD, textos y paneles cacheados).
+    """
+    def __init__(self, size):
+        self._size = size
+        self.ops = []
+
+    def get_size(self):
+        return self._size
+
+    def get_width(self):
+        return self._size[0]
+
+    def get_height(self):
+        return self._size[1]
+
+    def blit(self, surf, dest, area=None, special_flags=0):
+        self.ops.append((surf, tuple(dest), area, special_flags))
+
+    def blits(self, seq, doreturn=True):
+        for item in seq:
+            self.blit(*item)
+
+    def fill(self, color, rect=None, special_flags=0):
+        s = pygame.Surface(pygame.Rect(rect).size if rect else self._size, pygame.SRCALPHA)
+        s.fill(color)
+        self.ops.append((s, tuple(pygame.Rect(rect).topleft) if rect else (0, 0), None, special_flags))
+
+    def replay(self, screen):
+        screen.blits(self.ops, False)
+
+
+class PipelinedPresenter(_Presenter):
+    """
+    Doble buffer + hilo de presentación. El traspaso es explícito: begin_frame() bloquea
+    hasta que haya un canvas libre y present() lo entrega al hilo (cola de 1 = como mucho
+    un frame en vuelo además del que se está presentando).
+    """
+    pipelined = True
+
+    def __init__(self):
+        super().__init__()
+        self.canvases = [pygame.Surface((VIRTUAL_W, VIRTUAL_H)).convert_alpha() for _ in range(2)]
+        self._free = queue.Queue()
+        for c in self.canvases:
+            self._free.put(c)
+        self._frames = queue.Queue(maxsize=1)
+        self._scale = _Scaler()
+        self._thread = threading.Thread(target=self._run, name="present", daemon=True)
+        self._thread.start()
+
+    def begin_frame(self) -> pygame.Surface:
+        t0 = time.perf_counter()
+        canvas = self._free.get()
+        metrics.gauge("present_wait_ms", round((time.perf_counter() - t0) * 1000.0, 2))
+        return canvas
+
+    def present(self, canvas, draw_ui, t_ready=None, render_scale=1.0):
+        ui = None
+        if draw_ui:
+            screen = pygame.display.get_surface()
+            ui = UIRecording(screen.get_size())
+            win_w, win_h = ui.get_size()
+            dst_w, dst_h, ox, oy, _ = scale_rect(win_w, win_h)
+            draw_ui(ui, (ox, oy, dst_w, dst_h))
+        self._frames.put((canvas, ui, t_ready if t_ready is not None else time.perf_counter(), render_scale))
+
+    def _run(self):
+        while True:
+            item = self._frames.get()
+            if item is None:
+                return
+            canvas, ui, t_ready, render_scale = item
+            _compose(pygame.display.get_surface(), canvas, self._scale,
+                     (lambda screen, dst: ui.replay(screen)) if ui else None, render_scale)
+            pygame.display.flip()
+            self._done(t_ready)
+            self._free.put(canvas)
+
+    def stop(self):
+        self._frames.put(None)
+        self._thread.join(timeout=1.0)
@@ -0,0 +1,129 @@
+# core/replay.py
+"""
+Grabación determinista de sesiones y replay headless más rápido que tiempo real.
+
+Archivo (.eqr): cabecera sin comprimir + stream zlib de registros por tick:
+    <d dt> <I intents del tick (mantenidas | pulsadas << 16)> <B nº frases> [<B len> utf-8]...
+    y cada 'checksum_every' ticks: <I crc32 del estado del nivel tras ese tick>
+El replay vuelve a alimentar intents/frases tick a tick (sin teclado ni micrófono)
+y compara los checksums: si el estado diverge, la simulación dejó de ser reproducible.
+"""
+import importlib, struct, time, zlib
+
+MAGIC = b"EQRP"
+VERSION = 2   # v2: salto/dash/ataque por flanco y pulsaciones por tick (v1 se jugaba distinto)
+_HEADER = struct.Struct("<4sHHH")   # magic, versión, checksum_every, len(nombre de nivel)
+_TICK = struct.Struct("<dIB")   # dt exacto (double): con float32 el replay diverge
+_CRC = struct.Struct("<I")
+
+
+def level_key(level) -> str:
+    cls = type(level)
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+class Recorder:
+    """Se cuelga de level.recorder; LevelBase llama record_tick al final de cada update."""
+    def __init__(self, path: str, level, checksum_every: int = 60):
+        self.path = path
+        self.checksum_every = checksum_every
+        self.key = level_key(level)
+        self.ticks = 0
+        self._z = zlib.compressobj(9)
+        self._f = open(path, "wb")
+        name = self.key.encode("utf-8")
+        self._f.write(_HEADER.pack(MAGIC, VERSION, checksum_every, len(name)) + name)
+        level.recorder = self
+
+    def record_tick(self, level, dt, mask, phrases):
+        rec = [_TICK.pack(dt, mask, len(phrases))]
+        for phrase in phrases:
+            b = phrase.encode("utf-8")[:255]
+            rec.append(bytes([len(b)]) + b)
+        self.ticks += 1
+        if self.ticks % self.checksum_every == 0:
+            rec.append(_CRC.pack(level.state_checksum()))
+        self._f.write(self._z.compress(b"".join(rec)))
+
+    def close(self):
+        if self._f.closed:
+            return
+        self._f.write(self._z.flush())
+        self._f.close()
+
+
+def read_recording(path: str):
+    """Devuelve (clave de nivel, checksum_every, [(dt, mask, frases, crc|None)])."""
+    with open(path, "rb") as f:
+        blob = f.read()
+    magic, version, every, n = _HEADER.unpack_from(blob, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"[replay] formato inválido: {path}")
+    off = _HEADER.size
+    key = blob[off:off + n].decode("utf-8")
+    data = zlib.decompress(blob[off + n:])
+
+    ticks, p, i = [], 0, 0
+    while p < len(data):
+        dt, mask, count = _TICK.unpack_from(data, p)
+        p += _TICK.size
+        phrases = []
+        for _ in range(count):
+            ln = data[p]
+            phrases.append(data[p + 1:p + 1 + ln].decode("utf-8"))
+            p += 1 + ln
+        i += 1
+        crc = None
+        if i % every == 0:
+            (crc,) = _CRC.unpack_from(data, p)
+            p += _CRC.size
+        ticks.append((dt, mask, phrases, crc))
+    return key, every, ticks
+
+
+def load_level_class(key: str):
+    module, _, name = key.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+class ReplayResult:
+    def __init__(self):
+        self.ticks = 0
+        self.sim_seconds = 0.0
+        self.wall_seconds = 0.0
+        self.checked = 0
+        self.mismatches = []   # [(tick, esperado, obtenido)]
+
+    @property
+    def speedup(self) -> float:
+        return self.sim_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+
+def replay(path: str, game=None, stop_on_mismatch: bool = False) -> ReplayResult:
+    """Reproduce la grabación headless tan rápido como se pueda y verifica checksums."""
+    from core.headless import HeadlessGame
+    key, _, ticks = read_recording(path)
+    game = game or HeadlessGame()
+    level = load_level_class(key)(game)
+
+    current = {"mask": 0, "phrases": []}
+    level.input_source = lambda: current["mask"]
+    level.voice_source = lambda: current["phrases"]
+
+    res = ReplayResult()
+    t0 = time.perf_counter()
+    for i, (dt, mask, phrases, crc) in enumerate(ticks, 1):
+        current["mask"] = mask
+        current["phrases"] = phrases
+        level.update(dt)
+        res.ticks = i
+        res.sim_seconds += dt
+        if crc is not None:
+            res.checked += 1
+            got = level.state_checksum()
+            if got != crc:
+                res.mismatches.append((i, crc, got))
+                if stop_on_mismatch:
+                    break
+    res.wall_seconds = time.perf_counter() - t0
+    return res
@@ -1,10 +1,13 @@
 # core/resources.py
-import os
+import os, threading
+from collections import OrderedDict
+from functools import lru_cache
 import pygame
-from core.config import ASSETS_DIR, PLAYER_W, PLAYER_H, SPRITE_SMOOTHING, HUD_FONT_SMALL, HUD_FONT_BIG
+from core.config import (ASSETS_DIR, PLAYER_W, PLAYER_H, SPRITE_SMOOTHING, HUD_FONT_SMALL, HUD_FONT_BIG,
+                         HUD_FONT_LABEL, HUD_FONT_TITLE, TEXT_CACHE_SIZE, IMAGE_CACHE_MB)
+from core import metrics
 
 _fonts = {}
-_images = {}   # cache: (path, size) -> Surface
 _initialized = False
 
 def _ensure_init():
@@ -18,6 +21,8 @@ def _init_fonts():
     _fonts["hud"]   = pygame.font.SysFont("consolas", HUD_FONT_SMALL)
     _fonts["debug"] = pygame.font.SysFont("consolas", HUD_FONT_SMALL-2)
     _fonts["big"]   = pygame.font.SysFont("consolas", HUD_FONT_BIG)
+    _fonts["label"] = pygame.font.SysFont("consolas", HUD_FONT_LABEL)   # HUD / toasts
+    _fonts["title"] = pygame.font.SysFont("consolas", HUD_FONT_TITLE)   # nombre del nivel
 
 def load_fonts():
     _ensure_init()
@@ -26,33 +31,159 @@ def font(name="hud"):
     _ensure_init()
     return _fonts.get(name)
 
+# ---------- TEXTO (caché LRU de superficies) ----------
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _render_text(font_name, text, color, antialias):
+    return font(font_name).render(text, antialias, color)
+
+def render_text(text: str, color, font_name="hud", antialias=True) -> pygame.Surface:
+    """
+    Superficie del texto, cacheada por (fuente, texto, color, antialias).
+    La superficie es compartida: no modificarla.
+    """
+    return _render_text(font_name, text, tuple(color), antialias)
+
+def text_cache_stats() -> dict:
+    info = _render_text.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize,
+            "evictions": max(0, info.misses - info.currsize)}
+
+def clear_text_cache():
+    _render_text.cache_clear()
+
+@lru_cache(maxsize=32)
+def panel(w: int, h: int, rgba) -> pygame.Surface:
+    """Rectángulo translúcido reutilizable (fondos de toasts, etiquetas)."""
+    surf = pygame.Surface((w, h), pygame.SRCALPHA)
+    surf.fill(rgba)
+    return surf
+
 # ---------- IMÁGENES / ANIMACIONES ----------
+def surface_bytes(surf: pygame.Surface) -> int:
+    """Memoria de píxeles de la superficie (pitch incluye el relleno de cada fila)."""
+    return surf.get_pitch() * surf.get_height()
+
+
+class ImageCache:
+    """
+    Caché LRU de superficies con presupuesto en bytes.
+    Las claves fijadas por algún ámbito (escena, "global") no se expulsan; el resto sale
+    de la menos usada a la más usada hasta entrar en el presupuesto.
+    Con lock: las escenas se precargan desde el hilo del SceneManager.
+    """
+    def __init__(self, budget_bytes: int):
+        self.budget = budget_bytes
+        self._surfs = OrderedDict()   # clave -> Surface (orden = uso, más reciente al final)
+        self._sizes = {}              # clave -> bytes
+        self._pins = {}               # clave -> nº de ámbitos que la fijan
+        self._scopes = {}             # ámbito -> set de claves
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self._lock = threading.RLock()
+
+    def __contains__(self, key) -> bool:
+        return key in self._surfs
+
+    def __len__(self):
+        return len(self._surfs)
+
+    def get(self, key):
+        with self._lock:
+            surf = self._surfs.get(key)
+            if surf is None:
+                self.misses += 1
+                metrics.incr("img_misses")
+                return None
+            self._surfs.move_to_end(key)
+            self.hits += 1
+            metrics.incr("img_hits")
+            return surf
+
+    def put(self, key, surf: pygame.Surface):
+        with self._lock:
+            if key in self._surfs:
+                self.bytes -= self._sizes[key]
+            self._surfs[key] = surf
+            self._surfs.move_to_end(key)
+            self._sizes[key] = n = surface_bytes(surf)
+            self.bytes += n
+            self._evict()
+
+    def pin(self, scope: str, key):
+        with self._lock:
+            keys = self._scopes.setdefault(scope, set())
+            if key not in keys:
+                keys.add(key)
+                self._pins[key] = self._pins.get(key, 0) + 1
+
+    def release(self, scope: str):
+        """Suelta lo que fijaba 'scope' (sigue en caché hasta que haga falta el espacio)."""
+        with self._lock:
+            for key in self._scopes.pop(scope, ()):
+                left = self._pins[key] - 1
+                if left:
+                    self._pins[key] = left
+                else:
+                    del self._pins[key]
+            self._evict()
+
+    def _evict(self):
+        if self.bytes > self.budget:
+            for key in [k for k in self._surfs if k not in self._pins]:
+                if self.bytes <= self.budget:
+                    break
+                del self._surfs[key]
+                self.bytes -= self._sizes.pop(key)
+                self.evictions += 1
+                metrics.incr("img_evictions")
+        metrics.gauge("img_cache_kb", self.bytes // 1024)
+
+    def clear(self):
+        with self._lock:
+            self._surfs.clear()
+            self._sizes.clear()
+            self._pins.clear()
+            self._scopes.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            pinned = sum(self._sizes.get(k, 0) for k in self._pins)
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "count": len(self._surfs), "bytes": self.bytes, "pinned_bytes": pinned,
+                    "budget": self.budget, "scopes": len(self._scopes)}
+
+
+_images = ImageCache(IMAGE_CACHE_MB * 1024 * 1024)   # (ruta, w, h) -> Surface
+
 def _key(path, size):
     return (path, size[0], size[1])
 
-def load_image(rel_path: str, size=None) -> pygame.Surface:
+def load_image(rel_path: str, size=None, scope: str = None) -> pygame.Surface:
     """
     Carga una imagen desde assets/ y la escala si 'size' (w,h) se indica.
-    Usa caché para evitar recargas.
+    Usa caché para evitar recargas; 'scope' la fija mientras ese ámbito no se suelte.
     """
     full_path = os.path.join(ASSETS_DIR, rel_path)
-    if not os.path.exists(full_path):
-        raise FileNotFoundError(f"[resources] No existe: {full_path}")
-
     key = _key(full_path, size or (-1, -1))
-    if key in _images:
-        return _images[key]
-
-    img = pygame.image.load(full_path).convert_alpha()
-    if size is not None:
-        if SPRITE_SMOOTHING:
-            img = pygame.transform.smoothscale(img, size)
-        else:
-            img = pygame.transform.scale(img, size)   # ⬅️ crisp para pixel-art
-    _images[key] = img
+    img = _images.get(key)
+    if img is None:
+        if not os.path.exists(full_path):
+            raise FileNotFoundError(f"[resources] No existe: {full_path}")
+        img = pygame.image.load(full_path).convert_alpha()
+        if size is not None:
+            if SPRITE_SMOOTHING:
+                img = pygame.transform.smoothscale(img, size)
+            else:
+                img = pygame.transform.scale(img, size)   # ⬅️ crisp para pixel-art
+        if scope:
+            _images.pin(scope, key)   # antes de put: que no se expulse a sí misma
+        _images.put(key, img)
+    elif scope:
+        _images.pin(scope, key)
     return img
 
-def load_frames(dir_rel_path: str, size=None) -> list[pygame.Surface]:
+def load_frames(dir_rel_path: str, size=None, scope: str = None) -> list[pygame.Surface]:
     """
     Carga todos los archivos .png en un directorio dentro de assets/, ordenados por nombre.
     """
@@ -61,12 +192,35 @@ def load_frames(dir_rel_path: str, size=None) -> list[pygame.Surface]:
         raise FileNotFoundError(f"[resources] No es directorio: {full_dir}")
     names = [n for n in os.listdir(full_dir) if n.lower().endswith(".png")]
     names.sort()  # 0.png, 1.png, 2.png...
-    return [load_image(os.path.join(dir_rel_path, n), size=size) for n in names]
+    return [load_image(os.path.join(dir_rel_path, n), size=size, scope=scope) for n in names]
+
+def preload(scope: str, assets) -> int:
+    """
+    Carga y fija los assets declarados por una escena: [("image"|"frames", ruta, (w, h) | None)].
+    Devuelve cuántas superficies quedaron fijadas.
+    """
+    n = 0
+    for kind, path, size in assets:
+        if kind == "frames":
+            n += len(load_frames(path, size=size, scope=scope))
+        else:
+            load_image(path, size=size, scope=scope)
+            n += 1
+    return n
+
+def release_scope(scope: str):
+    _images.release(scope)
+
+def image_cache_stats() -> dict:
+    return _images.stats()
+
+# Helpers específicos del jugador (sus clips son compartidos y viven todo el juego: "global")
+PLAYER_ASSETS = (("image", "player/idle.png", (PLAYER_W, PLAYER_H)),
+                 ("frames", "player/run", (PLAYER_W, PLAYER_H)))
 
-# Helpers específicos del jugador
 def load_player_idle():
-    return load_image("player/idle.png", size=(PLAYER_W, PLAYER_H))
+    return load_image("player/idle.png", size=(PLAYER_W, PLAYER_H), scope="global")
 
 def load_player_run():
-    return load_frames("player/run", size=(PLAYER_W, PLAYER_H))
+    return load_frames("player/run", size=(PLAYER_W, PLAYER_H), scope="global")
 
@@ -1,30 +1,179 @@
 # core/scene.py
+"""
+Escenas y su administrador.
+
+Una escena declara sus imágenes en assets(); el SceneManager construye la siguiente
+escena (y precarga esos assets) en un hilo mientras la actual sigue corriendo, y sólo
+cambia cuando está lista. Las escenas recién construidas de niveles recientes quedan
+"tibias" en un LRU (SCENE_WARM_SLOTS): reintentar un nivel es un cambio instantáneo.
+"""
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import pygame
+from core.clock import GameClock
+from core.config import SCENE_WARM_SLOTS
+from core import metrics, resources
 
 class Scene:
     def __init__(self, game):
         self.game = game
         self.next_scene = None
         self.quit_requested = False
+        self.clock = GameClock()   # tiempo simulado propio de la escena
+        # ámbito de la caché de imágenes: lo que declara assets() queda fijado mientras esté activa
+        self.asset_scope = f"{type(self).__name__}#{id(self):x}"
+        self.manager = None        # lo fija el SceneManager al activarla
+        self.scene_key = None      # clave con la que se construyó (goto/retry)
+
+    def assets(self):
+        """Imágenes que la escena usa: [("image"|"frames", ruta, (w, h) | None)]."""
+        return ()
+
+    def dispose(self):
+        """Libera hilos/archivos propios cuando la escena se descarta."""
+        pass
 
     def handle_events(self, events): pass
     def update(self, dt: float): pass
     def draw(self, screen: pygame.Surface): pass
 
 class SceneManager:
-    def __init__(self, start_scene: Scene):
+    """
+    goto(key) pide una escena: key es una clase de Scene (se construye como key(game)) o
+    cualquier clave registrada con register(key, factory). La escena actual sigue
+    corriendo hasta que la nueva termina de construirse en segundo plano.
+    next_scene (escena ya construida) sigue funcionando y cambia en el acto.
+    """
+    def __init__(self, start_scene: Scene, warm_slots: int = SCENE_WARM_SLOTS, warm_start: bool = True):
+        """
+        warm_start: construir ya un repuesto de la escena inicial (F5 instantáneo desde el
+        primer intento; cuesta otra escena entera en memoria, hilos de streaming incluidos).
+        Con False el primer repuesto se construye recién en el primer goto()/retry().
+        """
         self.scene = start_scene
+        self.game = start_scene.game
+        self.warm_slots = warm_slots
+        self._factories = {}
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scenes")
+        self._building = {}          # clave -> Future[Scene]
+        self._warm = OrderedDict()   # clave -> Scene sin estrenar (más reciente al final)
+        self._target = None          # clave pedida con goto() que aún no está lista
+        self.stats = {"built": 0, "warm_hits": 0, "waits": 0, "build_ms": 0.0}
+        resources.preload(start_scene.asset_scope, start_scene.assets())
+        self._activate(start_scene, type(start_scene), prefetch=warm_start)
 
     def handle_events(self, events):
         self.scene.handle_events(events)
 
+    @property
+    def clock(self) -> GameClock:
+        return self.scene.clock
+
+    # ---------- construcción en segundo plano ----------
+    def register(self, key, factory):
+        """factory() -> Scene; para claves que no son clases de Scene."""
+        self._factories[key] = factory
+
+    def _factory(self, key):
+        factory = self._factories.get(key)
+        return factory if factory is not None else (lambda: key(self.game))
+
+    def _build(self, key):
+        # hilo del loader: constructor + precarga de imágenes (lo pesado: disco, decodificar, escalar)
+        t0 = time.perf_counter()
+        scene = self._factory(key)()
+        scene.scene_key = key
+        resources.preload(scene.asset_scope, scene.assets())
+        self.stats["build_ms"] = round((time.perf_counter() - t0) * 1000.0, 2)
+        return scene
+
+    def prefetch(self, key):
+        """Empieza a construir 'key' si no hay ya una lista o en camino."""
+        if key in self._warm or key in self._building:
+            return
+        self._building[key] = self._loader.submit(self._build, key)
+
+    def ready(self, key) -> bool:
+        self._collect()
+        return key in self._warm
+
+    def goto(self, key):
+        """Cambia a 'key' en cuanto esté construida (la actual sigue corriendo mientras)."""
+        self.prefetch(key)
+        self._target = key
+
+    def retry(self):
+        """Vuelve a empezar la escena actual (normalmente ya hay una tibia)."""
+        self.goto(self.scene.scene_key)
+
+    def _collect(self):
+        for key, fut in list(self._building.items()):
+            if fut.done():
+                del self._building[key]
+                try:
+                    scene = fut.result()
+                except Exception as exc:
+                    print(f"[scene] no se pudo construir {key!r}: {exc}")
+                    if self._target == key:
+                        self._target = None
+                    continue
+                self._keep_warm(key, scene)
+
+    def _keep_warm(self, key, scene):
+        self.stats["built"] += 1
+        old = self._warm.pop(key, None)
+        if old is not None:
+            self._discard(old)
+        self._warm[key] = scene
+        while len(self._warm) > self.warm_slots:
+            self._discard(self._warm.popitem(last=False)[1])
+
+    def _discard(self, scene):
+        resources.release_scope(scene.asset_scope)
+        scene.dispose()
+
+    # ---------- cambio de escena ----------
     def update(self, dt):
-        self.scene.update(dt)
+        """'dt' real del frame → pasos simulados según pausa/escala del reloj de la escena."""
+        for step in self.scene.clock.steps(dt):
+            self.scene.update(step)
         if self.scene.quit_requested:
             return False
+        self._collect()
         if self.scene.next_scene is not None:
-            self.scene = self.scene.next_scene
+            nxt, self.scene.next_scene = self.scene.next_scene, None
+            self._switch(nxt, type(nxt))
+        elif self._target is not None:
+            if self._target in self._warm:
+                key, self._target = self._target, None
+                self.stats["warm_hits"] += 1
+                self._switch(self._warm.pop(key), key)
+            else:
+                self.stats["waits"] += 1
+        metrics.gauge("scene_loading", len(self._building))
         return True
 
+    def _switch(self, scene: Scene, key):
+        # fijar lo nuevo antes de soltar lo viejo: lo compartido no se expulsa ni se recarga
+        resources.preload(scene.asset_scope, scene.assets())
+        old = self.scene
+        self._activate(scene, key)
+        self._discard(old)
+
+    def _activate(self, scene: Scene, key, prefetch: bool = True):
+        scene.manager = self
+        scene.scene_key = key
+        self.scene = scene
+        # repuesto sin estrenar para reintentar al instante
+        if self.warm_slots and prefetch:
+            self.prefetch(key)
+
+    def shutdown(self):
+        self._loader.shutdown(wait=False, cancel_futures=True)
+        for scene in self._warm.values():
+            self._discard(scene)
+        self._warm.clear()
+
     def draw(self, screen):
         self.scene.draw(screen)
@@ -0,0 +1,350 @@
+# core/snapshot.py
+"""
+Snapshots binarios del estado de simulación de un nivel y buffer de rebobinado.
+
+snapshot(level) -> bytes guarda todo lo que la simulación lee (reloj, jugador con
+cooldowns/energía/dash/input, enemigos, balas, estados alterados, cola de voz, cámara);
+restore(level, blob) lo vuelve a poner. Los callbacks del scheduler no se serializan:
+se guarda el vencimiento absoluto de cada uno (dash, muerte de balas, estados) y al
+restaurar se vuelven a agendar. Lo puramente visual (partículas, toasts) no se guarda.
+
+RewindBuffer guarda un snapshot por tick de los últimos N segundos: un keyframe cada
+'keyframe_every' ticks y el resto como XOR contra el anterior (casi todo ceros entre ticks
+seguidos) comprimido con zlib.
+
+Los enemigos se guardan con el nombre de su clase (tabla por snapshot, como los tags de
+las balas): cualquier subclase de EnemyBase se registra sola al primer snapshot y al
+restaurar se construye como cls(x, y) y se le reponen los campos de EnemyBase.
+"""
+import struct, time, zlib
+from collections import deque
+from core.config import REWIND_SECONDS, REWIND_KEYFRAME_EVERY
+from core import metrics
+from engine.registry import EntityRegistry
+from engine.status import KIND_FLAGS
+from entities.enemy import EnemyBase
+from entities.bullet import Bullet
+from entities.player import player_clips
+
+MAGIC = b"EQSN"
+VERSION = 2   # v2: clases de enemigo por nombre + daño/velocidad/origen/color
+
+_ENEMY_KINDS = {}   # "módulo.Clase" -> clase
+
+
+def enemy_kind(cls) -> str:
+    """Nombre con el que se guarda una clase de enemigo (la registra si hace falta)."""
+    name = f"{cls.__module__}.{cls.__qualname__}"
+    _ENEMY_KINDS.setdefault(name, cls)
+    return name
+
+enemy_kind(EnemyBase)
+
+_HEAD   = struct.Struct("<4sHdIii")               # magic, versión, clock.ms, clock.ticks, cámara x/y
+_PLAYER = struct.Struct("<4i4dbBBBi7dB3IBH")
+_PRESS  = struct.Struct("<Id")                    # bit, ms de la pulsación sin consumir
+_ENEMY  = struct.Struct("<H4i4dbBBiiiididd3B")
+_BULLET = struct.Struct("<4i4di3BHd")
+_STATUS = struct.Struct("<Hdidd")                 # entidad, magnitud, período, fin, próximo tick
+_VOICE  = struct.Struct("<di")
+_COUNT  = struct.Struct("<H")
+
+_E_ALIVE, _E_DEAD, _E_BOSS, _E_MINI = 1, 2, 4, 8
+
+
+def _clip_names():
+    return sorted(player_clips())
+
+
+def snapshot(level) -> bytes:
+    sched = level.scheduler
+    p = level.player
+    out = bytearray(_HEAD.pack(MAGIC, VERSION, level.clock.ms, level.clock.ticks, *level.camera.view.topleft))
+
+    # --- jugador ---
+    names = _clip_names()
+    clip = next((i for i, n in enumerate(names) if player_clips()[n] is p.clip), 255)
+    inp = p.input
+    book_n = len(p.powers.ready_at)
+    out += _PLAYER.pack(*p.rect, p.vel.x, p.vel.y, p.subpx.x, p.subpx.y,
+                        p.facing, p.on_ground, p.alive, p.is_dashing, p.hp,
+                        sched.due_ms(p.dash_timer) if p.is_dashing else -1.0, p.dash_ready_ms,
+                        p.last_shot_ms, p.hurt_until_ms, p.energy_pool.energy,
+                        p.anim_start_ms, p._anim_seen_ms, clip,
+                        inp.held, inp.pressed, inp.released, len(inp._pressed_at), book_n)
+    for bit, t in inp._pressed_at.items():
+        out += _PRESS.pack(bit, t)
+    out += p.powers.ready_at.tobytes()
+    out += p.powers.unlocked
+
+    # --- enemigos (referencia de estado: 0 = jugador, 1.. = enemigos en orden) ---
+    refs = {p: 0}
+    kinds = {}
+    enemies = list(level.enemies)
+    rows = bytearray()
+    for i, e in enumerate(enemies, 1):
+        refs[e] = i
+        cls = type(e)
+        kind_i = kinds.get(cls)
+        if kind_i is None:
+            kind_i = kinds[cls] = len(kinds)
+        flags = (_E_ALIVE if e.alive else 0) | (_E_DEAD if e.dead else 0) | \
+                (_E_BOSS if e.is_boss else 0) | (_E_MINI if e.is_miniboss else 0)
+        rows += _ENEMY.pack(kind_i, *e.rect, e.vel.x, e.vel.y, e.subpx.x, e.subpx.y,
+                            e.facing, e.on_ground, flags, e.hp, e.max_hp,
+                            int(e.patrol_range[0]), int(e.patrol_range[1]), e.show_hp_until,
+                            e.damage, e.speed, e.start_x, *e.color[:3])
+    out += _COUNT.pack(len(kinds))
+    for cls in kinds:
+        raw = enemy_kind(cls).encode("utf-8")
+        out += _COUNT.pack(len(raw)) + raw
+    out += _COUNT.pack(len(enemies)) + rows
+
+    # --- balas (tags como tabla de strings) ---
+    tagsets = {}
+    bullets = list(level.bullets)
+    rows = bytearray()
+    for b in bullets:
+        tag_i = tagsets.setdefault(b.tags, len(tagsets))
+        rows += _BULLET.pack(*b.rect, b.vel.x, b.vel.y, b.subpx.x, b.subpx.y, b.damage,
+                             *b.color[:3], tag_i, sched.due_ms(b.expire_id))
+    out += _COUNT.pack(len(tagsets))
+    for tags in tagsets:
+        raw = ",".join(sorted(tags)).encode("utf-8")
+        out += _COUNT.pack(len(raw)) + raw
+    out += _COUNT.pack(len(bullets)) + rows
+
+    # --- estados alterados ---
+    for kind in KIND_FLAGS:
+        table = level.status.tables[kind]
+        live = [(refs[ent], row) for ent, row in table.rows.items() if ent in refs]
+        out += _COUNT.pack(len(live))
+        for ref, row in live:
+            out += _STATUS.pack(ref, table.mag[row], table.period[row],
+                                sched.due_ms(table.expire[row]), sched.due_ms(table.tick[row]))
+
+    # --- ráfagas de voz pendientes ---
+    out += _COUNT.pack(len(level.voice_cast_queue))
+    for due, pid in level.voice_cast_queue:
+        out += _VOICE.pack(due, pid)
+    return bytes(out)
+
+
+def restore(level, blob: bytes):
+    mv = memoryview(blob)
+    magic, version, ms, ticks, cam_x, cam_y = _HEAD.unpack_from(mv, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("[snapshot] formato inválido")
+    off = _HEAD.size
+    level.clock.ms, level.clock.ticks = ms, ticks
+    sched = level.scheduler
+    sched.reset(ms)
+    level.status.reset()
+    level.particles.clear()
+
+    # --- jugador (mismo objeto: la cámara y el HUD lo siguen) ---
+    p = level.player
+    (x, y, w, h, vx, vy, sx, sy, facing, on_ground, alive, dashing, hp, dash_end, dash_ready,
+     last_shot, hurt_until, energy, anim_start, anim_seen, clip, held, pressed, released,
+     n_press, book_n) = _PLAYER.unpack_from(mv, off)
+    off += _PLAYER.size
+    p.rect.update(x, y, w, h)
+    p.vel.xy = vx, vy
+    p.subpx.xy = sx, sy
+    p.facing, p.on_ground, p.alive, p.is_dashing, p.hp = facing, bool(on_ground), bool(alive), bool(dashing), hp
+    p.dash_ready_ms, p.last_shot_ms, p.hurt_until_ms = dash_ready, last_shot, hurt_until
+    p.energy_pool.energy = energy
+    p.clip = player_clips()[_clip_names()[clip]] if clip != 255 else None
+    p.anim_start_ms, p._anim_seen_ms = anim_start, anim_seen
+    p.status, p.speed_mult = 0, 1.0
+    p.dash_timer = sched.at(dash_end, p._end_dash, dash_end) if dashing and dash_end >= 0 else 0
+    p.dash_end_ms = max(0.0, dash_end)
+    inp = p.input
+    inp.held, inp.pressed, inp.released, inp.fired = held, pressed, released, 0
+    inp._pressed_at = {}
+    for _ in range(n_press):
+        bit, t = _PRESS.unpack_from(mv, off)
+        inp._pressed_at[bit] = t
+        off += _PRESS.size
+    if book_n != len(p.powers.ready_at):
+        raise ValueError("[snapshot] el libro de poderes no coincide")
+    p.powers.ready_at = type(p.powers.ready_at)("d", bytes(mv[off:off + 8 * book_n]))
+    off += 8 * book_n
+    p.powers.unlocked = bytearray(mv[off:off + book_n])
+    off += book_n
+
+    # --- registro nuevo: mismas entidades en el mismo orden ---
+    reg = EntityRegistry()
+    reg.persistent = set(level.entities.persistent)
+    level.entities = reg
+    reg.add(p, "player")
+    refs = [p]
+    level.boss_handle = level.miniboss_handle = None
+    (n,) = _COUNT.unpack_from(mv, off)
+    off += _COUNT.size
+    kinds = []
+    for _ in range(n):
+        (size,) = _COUNT.unpack_from(mv, off)
+        off += _COUNT.size
+        name = bytes(mv[off:off + size]).decode("utf-8")
+        off += size
+        cls = _ENEMY_KINDS.get(name)
+        if cls is None:
+            raise ValueError(f"[snapshot] clase de enemigo desconocida: {name}")
+        kinds.append(cls)
+    (n,) = _COUNT.unpack_from(mv, off)
+    off += _COUNT.size
+    for _ in range(n):
+        (kind, x, y, w, h, vx, vy, sx, sy, facing, on_ground, flags, hp, max_hp,
+         pr0, pr1, show_hp, damage, speed, start_x, r, g, b_) = _ENEMY.unpack_from(mv, off)
+        off += _ENEMY.size
+        e = kinds[kind](x, y)
+        e.rect.update(x, y, w, h)
+        e.vel.xy = vx, vy
+        e.subpx.xy = sx, sy
+        e.facing, e.on_ground, e.hp, e.max_hp = facing, bool(on_ground), hp, max_hp
+        e.alive, e.dead = bool(flags & _E_ALIVE), bool(flags & _E_DEAD)
+        e.is_boss, e.is_miniboss = bool(flags & _E_BOSS), bool(flags & _E_MINI)
+        e.patrol_range = (pr0, pr1)
+        e.show_hp_until = show_hp
+        e.damage, e.speed, e.start_x, e.color = damage, speed, start_x, (r, g, b_)
+        reg.add(e, "enemies")
+        refs.append(e)
+        if e.is_boss:
+            level.boss = e
+        if e.is_miniboss:
+            level.miniboss = e
+
+    (n,) = _COUNT.unpack_from(mv, off)
+    off += _COUNT.size
+    tagsets = []
+    for _ in range(n):
+        (size,) = _COUNT.unpack_from(mv, off)
+        off += _COUNT.size
+        raw = bytes(mv[off:off + size]).decode("utf-8")
+        off += size
+        tagsets.append(tuple(raw.split(",")) if raw else ())
+    (n,) = _COUNT.unpack_from(mv, off)
+    off += _COUNT.size
+    for _ in range(n):
+        x, y, w, h, vx, vy, sx, sy, damage, r, g, b_, tag_i, expire = _BULLET.unpack_from(mv, off)
+        off += _BULLET.size
+        b = Bullet(x, y, damage=damage, color=(r, g, b_), tags=tagsets[tag_i])
+        b.rect.update(x, y, w, h)
+        b.vel.xy = vx, vy
+        b.subpx.xy = sx, sy
+        reg.add(b, "bullets")
+        if expire >= 0:
+            b.expire_id = sched.at(expire, b.kill)
+
+    for kind in KIND_FLAGS:
+        (n,) = _COUNT.unpack_from(mv, off)
+        off += _COUNT.size
+        for _ in range(n):
+            ref, mag, period, expire, tick = _STATUS.unpack_from(mv, off)
+            off += _STATUS.size
+            level.status.restore_row(kind, refs[ref], mag, period, expire, tick)
+
+    (n,) = _COUNT.unpack_from(mv, off)
+    off += _COUNT.size
+    level.voice_cast_queue.clear()
+    for _ in range(n):
+        level.voice_cast_queue.append(_VOICE.unpack_from(mv, off))
+        off += _VOICE.size
+
+    level.camera.view.topleft = (cam_x, cam_y)
+    level._rebuild_broadphase()   # el de antes apunta a las entidades reemplazadas
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    # bytes de distinto largo: el más corto cuenta como relleno de ceros al final
+    n = max(len(a), len(b))
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(n, "little")
+
+
+class RewindBuffer:
+    """
+    Historia de snapshots por tick de los últimos 'seconds' segundos.
+    Se guarda por grupos (keyframe + deltas): al vencer, sale un grupo entero.
+    """
+    def __init__(self, seconds: float = REWIND_SECONDS, keyframe_every: int = REWIND_KEYFRAME_EVERY):
+        self.seconds = seconds
+        self.keyframe_every = keyframe_every
+        self._groups = deque()   # [ms del keyframe, [(ms, largo, blob comprimido), ...]]
+        self._prev = None        # último snapshot sin comprimir (base del próximo delta)
+        self.bytes = 0
+        self.push_ms = 0.0       # costo del último push (snapshot + delta + zlib)
+        self.failed = 0          # ticks sin snapshot (estado que no se pudo serializar)
+
+    def __len__(self):
+        return sum(len(g[1]) for g in self._groups)
+
+    def push(self, level):
+        t0 = time.perf_counter()
+        ms = level.clock.ms
+        try:
+            raw = snapshot(level)
+        except (struct.error, TypeError, ValueError, AttributeError) as exc:
+            # un estado raro no debe tirar el juego: ese tick queda fuera de la historia
+            if not self.failed:
+                print(f"[snapshot] tick {level.clock.ticks} omitido del rebobinado: {exc!r}")
+            self.failed += 1
+            metrics.incr("snapshot_failed")
+            return
+        if self._prev is None or len(self._groups[-1][1]) >= self.keyframe_every:
+            self._groups.append([ms, []])
+            blob = zlib.compress(raw, 1)
+        else:
+            blob = zlib.compress(_xor(raw, self._prev), 1)
+        self._groups[-1][1].append((ms, len(raw), blob))
+        self.bytes += len(blob)
+        self._prev = raw
+        # el grupo más viejo sale cuando el siguiente ya cubre la ventana completa
+        cutoff = ms - self.seconds * 1000.0
+        while len(self._groups) > 1 and self._groups[1][0] <= cutoff:
+            self._drop_group()
+        self.push_ms = (time.perf_counter() - t0) * 1000.0
+        metrics.gauge("snapshot_us", round(self.push_ms * 1000.0))
+        metrics.gauge("rewind_kb", self.bytes // 1024)
+
+    def _drop_group(self):
+        for _, _, blob in self._groups.popleft()[1]:
+            self.bytes -= len(blob)
+
+    @property
+    def span_seconds(self) -> float:
+        if not self._groups:
+            return 0.0
+        return (self._groups[-1][1][-1][0] - self._groups[0][0]) / 1000.0
+
+    def rewind(self, level, seconds: float) -> bool:
+        """Restaura el snapshot más nuevo con ms <= ahora - seconds y descarta lo posterior."""
+        if not self._groups:
+            return False
+        target = level.clock.ms - seconds * 1000.0
+        gi = len(self._groups) - 1
+        while gi > 0 and self._groups[gi][0] > target:
+            gi -= 1
+        entries = self._groups[gi][1]
+        raw = None
+        keep = 0
+        for i, (ms, size, blob) in enumerate(entries):
+            if i and ms > target:
+                break
+            data = zlib.decompress(blob)
+            raw = data if raw is None else _xor(raw, data)[:size]
+            keep = i + 1
+        while len(self._groups) > gi + 1:
+            for _, _, blob in self._groups.pop()[1]:
+                self.bytes -= len(blob)
+        for _, _, blob in entries[keep:]:
+            self.bytes -= len(blob)
+        del entries[keep:]
+        self._prev = raw
+        restore(level, raw)
+        return True
+
+    def clear(self):
+        self._groups.clear()
+        self._prev = None
+        self.bytes = 0
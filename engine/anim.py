@@ -1,6 +1,80 @@
 # engine/anim.py
+"""
+Animaciones.
+
+AnimClip es inmutable y compartido (cuadros + fps + loop + eventos): el cuadro se calcula
+a partir del reloj de la escena y del instante en que la entidad empezó el clip
+(entity.anim_start_ms), así que no hay update por entidad; cada una sólo guarda su clip
+y su desfase. Los eventos por cuadro (pasos, golpe activo...) se consultan con
+events_between() por quien los necesite.
+Animation es la versión con estado propio (t/index + update), para código viejo.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
 import pygame
 
+
+@dataclass(frozen=True)
+class AnimClip:
+    frames: tuple                 # superficies (compartidas: no modificarlas)
+    fps: float = 8.0
+    loop: bool = True
+    events: tuple = ()            # ((índice de cuadro, nombre), ...): se emiten al entrar al cuadro
+
+    def __post_init__(self):
+        object.__setattr__(self, "frames", tuple(self.frames))
+        object.__setattr__(self, "fps", max(0.1, self.fps))
+        object.__setattr__(self, "_per_ms", self.fps / 1000.0)   # cuadros por ms (frame_at es la ruta caliente)
+
+    @property
+    def duration_ms(self) -> float:
+        return len(self.frames) * 1000.0 / self.fps
+
+    def _step(self, t_ms: float) -> int:
+        """Cuadros transcurridos (sin envolver) a los t_ms de haber empezado."""
+        return int(t_ms * self.fps // 1000.0)
+
+    def index_at(self, t_ms: float) -> int:
+        n = len(self.frames)
+        if n <= 1 or t_ms <= 0:
+            return 0
+        k = self._step(t_ms)
+        return k % n if self.loop else min(k, n - 1)
+
+    def frame_at(self, t_ms: float) -> pygame.Surface | None:
+        # igual que frames[index_at(t_ms)], sin llamadas intermedias
+        frames = self.frames
+        n = len(frames)
+        if n <= 1 or t_ms <= 0:
+            return frames[0] if n else None
+        k = int(t_ms * self._per_ms)
+        return frames[k % n] if self.loop else frames[k if k < n else n - 1]
+
+    def done(self, t_ms: float) -> bool:
+        """Clip sin loop terminado (siempre False con loop)."""
+        return not self.loop and t_ms >= self.duration_ms
+
+    def events_between(self, t0_ms: float, t1_ms: float) -> list:
+        """
+        Nombres de los eventos de los cuadros en los que se entró en (t0, t1]
+        (tiempos relativos al inicio del clip; t0 < 0 incluye la entrada al cuadro 0).
+        """
+        if not self.events or t1_ms <= t0_ms:
+            return []
+        n = len(self.frames)
+        k1 = self._step(t1_ms)
+        if not self.loop:
+            k1 = min(k1, n - 1)
+        k0 = max(self._step(t0_ms), k1 - n)   # con saltos grandes basta una vuelta
+        out = []
+        for k in range(k0 + 1, k1 + 1):
+            idx = k % n
+            for frame, name in self.events:
+                if frame == idx:
+                    out.append(name)
+        return out
+
+
 class Animation:
     def __init__(self, frames: list[pygame.Surface], fps: float=8.0, loop: bool=True):
         self.frames = frames or []
@@ -0,0 +1,73 @@
+# engine/camera.py
+import pygame
+from core.config import VIRTUAL_W, VIRTUAL_H, CAMERA_DEADZONE
+
+
+class Camera:
+    """
+    Cámara 2D del nivel: sigue a un objetivo con zona muerta y se limita a 'bounds'.
+    Traduce coordenadas de mundo → canvas (el canvas lógico es VIRTUAL_W x VIRTUAL_H).
+    """
+    def __init__(self, view_w=VIRTUAL_W, view_h=VIRTUAL_H, deadzone=CAMERA_DEADZONE, bounds=None):
+        self.view = pygame.Rect(0, 0, view_w, view_h)   # rect visible en coords de mundo
+        self.deadzone = pygame.Rect(0, 0, *deadzone)     # centrada en la vista
+        self.bounds = bounds                             # Rect del mundo o None (sin límites)
+        self.target = None
+
+    def follow(self, target, snap=True):
+        self.target = target
+        if snap:
+            self.snap()
+
+    def snap(self):
+        """Centra la cámara en el objetivo sin respetar la zona muerta."""
+        if self.target is not None:
+            self.view.center = self.target.rect.center
+        self._clamp()
+
+    def update(self, dt: float = 0.0):
+        if self.target is None:
+            return
+        # zona muerta en coords de mundo (centrada en la vista actual)
+        dz = self.deadzone.copy()
+        dz.center = self.view.center
+        tr = self.target.rect
+        if tr.centerx < dz.left:
+            self.view.x += tr.centerx - dz.left
+        elif tr.centerx > dz.right:
+            self.view.x += tr.centerx - dz.right
+        if tr.centery < dz.top:
+            self.view.y += tr.centery - dz.top
+        elif tr.centery > dz.bottom:
+            self.view.y += tr.centery - dz.bottom
+        self._clamp()
+
+    def _clamp(self):
+        b = self.bounds
+        if not b:   # None o rect vacío (nivel aún sin tiles)
+            return
+        # si el mundo es más chico que la vista, se centra en ese eje
+        if b.w <= self.view.w:
+            self.view.centerx = b.centerx
+        else:
+            self.view.left = max(b.left, min(self.view.left, b.right - self.view.w))
+        if b.h <= self.view.h:
+            self.view.centery = b.centery
+        else:
+            self.view.top = max(b.top, min(self.view.top, b.bottom - self.view.h))
+
+    # ---------- Transformaciones ----------
+    @property
+    def offset(self) -> tuple[int, int]:
+        return self.view.x, self.view.y
+
+    def apply(self, rect: pygame.Rect) -> pygame.Rect:
+        """Rect de mundo → rect de canvas."""
+        return rect.move(-self.view.x, -self.view.y)
+
+    def to_world(self, pos) -> tuple[int, int]:
+        """Punto de canvas → punto de mundo."""
+        return pos[0] + self.view.x, pos[1] + self.view.y
+
+    def is_visible(self, rect: pygame.Rect) -> bool:
+        return self.view.colliderect(rect)
@@ -1,5 +1,7 @@
 # engine/combat.py
 from dataclasses import dataclass, field
+from engine.entity import NO_TAGS
+from engine.status import SHIELDED
 
 class Team:
     PLAYER = "PLAYER"
@@ -8,21 +10,32 @@ class Team:
     NEUTRAL = "NEUTRAL"
 
 
-@dataclass
+@dataclass(slots=True)
 class DamageEvent:
     amount: int = 1
-    tags: set = field(default_factory=set)
+    tags: frozenset = NO_TAGS
     source: object = None
     knockback: tuple = (0, 0)
     apply_status: list = field(default_factory=list)
 
 
-def apply_damage(target, event: DamageEvent):
-    """Aplica daño si el target tiene atributo 'hp'."""
+def apply_damage(target, event: DamageEvent, world=None):
+    """
+    Entrega un golpe: escudo (si tiene) → daño (take_damage o atributo 'hp') → estados
+    de los tags y de event.apply_status (si el mundo tiene StatusEngine).
+    """
     if not getattr(target, "alive", True):
         return
-    dmg = getattr(event, "amount", 1)
-    if hasattr(target, "hp"):
-        target.hp -= dmg
-        if target.hp <= 0:
-            target.alive = False
+    status = getattr(world, "status", None)
+    if status is not None and event.amount > 0 and target.status & SHIELDED:
+        event.amount = status.absorb(target, event.amount)
+    if event.amount > 0:
+        take = getattr(target, "take_damage", None)
+        if take is not None:
+            take(event, world)
+        elif hasattr(target, "hp"):
+            target.hp -= event.amount
+            if target.hp <= 0:
+                target.alive = False
+    if status is not None and target.alive:
+        status.apply_event(target, event)
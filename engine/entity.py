@@ -1,28 +1,68 @@
 # engine/entity.py
 import pygame
+from engine.render import Layer
+
+_TAGS = {}
+
+def intern_tags(tags=()) -> frozenset:
+    """Tags inmutables y compartidos: entidades con los mismos tags usan el mismo frozenset."""
+    key = frozenset(tags or ())
+    return _TAGS.setdefault(key, key)
+
+NO_TAGS = intern_tags()
+
 
 class Entity:
     """
     Clase base para todos los objetos del mundo (jugador, enemigo, bala, item...).
     Define posición, colisiones y ciclo básico update/draw.
+    Con __slots__: las subclases declaran los suyos (sin __dict__ por instancia).
     """
+    __slots__ = ("rect", "vel", "subpx", "color", "alive", "facing", "layer", "team", "tags",
+                 "handle", "use_gravity", "on_ground", "status", "speed_mult", "clip", "anim_start_ms")
+
     def __init__(self, x, y, w, h, color=(255,255,255)):
         self.rect = pygame.Rect(x, y, w, h)
         self.vel = pygame.Vector2(0, 0)
+        self.subpx = pygame.Vector2(0, 0)   # fracción de píxel pendiente (ver physics.step_pixels)
         self.color = color
         self.alive = True
         self.facing = 1
-        self.layer = 0   # usado más adelante para dibujar por orden (UI, fondo, etc.)
+        self.layer = Layer.EFFECTS   # capa de la cola de dibujo (ver engine.render.Layer)
         self.team = "NEUTRAL"  # puede ser PLAYER, ENEMY, ALLY, NEUTRAL
-        self.tags = set()      # elemental tags (electric, time, bio, etc.)
+        self.tags = NO_TAGS    # elemental tags (electric, time, bio, etc.); ver intern_tags
+        self.handle = None     # lo asigna EntityRegistry al registrarla
+        # capacidades explícitas (la física las lee directo, sin hasattr)
+        self.use_gravity = False
+        self.on_ground = False
+        # estado derivado del StatusEngine (engine/status.py); sólo él lo escribe
+        self.status = 0
+        self.speed_mult = 1.0
+        # animación sin estado: clip compartido + instante en que empezó (ver engine/anim.py)
+        self.clip = None
+        self.anim_start_ms = 0.0
 
     def update(self, dt, world):
         """Actualiza estado (posición, IA, timers, etc.)"""
         pass
 
-    def draw(self, screen):
-        """Dibujo placeholder."""
-        pygame.draw.rect(screen, self.color, self.rect)
+    def play(self, clip, now_ms: float, restart: bool = False):
+        """Cambia de clip (si ya lo estaba reproduciendo, sigue salvo restart)."""
+        if clip is not self.clip or restart:
+            self.clip = clip
+            self.anim_start_ms = now_ms
+
+    def submit(self, queue):
+        """Envía sus comandos a la RenderQueue del frame (coordenadas de mundo)."""
+        surf = self.clip.frame_at(queue.now_ms - self.anim_start_ms) if self.clip else None
+        if surf is not None:
+            queue.sprite(surf, self.rect.topleft, self.layer, flip_x=self.facing < 0)
+        else:
+            queue.fill(self.rect, self.color, self.layer)
+
+    def draw(self, screen, offset=(0, 0)):
+        """Dibujo placeholder. 'offset' = esquina superior izquierda de la cámara (mundo)."""
+        pygame.draw.rect(screen, self.color, self.rect.move(-offset[0], -offset[1]))
 
     def kill(self):
         self.alive = False
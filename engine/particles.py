@@ -0,0 +1,245 @@
+# engine/particles.py
+"""
+Partículas para efectos de poderes.
+
+Cada EmitterSpec (inmutable, declarado en la tabla de poderes) tiene su propio pool con
+arrays NumPy de posición, velocidad y vida; el update es un solo paso vectorizado.
+El dibujo escribe los píxeles directo con surfarray (un "sello" por nivel de vida, sin una
+llamada de blit por partícula); emisores con sprites grandes o superficies sin acceso de
+32/16/8 bits caen a una sola llamada a blits/fblits con los sprites pre-renderizados.
+NumPy es opcional: sin él el sistema queda inactivo y los poderes funcionan igual.
+"""
+from __future__ import annotations
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional
+import pygame
+from core.config import PARTICLES_MAX
+
+try:
+    import numpy as np
+except ImportError:   # pragma: no cover - depende del entorno
+    np = None
+
+FADE_STEPS = 8   # sprites pre-renderizados por emisor (vida llena → casi apagada)
+STAMP_MAX_R = 6  # radio máximo dibujado por surfarray; más grande → blits
+
+
+@dataclass(frozen=True)
+class EmitterSpec:
+    color: tuple = (255, 255, 255)
+    count: int = 24                 # partículas por ráfaga
+    speed: tuple = (60.0, 220.0)    # px/s (mín, máx)
+    spread: float = 0.6             # apertura en radianes alrededor de la dirección
+    direction: float = 0.0          # radianes; 0 = hacia donde mira el lanzador
+    life: tuple = (0.25, 0.6)       # segundos (mín, máx)
+    size: int = 3                   # radio en px con vida llena
+    gravity: float = 0.0            # px/s^2 (negativo = flota)
+    drag: float = 0.0               # fracción de velocidad perdida por segundo
+
+    @classmethod
+    def from_row(cls, row: dict) -> "EmitterSpec":
+        row = dict(row)
+        for k in ("color", "speed", "life"):
+            if k in row:
+                row[k] = tuple(row[k])
+        return cls(**row)
+
+
+_KEY = (255, 0, 255)
+
+
+def _fade_sprites(spec: EmitterSpec):
+    """
+    Sprites opacos con colorkey RLE (mucho más baratos de blitear que alfa por píxel):
+    el desvanecimiento se hace encogiendo y oscureciendo el color.
+    """
+    sprites = []
+    for i in range(FADE_STEPS):
+        frac = (i + 1) / FADE_STEPS
+        r = max(1, round(spec.size * (0.4 + 0.6 * frac)))
+        color = tuple(max(1, int(c * (0.3 + 0.7 * frac))) for c in spec.color[:3])
+        surf = pygame.Surface((2 * r, 2 * r))
+        surf.fill(_KEY)
+        pygame.draw.circle(surf, color, (r, r), r)
+        surf.set_colorkey(_KEY, pygame.RLEACCEL)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        sprites.append(surf)
+    return sprites
+
+
+def _stamps(sprites):
+    """Por sprite: offsets (dx, dy) de sus píxeles opacos y su color, para escribirlos con surfarray."""
+    out = []
+    for surf in sprites:
+        mask = pygame.mask.from_surface(surf)   # respeta el colorkey
+        w, h = surf.get_size()
+        pts = [(x, y) for y in range(h) for x in range(w) if mask.get_at((x, y))]
+        dx = np.array([p[0] for p in pts], np.int32)
+        dy = np.array([p[1] for p in pts], np.int32)
+        out.append((dx, dy, surf.get_at(pts[0])[:3] if pts else (0, 0, 0)))
+    return out
+
+
+class Emitter:
+    """Pool de partículas de un EmitterSpec (structure-of-arrays, vivas en [0, n))."""
+    def __init__(self, spec: EmitterSpec, capacity: int = 256):
+        self.spec = spec
+        self.n = 0
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.max_life = np.ones(capacity, np.float32)
+        self.sprites = _fade_sprites(spec)
+        self._half = np.array([[s.get_width() // 2, s.get_height() // 2] for s in self.sprites], np.int32)
+        self._stamps = _stamps(self.sprites) if spec.size <= STAMP_MAX_R else None
+
+    def _reserve(self, extra: int):
+        need = self.n + extra
+        cap = len(self.life)
+        if need <= cap:
+            return
+        cap = max(need, cap * 2)
+        for name in ("pos", "vel"):
+            arr = np.zeros((cap, 2), np.float32)
+            arr[:self.n] = getattr(self, name)[:self.n]
+            setattr(self, name, arr)
+        for name in ("life", "max_life"):
+            arr = np.ones(cap, np.float32)
+            arr[:self.n] = getattr(self, name)[:self.n]
+            setattr(self, name, arr)
+
+    def burst(self, x: float, y: float, facing: int, rng, count: Optional[int] = None):
+        s = self.spec
+        k = s.count if count is None else count
+        self._reserve(k)
+        a, b = self.n, self.n + k
+        base = s.direction if facing >= 0 else math.pi - s.direction
+        ang = base + rng.uniform(-s.spread, s.spread, k)
+        spd = rng.uniform(s.speed[0], s.speed[1], k)
+        self.pos[a:b] = (x, y)
+        self.vel[a:b, 0] = np.cos(ang) * spd
+        self.vel[a:b, 1] = np.sin(ang) * spd
+        life = rng.uniform(s.life[0], s.life[1], k).astype(np.float32)
+        self.life[a:b] = life
+        self.max_life[a:b] = life
+        self.n = b
+
+    def update(self, dt: float):
+        n = self.n
+        if not n:
+            return
+        s = self.spec
+        vel, life = self.vel[:n], self.life[:n]
+        if s.gravity:
+            vel[:, 1] += s.gravity * dt
+        if s.drag:
+            vel *= max(0.0, 1.0 - s.drag * dt)
+        self.pos[:n] += vel * dt
+        life -= dt
+        alive = life > 0
+        if not alive.all():
+            # compacta las vivas al principio (mantiene el orden)
+            m = int(alive.sum())
+            self.pos[:m] = self.pos[:n][alive]
+            self.vel[:m] = vel[alive]
+            self.max_life[:m] = self.max_life[:n][alive]
+            self.life[:m] = life[alive]
+            self.n = m
+
+    def draw(self, screen: pygame.Surface, offset=(0, 0), scale: float = 1.0):
+        n = self.n
+        if not n:
+            return
+        step = np.minimum((self.life[:n] / self.max_life[:n] * FADE_STEPS).astype(np.int32), FADE_STEPS - 1)
+        pos = self.pos[:n] - np.array(offset, np.float32)
+        if scale != 1.0:
+            pos *= scale   # sólo posiciones: los sprites son de pocos px
+        xy = pos.astype(np.int32) - self._half[step]
+        # sólo las que caen en pantalla
+        w, h = screen.get_size()
+        m = 2 * self.spec.size
+        vis = (xy[:, 0] > -m) & (xy[:, 0] < w) & (xy[:, 1] > -m) & (xy[:, 1] < h)
+        if not vis.all():
+            xy, step = xy[vis], step[vis]
+        if self._stamps is not None and self._stamp(screen, xy, step):
+            return
+        sprites = self.sprites
+        seq = zip(map(sprites.__getitem__, step.tolist()), xy.tolist())
+        fblits = getattr(screen, "fblits", None)
+        if fblits:
+            fblits(seq)
+        else:
+            screen.blits(seq, False)
+
+
+    def _stamp(self, screen: pygame.Surface, xy, step) -> bool:
+        """
+        Escribe los sellos en los píxeles de 'screen' (índices lineales sobre el buffer);
+        las partículas que tocan el borde van por blits. False si la superficie no lo permite.
+        """
+        try:
+            px = pygame.surfarray.pixels2d(screen)
+        except (ValueError, pygame.error):   # 24 bits o superficie sin acceso directo
+            return False
+        flat = None
+        try:
+            w, h = px.shape
+            item, pitch = px.strides
+            row = pitch // item
+            flat = np.lib.stride_tricks.as_strided(px, shape=((h - 1) * row + w,), strides=(item,))
+            r = 2 * STAMP_MAX_R
+            inside = (xy[:, 0] >= 0) & (xy[:, 0] < w - r) & (xy[:, 1] >= 0) & (xy[:, 1] < h - r)
+            edge = ~inside
+            base = xy[:, 1] * row + xy[:, 0]
+            full = (1 << (8 * item)) - 1
+            for k in range(FADE_STEPS):
+                sel = inside & (step == k)
+                if not sel.any():
+                    continue
+                dx, dy, color = self._stamps[k]
+                flat[(base[sel, None] + (dy * row + dx)).ravel()] = screen.map_rgb(color) & full
+        finally:
+            del px, flat   # suelta el lock de la superficie
+        if edge.any():
+            sprites = self.sprites
+            screen.blits(zip(map(sprites.__getitem__, step[edge].tolist()), xy[edge].tolist()), False)
+        return True
+
+
+class ParticleSystem:
+    """Un Emitter por EmitterSpec: una llamada de dibujo por tipo de efecto; 'max_live' acota el total."""
+    def __init__(self, seed: int = 0, max_live: int = PARTICLES_MAX):
+        self.emitters: Dict[EmitterSpec, Emitter] = {}
+        self.max_live = max_live
+        self.enabled = np is not None
+        self._rng = np.random.default_rng(seed) if self.enabled else None
+
+    def burst(self, spec: EmitterSpec, x: float, y: float, facing: int = 1, count: Optional[int] = None):
+        if not self.enabled:
+            return
+        room = self.max_live - self.live
+        if room <= 0:
+            return
+        count = min(spec.count if count is None else count, room)
+        em = self.emitters.get(spec)
+        if em is None:
+            em = self.emitters[spec] = Emitter(spec)
+        em.burst(x, y, facing, self._rng, count)
+
+    def update(self, dt: float):
+        for em in self.emitters.values():
+            em.update(dt)
+
+    def draw(self, screen: pygame.Surface, offset=(0, 0), scale: float = 1.0):
+        for em in self.emitters.values():
+            em.draw(screen, offset, scale)
+
+    @property
+    def live(self) -> int:
+        return sum(em.n for em in self.emitters.values())
+
+    def clear(self):
+        for em in self.emitters.values():
+            em.n = 0
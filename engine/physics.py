@@ -4,16 +4,96 @@ from core.config import GRAVITY, MAX_FALL_SPEED
 
 def apply_gravity(entity, dt: float):
     """Aplica gravedad si la entidad la usa, con clamp a velocidad terminal."""
-    if hasattr(entity, "use_gravity") and not entity.use_gravity:
+    if not entity.use_gravity:
         return
     # clamp después de sumar para evitar overshoot
-    entity.vel.y = min(entity.vel.y + GRAVITY * dt, MAX_FALL_SPEED)
+    v0 = entity.vel.y
+    entity.vel.y = min(v0 + GRAVITY * dt, MAX_FALL_SPEED)
+    # el movimiento usa la velocidad nueva; se corrige con la media (trapecio) vía el
+    # acumulador sub-píxel, así la parábola del salto no depende del tick
+    entity.subpx.y -= 0.5 * (entity.vel.y - v0) * dt
+
+def nearby_solids(entity, world, dt: float, margin: int = 32):
+    """Tiles que la entidad puede tocar este frame (consulta local si el mundo tiene índice)."""
+    query = getattr(world, "solids_near", None)
+    if query is None:
+        return getattr(world, "tiles", [])
+    speed = max(abs(entity.vel.x), abs(entity.vel.y), MAX_FALL_SPEED)
+    reach = int(speed * dt) + margin
+    return query(entity.rect.inflate(2 * reach, 2 * reach))
+
+def step_pixels(entity, dt: float):
+    """
+    Desplazamiento entero de este tick + acumulador sub-píxel (entity.subpx).
+    La fracción que no llega a un píxel se guarda para el tick siguiente en vez de perderse.
+    """
+    rem = entity.subpx
+    fx = entity.vel.x * dt + rem.x
+    fy = entity.vel.y * dt + rem.y
+    dx, dy = int(fx), int(fy)   # trunca hacia 0
+    rem.x, rem.y = fx - dx, fy - dy
+    return dx, dy
+
+def sweep_aabb(rect: pygame.Rect, dx: float, dy: float, other: pygame.Rect):
+    """
+    Tiempo de impacto (0..1) de 'rect' moviéndose (dx, dy) contra 'other' estático;
+    None si no lo toca en este tick. 0 si ya se solapan al inicio.
+    """
+    if rect.colliderect(other):
+        return 0.0
+    t_enter, t_exit = 0.0, 1.0
+    for lo, hi, olo, ohi, d in ((rect.left, rect.right, other.left, other.right, dx),
+                                 (rect.top, rect.bottom, other.top, other.bottom, dy)):
+        if d == 0:
+            if hi <= olo or lo >= ohi:
+                return None
+            continue
+        t0 = (olo - hi) / d
+        t1 = (ohi - lo) / d
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_enter, t_exit = max(t_enter, t0), min(t_exit, t1)
+        if t_enter >= t_exit:
+            return None
+    return t_enter
+
+def _sweep_axis(rect, d, tiles, axis):
+    """Avance permitido (≤ |d|) antes de tocar un tile que está por delante en ese eje."""
+    if axis == 0:
+        lo, hi, a_lo, a_hi = rect.left, rect.right, rect.top, rect.bottom
+    else:
+        lo, hi, a_lo, a_hi = rect.top, rect.bottom, rect.left, rect.right
+    for t in tiles:
+        if axis == 0:
+            t_lo, t_hi, t_alo, t_ahi = t.left, t.right, t.top, t.bottom
+        else:
+            t_lo, t_hi, t_alo, t_ahi = t.top, t.bottom, t.left, t.right
+        if t_ahi <= a_lo or t_alo >= a_hi:
+            continue          # no comparte el otro eje
+        if d > 0 and hi <= t_lo < hi + d:
+            d = t_lo - hi
+        elif d < 0 and lo + d < t_hi <= lo:
+            d = t_hi - lo
+    return d
+
+def _resting_on(rect, tiles) -> bool:
+    return any(t.top == rect.bottom and t.left < rect.right and t.right > rect.left for t in tiles)
 
 def move_and_collide(entity, tiles, dt: float):
-    """Desplaza entidad y maneja colisiones con lista de tiles (AABB)."""
+    """
+    Desplaza entidad y maneja colisiones con lista de tiles (AABB).
+    Barrido por eje: el avance se recorta en el primer tile que haya en el camino,
+    así nada atraviesa plataformas finas aunque el tick sea largo.
+    """
+    dx, dy = step_pixels(entity, dt)
 
     # --- Eje X ---
-    entity.rect.x += int(entity.vel.x * dt)
+    if dx:
+        moved = _sweep_axis(entity.rect, dx, tiles, 0)
+        if moved != dx:
+            entity.subpx.x = 0.0
+        entity.rect.x += moved
+    # tiles que ya se solapaban (p.ej. spawn dentro de una plataforma): empuje como antes
     for t in tiles:
         if entity.rect.colliderect(t):
             if entity.vel.x > 0:
@@ -22,17 +102,29 @@ def move_and_collide(entity, tiles, dt: float):
                 entity.rect.left = t.right
 
     # --- Eje Y ---
-    entity.rect.y += int(entity.vel.y * dt)
-    if hasattr(entity, "on_ground"):
-        entity.on_ground = False
+    entity.on_ground = False
+    vy = entity.vel.y   # el empuje de abajo usa la velocidad previa al barrido
+    if dy:
+        moved = _sweep_axis(entity.rect, dy, tiles, 1)
+        entity.rect.y += moved
+        if moved != dy:
+            entity.subpx.y = 0.0
+            entity.vel.y = 0
+            if dy > 0:
+                entity.on_ground = True
 
     for t in tiles:
         if entity.rect.colliderect(t):
-            if entity.vel.y > 0:
+            if vy > 0:
                 entity.rect.bottom = t.top
                 entity.vel.y = 0
-                if hasattr(entity, "on_ground"):
-                    entity.on_ground = True
-            elif entity.vel.y < 0:
+                entity.on_ground = True
+            elif vy < 0:
                 entity.rect.top = t.bottom
                 entity.vel.y = 0
+
+    if dy == 0 and entity.vel.y >= 0 and _resting_on(entity.rect, tiles):
+        # apoyado sin avanzar un píxel entero este tick: sigue en el suelo
+        entity.subpx.y = 0.0
+        entity.vel.y = 0
+        entity.on_ground = True
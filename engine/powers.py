@@ -1,14 +1,19 @@
 # engine/powers.py
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Optional, Set, List
+from dataclasses import dataclass, field, replace
+import json
+from array import array
+from functools import lru_cache
+from typing import Optional, FrozenSet, List, Dict
 from entities.bullet import Bullet
-from engine.combat import DamageEvent
+from engine.combat import DamageEvent, Team, apply_damage
+from engine.particles import EmitterSpec
+from core.config import POWERS_FILE
 import pygame
 # ─────────────────────────────────────────────────────────
 # Energía para poderes
 # ─────────────────────────────────────────────────────────
-@dataclass
+@dataclass(slots=True)
 class EnergyPool:
     max_energy: float = 100.0
     energy: float = 100.0
@@ -33,11 +38,11 @@ class EnergyPool:
 
 
 # ─────────────────────────────────────────────────────────
-# Enfriamientos por poder (cooldowns)
+# Enfriamiento suelto (para usos fuera del libro de poderes)
 # ─────────────────────────────────────────────────────────
-@dataclass
+@dataclass(slots=True)
 class CooldownTracker:
-    cooldown_ms=50
+    cooldown_ms: int = 0
     last_use_ms: int = -10_000_000  # suficientemente en el pasado
 
     def ready(self, now_ms: int) -> bool:
@@ -48,44 +53,88 @@ class CooldownTracker:
 
 
 # ─────────────────────────────────────────────────────────
-# Interfaz base de un poder
+# Definición inmutable de un poder (compartida por todos los lanzadores)
 # ─────────────────────────────────────────────────────────
-@dataclass
+@dataclass(frozen=True)
 class Power:
     name: str
     energy_cost: float = 0.0
     cooldown_ms: int = 0
-    out_tags: Set[str] = field(default_factory=set)
-
-    # El motor asignará estos al equipar el poder:
-    cd: CooldownTracker = field(default_factory=CooldownTracker, init=False)
+    out_tags: FrozenSet[str] = frozenset()
+    fx: Optional[EmitterSpec] = None   # ráfaga de partículas al lanzarlo
+    id: int = -1          # índice en el PowerBook (lo asigna el libro)
 
-    # Reglas de uso
-    def can_use(self, player, world, now_ms: int) -> bool:
-        # Chequeo genérico: cooldown + energía
-        if not self.cd.ready(now_ms):
-            return False
-        pool: Optional[EnergyPool] = getattr(player, "energy_pool", None)
-        if pool is None:
-            return True  # si no hay energía aún, dejar usar (beta)
-        return pool.can_spend(self.energy_cost)
+    def __post_init__(self):
+        object.__setattr__(self, "out_tags", frozenset(self.out_tags or ()))
 
     # Efecto (a implementar en poderes concretos)
-    def use(self, player, world, now_ms: int) -> bool:
+    def use(self, caster, world, now_ms: int) -> bool:
         """
-        Debe ser implementado por subclases: crear bullet/fieldzone/summon/etc.
-        Debe llamar a self.commit_use(player, now_ms) si se ejecuta.
-        Retorna True si se ejecutó, False si no.
+        Crea bullet/hitbox/etc. No toca energía ni cooldown: eso lo hace
+        CasterPowers.try_use con el estado del lanzador. Retorna True si se ejecutó.
         """
         raise NotImplementedError
 
-    # Commit (gasta energía + prende cooldown)
-    def commit_use(self, player, now_ms: int):
-        pool: Optional[EnergyPool] = getattr(player, "energy_pool", None)
+    def emit_fx(self, caster, world):
+        """Ráfaga declarada en 'fx' desde el frente del lanzador (si el mundo tiene partículas)."""
+        particles = getattr(world, "particles", None)
+        if self.fx is None or particles is None:
+            return
+        r = caster.rect
+        particles.burst(self.fx, r.centerx + caster.facing * r.w // 2, r.centery, caster.facing)
+
+
+# ─────────────────────────────────────────────────────────
+# Estado por lanzador: arrays compactos indexados por id de poder
+# ─────────────────────────────────────────────────────────
+class CasterPowers:
+    def __init__(self, book: "PowerBook", unlocked=()):
+        self.book = book
+        n = len(book)
+        self.ready_at = array("d", bytes(8 * n))   # ms de juego en que vuelve a estar listo
+        self.unlocked = bytearray(n)
+        for name in unlocked:
+            self.unlock(name)
+
+    def unlock(self, name: str):
+        pid = self.book.id_of(name)
+        if pid >= 0:
+            self.unlocked[pid] = 1
+
+    def has(self, pid: int) -> bool:
+        return pid >= 0 and self.unlocked[pid] == 1
+
+    def unlocked_names(self) -> List[str]:
+        return [s.name for s in self.book.specs if self.unlocked[s.id]]
+
+    def ready(self, pid: int, now_ms: float) -> bool:
+        return now_ms >= self.ready_at[pid]
+
+    def can_use(self, pid: int, caster, now_ms: float) -> bool:
+        if now_ms < self.ready_at[pid]:
+            return False
+        pool: Optional[EnergyPool] = getattr(caster, "energy_pool", None)
+        return pool is None or pool.can_spend(self.book.specs[pid].energy_cost)
+
+    def commit(self, pid: int, caster, now_ms: float):
+        spec = self.book.specs[pid]
+        pool: Optional[EnergyPool] = getattr(caster, "energy_pool", None)
         if pool:
-            pool.spend(self.energy_cost)
-        self.cd.cooldown_ms = self.cooldown_ms
-        self.cd.mark_used(now_ms)
+            pool.spend(spec.energy_cost)
+        self.ready_at[pid] = now_ms + spec.cooldown_ms
+
+    def try_use(self, pid: int, caster, world, now_ms: float) -> bool:
+        if not self.has(pid) or not self.can_use(pid, caster, now_ms):
+            return False
+        if not self.book.specs[pid].use(caster, world, now_ms):
+            return False
+        self.commit(pid, caster, now_ms)
+        spec = self.book.specs[pid]
+        spec.emit_fx(caster, world)
+        status = getattr(world, "status", None)
+        if status is not None:
+            status.apply_self(caster, spec.out_tags)
+        return True
 
 
 # ─────────────────────────────────────────────────────────
@@ -116,56 +165,50 @@ class PowerSet:
             self.idx = (self.idx - 1) % len(self.loadouts)
 
     # Helpers de uso (el player llamará a estos)
+    def _try(self, p, player, world, now_ms):
+        return player.powers.try_use(p.id, player, world, now_ms) if p else False
+
     def try_primary(self, player, world, now_ms: int) -> bool:
-        p = self.active().primary
-        return p.can_use(player, world, now_ms) and p.use(player, world, now_ms) if p else False
+        return self._try(self.active().primary, player, world, now_ms)
 
     def try_skill1(self, player, world, now_ms: int) -> bool:
-        p = self.active().skill1
-        return p.can_use(player, world, now_ms) and p.use(player, world, now_ms) if p else False
+        return self._try(self.active().skill1, player, world, now_ms)
 
     def try_skill2(self, player, world, now_ms: int) -> bool:
-        p = self.active().skill2
-        return p.can_use(player, world, now_ms) and p.use(player, world, now_ms) if p else False
+        return self._try(self.active().skill2, player, world, now_ms)
+
 
+@dataclass(frozen=True)
 class SimpleShotPower(Power):
-    def __init__(self, name, color, energy_cost=10, cooldown_ms=800,
-                 speed=520, damage=1, lifespan=1.2, out_tags=None):
-        super().__init__(name=name, energy_cost=energy_cost,
-                         cooldown_ms=cooldown_ms, out_tags=set(out_tags or []))
-        self.color = color
-        self.speed = speed
-        self.damage = damage
-        self.lifespan = lifespan
+    color: tuple = (255, 255, 255)
+    speed: float = 520
+    damage: int = 1
+    lifespan: float = 1.2
 
     def use(self, player, world, now_ms):
         dir_ = 1 if player.facing >= 0 else -1
         x = player.rect.centerx + dir_ * 14
         y = player.rect.centery
-        world.bullets.append(
+        world.add_entity(
             Bullet(x, y, direction=dir_, speed=self.speed, damage=self.damage,
-                   lifespan=self.lifespan, color=self.color, tags=self.out_tags)
-        )
-        self.commit_use(player, now_ms)
+                   lifespan=self.lifespan, color=self.color, tags=self.out_tags),
+            "bullets")
         return True
+
+
+@dataclass(frozen=True)
 class MeleePower(Power):
     """
     Golpe corto alcance activado por voz.
     Respeta energía/cooldown y puede activar reactivos por tags.
     """
-    def __init__(self, name,
-                 energy_cost=0, cooldown_ms=280,
-                 range_px=22, w=18, h=16,
-                 damage=1, knockback=(120, -60),
-                 out_tags=None):
-        super().__init__(name=name, energy_cost=energy_cost,
-                         cooldown_ms=cooldown_ms,
-                         out_tags=set(out_tags or {"melee"}))
-        self.range_px = range_px
-        self.w = w
-        self.h = h
-        self.damage = damage
-        self.knockback = knockback
+    cooldown_ms: int = 280
+    out_tags: FrozenSet[str] = frozenset({"melee"})
+    range_px: int = 22
+    w: int = 18
+    h: int = 16
+    damage: int = 1
+    knockback: tuple = (120, -60)
 
     def _hitbox(self, player):
         if player.facing >= 0:
@@ -180,33 +223,76 @@ class MeleePower(Power):
 
         # 1) Daño a enemigos
         hit_any = False
-        for en in list(getattr(world, "enemies", [])):
-            if not getattr(en, "alive", False):
-                continue
-            if hb.colliderect(en.rect):
-                evt = DamageEvent(amount=self.damage,
-                                  tags=self.out_tags,
-                                  source=player,
-                                  knockback=(self.knockback[0] * (1 if player.facing >= 0 else -1),
-                                             self.knockback[1]))
-                en.take_damage(evt)
-                hit_any = True
+        for en in world.query_rect(hb, team=Team.ENEMY):
+            evt = DamageEvent(amount=self.damage,
+                              tags=self.out_tags,
+                              source=player,
+                              knockback=(self.knockback[0] * (1 if player.facing >= 0 else -1),
+                                         self.knockback[1]))
+            apply_damage(en, evt, world)
+            hit_any = True
 
-        # 2) Reacciones del entorno (si existen)
-        for rx in list(getattr(world, "reactives", [])):
-            if not getattr(rx, "alive", False):
-                continue
-            if hb.colliderect(rx.rect):
-                try:
-                    rx.react(self.out_tags, source=player, world=world)
-                    hit_any = True
-                except Exception:
-                    pass
+        # 2) Reacciones del entorno (entidades con tag "reactive")
+        for rx in world.query_rect(hb, tags={"reactive"}):
+            try:
+                rx.react(self.out_tags, source=player, world=world)
+                hit_any = True
+            except Exception:
+                pass
 
         # (Opcional) feedback en el HUD/toast
         if hit_any and hasattr(world, "_show_mic_msg"):
             world._show_mic_msg("Golpe!")
+        return True
+
+
+# ─────────────────────────────────────────────────────────
+# Libro de poderes: tabla de definiciones cargada una vez
+# ─────────────────────────────────────────────────────────
+POWER_KINDS = {"shot": SimpleShotPower, "melee": MeleePower}
+
+
+class PowerBook:
+    def __init__(self, specs):
+        # ids densos = posición en la tabla
+        self.specs: List[Power] = [replace(s, id=i) for i, s in enumerate(specs)]
+        self.by_name: Dict[str, Power] = {s.name: s for s in self.specs}
+        self._ids = {s.name: s.id for s in self.specs}
+
+    def __len__(self):
+        return len(self.specs)
+
+    def id_of(self, name: str) -> int:
+        """-1 si no existe."""
+        return self._ids.get(name.lower(), -1)
+
+    @classmethod
+    def from_rows(cls, rows) -> "PowerBook":
+        specs = []
+        for row in rows:
+            row = dict(row)
+            kind = POWER_KINDS[row.pop("kind", "shot")]
+            if "out_tags" in row:
+                row["out_tags"] = frozenset(row["out_tags"])
+            for k in ("color", "knockback"):
+                if k in row:
+                    row[k] = tuple(row[k])
+            if "fx" in row:
+                row["fx"] = EmitterSpec.from_row(row["fx"])
+            specs.append(kind(**row))
+        return cls(specs)
+
+    @classmethod
+    def load(cls, path: str = POWERS_FILE) -> "PowerBook":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_rows(json.load(f))
+
+    def with_overrides(self, overrides: Dict[str, dict]) -> "PowerBook":
+        """Copia con parámetros cambiados ({nombre: {campo: valor}}); mismos ids."""
+        return PowerBook([replace(s, **overrides.get(s.name, {})) for s in self.specs])
+
 
-        # Gasta energía y activa cooldown
-        self.commit_use(player, now_ms)
-        return True
\ No newline at end of file
+@lru_cache(maxsize=None)
+def default_book() -> PowerBook:
+    """Libro compartido por todos los jugadores/IA (se lee del disco una sola vez)."""
+    return PowerBook.load()
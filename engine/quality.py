@@ -0,0 +1,70 @@
+# engine/quality.py
+"""
+Resolución dinámica: mira el tiempo de trabajo de los últimos frames y baja o sube la
+escala del canvas interno por escalones. Histéresis: baja en cuanto el promedio pasa el
+presupuesto, pero sólo sube si sobra bastante margen y tras un rato estable. Si un
+escalón abajo no mejoró el promedio (p. ej. el reescalado cuesta más de lo que ahorra el
+dibujo), se deshace y ese escalón queda como piso; si un escalón arriba hay que deshacerlo
+enseguida, la espera para volver a subir se duplica (evita oscilar entre dos escalones).
+"""
+from collections import deque
+from core import metrics
+
+
+class QualityController:
+    def __init__(self, budget_ms: float, steps=(1.0, 0.85, 0.75, 0.6, 0.5),
+                 window: int = 30, down_at: float = 0.95, up_at: float = 0.6,
+                 up_hold: int = 120, enabled: bool = True):
+        self.budget_ms = budget_ms
+        self.steps = tuple(steps)
+        self.window = window
+        self.down_at = down_at    # promedio > budget * down_at → escalón abajo
+        self.up_at = up_at        # promedio < budget * up_at (y estable) → escalón arriba
+        self.up_hold = up_hold    # frames mínimos desde el último cambio para subir
+        self.enabled = enabled
+        self.idx = 0
+        self._samples = deque(maxlen=window)
+        self._since_change = 0
+        self.changes = 0
+        self.floor = len(self.steps) - 1   # escalón más bajo que vale la pena usar
+        self._avg_before = None            # promedio antes del último escalón abajo
+        self._hold = up_hold
+        self._went_up = False
+
+    @property
+    def scale(self) -> float:
+        return self.steps[self.idx]
+
+    def observe(self, frame_ms: float) -> bool:
+        """Registra el costo de un frame; True si cambió la escala."""
+        if not self.enabled:
+            return False
+        self._samples.append(frame_ms)
+        self._since_change += 1
+        metrics.gauge("render_scale", self.scale)
+        if len(self._samples) < self.window:
+            return False
+        avg = sum(self._samples) / len(self._samples)
+        if self._avg_before is not None:
+            before, self._avg_before = self._avg_before, None
+            if avg >= before:
+                self.floor = self.idx - 1
+                return self._set(self.idx - 1)
+        if avg > self.budget_ms * self.down_at and self.idx < self.floor:
+            if self._went_up and self._since_change <= 2 * self.window:
+                self._hold = min(self._hold * 2, 16 * self.up_hold)
+            self._avg_before = avg
+            return self._set(self.idx + 1)
+        if (avg < self.budget_ms * self.up_at and self.idx > 0
+                and self._since_change >= self._hold):
+            return self._set(self.idx - 1)
+        return False
+
+    def _set(self, idx: int) -> bool:
+        self._went_up = idx < self.idx
+        self.idx = idx
+        self._samples.clear()
+        self._since_change = 0
+        self.changes += 1
+        metrics.gauge("render_scale", self.scale)
+        return True
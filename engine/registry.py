@@ -0,0 +1,137 @@
+# engine/registry.py
+from typing import NamedTuple
+
+
+class Handle(NamedTuple):
+    """Referencia segura a una entidad: deja de resolver cuando el slot se recicla."""
+    slot: int
+    gen: int
+
+
+class EntityRegistry:
+    """
+    Contenedor de entidades del nivel.
+      - almacenamiento denso (lista contigua) con swap-remove al compactar
+      - handles generacionales: get(h) devuelve None si la entidad ya no existe
+      - índices por grupo ("enemies", "bullets"...), por team y por tag;
+        son dicts usados como sets ordenados (iteración estable por orden de alta)
+    Las bajas se difieren: remove() marca y compact() (fin de tick) borra.
+    Los grupos en 'persistent' (p. ej. "player") no se barren por 'alive': muertos siguen
+    registrados y en sus consultas de team/tag hasta un remove() explícito.
+    """
+    def __init__(self):
+        self._dense = []        # entidades
+        self._dense_slot = []   # slot de cada entrada densa
+        self._slot_dense = []   # slot -> índice en _dense (-1 = libre)
+        self._gen = []          # slot -> generación actual
+        self._group_of = []     # slot -> grupo
+        self._free = []
+        self._pending = {}      # slots a compactar (dict como set ordenado)
+        self._groups = {}
+        self._teams = {}
+        self._tags = {}
+        self.persistent = set()   # grupos que compact() no barre por 'alive'
+        self.spawned = 0
+        self.removed = 0
+
+    def __len__(self):
+        return len(self._dense)
+
+    def __iter__(self):
+        # por índice: tolera altas durante la iteración
+        dense = self._dense
+        for i in range(len(dense)):
+            yield dense[i]
+
+    # ---------- Altas / bajas ----------
+    def add(self, entity, group: str = None) -> Handle:
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._gen)
+            self._gen.append(0)
+            self._slot_dense.append(-1)
+            self._group_of.append(None)
+        self._slot_dense[slot] = len(self._dense)
+        self._group_of[slot] = group
+        self._dense.append(entity)
+        self._dense_slot.append(slot)
+
+        h = Handle(slot, self._gen[slot])
+        entity.handle = h
+        if group is not None:
+            self._groups.setdefault(group, {})[entity] = None
+        self._teams.setdefault(entity.team, {})[entity] = None
+        for tag in entity.tags:
+            self._tags.setdefault(tag, {})[entity] = None
+        self.spawned += 1
+        return h
+
+    def remove(self, entity):
+        """Marca para borrar al final del tick (idempotente)."""
+        h = getattr(entity, "handle", None)
+        if h is None or self.get(h) is not entity:
+            return
+        self._pending[h.slot] = None
+
+    def compact(self):
+        """Borra lo marcado y lo que ya no está 'alive' (swap-remove, O(1) por baja)."""
+        pending = self._pending
+        keep, group_of = self.persistent, self._group_of
+        for i, e in enumerate(self._dense):
+            if not e.alive:
+                slot = self._dense_slot[i]
+                if group_of[slot] not in keep:
+                    pending[slot] = None
+        for slot in pending:
+            idx = self._slot_dense[slot]
+            entity = self._dense[idx]
+            last = len(self._dense) - 1
+            if idx != last:
+                moved_slot = self._dense_slot[last]
+                self._dense[idx] = self._dense[last]
+                self._dense_slot[idx] = moved_slot
+                self._slot_dense[moved_slot] = idx
+            self._dense.pop()
+            self._dense_slot.pop()
+
+            group = self._group_of[slot]
+            if group is not None:
+                self._groups[group].pop(entity, None)
+            self._teams.get(entity.team, {}).pop(entity, None)
+            for tag in entity.tags:
+                self._tags.get(tag, {}).pop(entity, None)
+
+            self._slot_dense[slot] = -1
+            self._group_of[slot] = None
+            self._gen[slot] += 1
+            self._free.append(slot)
+            self.removed += 1
+        pending.clear()
+
+    # ---------- Consultas ----------
+    def get(self, h: Handle):
+        if h is None or h.slot >= len(self._gen) or self._gen[h.slot] != h.gen:
+            return None
+        idx = self._slot_dense[h.slot]
+        return self._dense[idx] if idx >= 0 else None
+
+    def groups(self):
+        return list(self._groups)
+
+    def group(self, name: str):
+        return self._groups.setdefault(name, {}).keys()
+
+    def team(self, team: str):
+        return self._teams.setdefault(team, {}).keys()
+
+    def tagged(self, tag: str):
+        return self._tags.setdefault(tag, {}).keys()
+
+    def counts(self) -> dict:
+        """Conteos para instrumentación."""
+        out = {"entities": len(self._dense), "slots": len(self._gen),
+               "spawned": self.spawned, "removed": self.removed}
+        for name, members in self._groups.items():
+            out[name] = len(members)
+        return out
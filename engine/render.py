@@ -0,0 +1,162 @@
+# engine/render.py
+"""
+Cola de dibujo por capas.
+
+Las entidades no dibujan directo: envían comandos (relleno de rect, sprite, llamada libre)
+con su capa, en coordenadas de mundo. flush() recorre las capas en orden y, dentro de cada
+una, vuelca rellenos y sprites en un solo blits (los rellenos se blitean desde superficies
+sólidas cacheadas por color/tamaño: en pygame es bastante más barato que fill por rect)
+y al final las llamadas libres (barras de vida, partículas...).
+"""
+import pygame
+from core import metrics
+
+
+class Layer:
+    BACKGROUND = 0
+    TILES      = 10
+    ENEMIES    = 20
+    BULLETS    = 30
+    PLAYER     = 40
+    EFFECTS    = 50
+
+
+def merge_rects(rects):
+    """Fusiona rects alineados que se tocan en horizontal (misma y/alto) o vertical (misma x/ancho)."""
+    if len(rects) < 2:
+        return rects
+    out = []
+    for r in sorted(rects, key=lambda r: (r.y, r.h, r.x)):
+        last = out[-1] if out else None
+        if last is not None and last.y == r.y and last.h == r.h and r.x <= last.right:
+            last.width = max(last.right, r.right) - last.x
+        else:
+            out.append(pygame.Rect(r))
+    if len(out) < 2:
+        return out
+    merged = []
+    for r in sorted(out, key=lambda r: (r.x, r.w, r.y)):
+        last = merged[-1] if merged else None
+        if last is not None and last.x == r.x and last.w == r.w and r.y <= last.bottom:
+            last.height = max(last.bottom, r.bottom) - last.y
+        else:
+            merged.append(r)
+    return merged
+
+
+class _Bucket:
+    __slots__ = ("fills", "blits", "calls")
+
+    def __init__(self):
+        self.fills = {}    # color -> [Rect en pantalla]
+        self.blits = []    # (superficie, (x, y))
+        self.calls = []    # fn(screen, offset, scale)
+
+
+class RenderQueue:
+    TINT_CACHE_SIZE = 256
+    SOLID_CACHE_SIZE = 512
+    # capas de geometría estática: sus rellenos se fusionan antes de dibujar
+    MERGE_LAYERS = frozenset({Layer.TILES})
+
+    def __init__(self):
+        self.offset = (0, 0)
+        self._buckets = {}
+        self._variants = {}   # (superficie, flip_x, tint) -> superficie derivada
+        self._solids = {}     # (color, w, h) -> superficie rellena
+        self.commands = 0
+        self.scale = 1.0
+        self.now_ms = 0.0
+
+    def begin(self, offset=(0, 0), scale: float = 1.0, now_ms: float = 0.0):
+        """
+        Empieza un frame: 'offset' = esquina superior izquierda de la cámara (mundo);
+        'scale' = resolución interna (<1 dibuja más chico; ver engine/quality.py);
+        'now_ms' = reloj de la escena (lo visual que depende de plazos se deriva de él).
+        """
+        self.offset = offset
+        self.scale = scale
+        self.now_ms = now_ms
+        self._buckets.clear()
+        self.commands = 0
+
+    def _bucket(self, layer) -> _Bucket:
+        b = self._buckets.get(layer)
+        if b is None:
+            b = self._buckets[layer] = _Bucket()
+        return b
+
+    # ---------- comandos (coordenadas de mundo) ----------
+    def fill(self, rect: pygame.Rect, color, layer: int):
+        ox, oy = self.offset
+        r = rect.move(-ox, -oy)
+        k = self.scale
+        if k != 1.0:
+            # por bordes, para que rects vecinos sigan tocándose
+            x0, y0 = int(r.left * k), int(r.top * k)
+            r = pygame.Rect(x0, y0, int(r.right * k) - x0, int(r.bottom * k) - y0)
+        self._bucket(layer).fills.setdefault(color, []).append(r)
+        self.commands += 1
+
+    def sprite(self, surf, pos, layer: int, flip_x: bool = False, tint=None, prescaled: bool = False):
+        """prescaled: 'surf' ya está a self.scale (lo cachea el llamador, p. ej. chunks de tiles)."""
+        k = self.scale
+        if flip_x or tint is not None or (k != 1.0 and not prescaled):
+            surf = self._variant(surf, flip_x, tint, k)
+        self._bucket(layer).blits.append(
+            (surf, (int((pos[0] - self.offset[0]) * k), int((pos[1] - self.offset[1]) * k))))
+        self.commands += 1
+
+    def call(self, fn, layer: int):
+        """Dibujo libre: fn(screen, offset, scale) se ejecuta al final de su capa."""
+        self._bucket(layer).calls.append(fn)
+        self.commands += 1
+
+    def _variant(self, surf, flip_x, tint, scale=1.0):
+        key = (surf, flip_x, tint, scale)
+        out = self._variants.get(key)
+        if out is None:
+            if len(self._variants) >= self.TINT_CACHE_SIZE:
+                self._variants.clear()
+            out = pygame.transform.flip(surf, True, False) if flip_x else surf.copy()
+            if tint is not None:
+                out.fill(tint, special_flags=pygame.BLEND_RGB_MULT)
+            if scale != 1.0:
+                w, h = out.get_size()
+                out = pygame.transform.scale(out, (max(1, round(w * scale)), max(1, round(h * scale))))
+            self._variants[key] = out
+        return out
+
+    def _solid(self, color, w, h):
+        key = (color, w, h)
+        surf = self._solids.get(key)
+        if surf is None:
+            if len(self._solids) >= self.SOLID_CACHE_SIZE:
+                self._solids.clear()
+            alpha = len(color) == 4 and color[3] < 255
+            surf = pygame.Surface((w, h), pygame.SRCALPHA if alpha else 0)
+            surf.fill(color)
+            self._solids[key] = surf
+        return surf
+
+    # ---------- volcado ----------
+    def flush(self, screen: pygame.Surface):
+        calls = 0
+        solid = self._solid
+        for layer in sorted(self._buckets):
+            b = self._buckets[layer]
+            seq = []
+            for color, rects in b.fills.items():
+                if layer in self.MERGE_LAYERS:
+                    rects = merge_rects(rects)
+                seq += [(solid(color, r.w, r.h), r) for r in rects]
+            seq += b.blits
+            if seq:
+                screen.blits(seq, False)
+                calls += 1
+            for fn in b.calls:
+                fn(screen, self.offset, self.scale)
+                calls += 1
+        metrics.gauge("draw_cmds", self.commands)
+        metrics.gauge("draw_calls", calls)
+        self._buckets.clear()
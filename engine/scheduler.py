@@ -0,0 +1,58 @@
+# engine/scheduler.py
+"""
+Servicio de temporizadores de la escena, sobre su reloj simulado (GameClock.ms).
+
+En vez de que cada objeto descuente sus timers todos los frames, guarda un plazo
+(p. ej. hurt_until_ms) y compara contra el reloj cuando lo necesita, o registra un
+callback que se ejecuta al vencer. Los vencimientos van en una TimerWheel: el costo
+por frame depende de los callbacks que vencen, no de los pendientes.
+"""
+from core import metrics
+from engine.timerwheel import TimerWheel
+
+
+class Scheduler:
+    def __init__(self, resolution_ms: float = 10.0):
+        self.wheel = TimerWheel(resolution_ms)
+        self.now_ms = 0.0
+        self.fired = 0      # callbacks ejecutados en el último update
+
+    def __len__(self):
+        return len(self.wheel)
+
+    def at(self, due_ms: float, fn, *args) -> int:
+        """fn(*args) en el primer update con now_ms >= due_ms; devuelve un id para cancelar."""
+        return self.wheel.schedule(due_ms, (fn, args))
+
+    def after(self, delay_ms: float, fn, *args) -> int:
+        return self.wheel.schedule(self.now_ms + delay_ms, (fn, args))
+
+    def cancel(self, tid) -> bool:
+        """False si ya venció o se canceló antes (cancelar dos veces es inofensivo)."""
+        return bool(tid) and self.wheel.cancel(tid)
+
+    def pending(self, tid) -> bool:
+        return tid in self.wheel
+
+    def update(self, now_ms: float):
+        """Lo llama la escena al principio de cada paso de simulación."""
+        self.now_ms = now_ms
+        fired = self.wheel.advance(now_ms)
+        for _, (fn, args) in fired:
+            fn(*args)
+        self.fired = len(fired)
+        metrics.gauge("sched_fired_tick", self.fired)
+        metrics.incr("sched_fired", self.fired)
+        metrics.gauge("sched_pending", len(self.wheel))
+
+    def clear(self):
+        self.wheel.clear()
+
+    def reset(self, now_ms: float):
+        """Sin pendientes y con el reloj en now_ms (los dueños vuelven a agendar lo suyo)."""
+        self.wheel.reset(now_ms)
+        self.now_ms = now_ms
+
+    def due_ms(self, tid) -> float:
+        """Vencimiento de un pendiente (redondeado a la resolución) o -1."""
+        return self.wheel.due_ms(tid) if tid else -1.0
@@ -0,0 +1,157 @@
+# engine/spatial.py
+import pygame
+from core.config import SPATIAL_CELL, BROADPHASE_CELL
+
+
+class SpatialGrid:
+    """
+    Hash espacial uniforme para objetos con rect (tiles, chunks, etc.).
+    Cada item se registra en todas las celdas que toca; 'query' sólo recorre
+    las celdas del área pedida, así el costo depende de lo local, no del total.
+    """
+    def __init__(self, cell: int = SPATIAL_CELL):
+        self.cell = cell
+        self._cells = {}   # (cx, cy) -> list[(item, rect)]
+        self._where = {}   # id(item) -> (item, rect, [celdas])
+
+    def __len__(self):
+        return len(self._where)
+
+    def _span(self, rect):
+        c = self.cell
+        return (rect.left // c, rect.top // c,
+                (rect.right - 1) // c, (rect.bottom - 1) // c)
+
+    def insert(self, item, rect=None):
+        rect = pygame.Rect(rect if rect is not None else item)
+        x0, y0, x1, y1 = self._span(rect)
+        keys = []
+        entry = (item, rect)
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                self._cells.setdefault((cx, cy), []).append(entry)
+                keys.append((cx, cy))
+        self._where[id(item)] = (item, rect, keys)
+
+    def remove(self, item):
+        found = self._where.pop(id(item), None)
+        if found is None:
+            return False
+        _, _, keys = found
+        for k in keys:
+            bucket = self._cells.get(k)
+            if bucket is None:
+                continue
+            bucket[:] = [e for e in bucket if e[0] is not item]
+            if not bucket:
+                del self._cells[k]
+        return True
+
+    def clear(self):
+        self._cells.clear()
+        self._where.clear()
+
+    def query(self, rect) -> list:
+        """Items cuyo rect se solapa con 'rect' (sin duplicados, orden de inserción por celda)."""
+        rect = pygame.Rect(rect)
+        x0, y0, x1, y1 = self._span(rect)
+        out, seen = [], set()
+        cells = self._cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for item, r in bucket:
+                    key = id(item)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    if r.colliderect(rect):
+                        out.append(item)
+        return out
+
+
+class Broadphase:
+    """
+    Broadphase dinámico: hash espacial reconstruido una vez por tick con las entidades vivas.
+    Las consultas sólo miran las celdas del área pedida y devuelven los resultados en el
+    orden en que se pasaron a rebuild() (mismo orden que recorrer las listas del nivel).
+    Filtros: team (str o tupla) y tags (alguno en común).
+    """
+    def __init__(self, cell: int = BROADPHASE_CELL):
+        self.cell = cell
+        self._cells = {}   # (cx, cy) -> [orden]
+        self._items = []   # orden -> entidad
+        self.queries = 0
+
+    def rebuild(self, entities):
+        cells, c = {}, self.cell
+        self._items = items = []
+        for e in entities:
+            if not e.alive:
+                continue
+            i = len(items)
+            items.append(e)
+            r = e.rect
+            for cy in range(r.top // c, (r.bottom - 1) // c + 1):
+                for cx in range(r.left // c, (r.right - 1) // c + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[(cx, cy)] = [i]
+                    else:
+                        bucket.append(i)
+        self._cells = cells
+
+    def _candidates(self, bbox, team, tags):
+        """Índices únicos en las celdas de 'bbox', ya filtrados por team/tags/alive."""
+        c = self.cell
+        found = set()
+        cells = self._cells
+        for cy in range(bbox.top // c, (bbox.bottom - 1) // c + 1):
+            for cx in range(bbox.left // c, (bbox.right - 1) // c + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        self.queries += 1
+        items = self._items
+        for i in sorted(found):
+            e = items[i]
+            if not e.alive:
+                continue
+            if team is not None and (e.team != team if isinstance(team, str) else e.team not in team):
+                continue
+            if tags is not None and not (e.tags & tags):
+                continue
+            yield e
+
+    def query_rect(self, rect, team=None, tags=None) -> list:
+        rect = pygame.Rect(rect)
+        return [e for e in self._candidates(rect, team, tags) if rect.colliderect(e.rect)]
+
+    def query_circle(self, center, radius, team=None, tags=None) -> list:
+        cx, cy = center
+        bbox = pygame.Rect(int(cx - radius), int(cy - radius), int(2 * radius) + 1, int(2 * radius) + 1)
+        r2 = radius * radius
+        out = []
+        for e in self._candidates(bbox, team, tags):
+            r = e.rect
+            # punto del rect más cercano al centro
+            dx = cx - max(r.left, min(cx, r.right))
+            dy = cy - max(r.top, min(cy, r.bottom))
+            if dx * dx + dy * dy <= r2:
+                out.append(e)
+        return out
+
+    def query_segment(self, p0, p1, team=None, tags=None) -> list:
+        """Entidades que cruza el segmento, ordenadas por distancia desde p0."""
+        (x0, y0), (x1, y1) = p0, p1
+        bbox = pygame.Rect(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1)
+        hits = []
+        for e in self._candidates(bbox, team, tags):
+            clip = e.rect.clipline(p0, p1)
+            if clip:
+                ex, ey = clip[0]
+                hits.append(((ex - x0) ** 2 + (ey - y0) ** 2, len(hits), e))
+        hits.sort(key=lambda h: (h[0], h[1]))
+        return [e for _, _, e in hits]
@@ -0,0 +1,240 @@
+# engine/status.py
+"""
+Estados alterados (lentitud, congelado, aturdido, daño/curación periódica, escudo).
+
+Cada tipo de estado tiene su propia tabla compacta (entidad → fila; magnitud y ids de
+temporizador en arrays) y los vencimientos y ticks periódicos son callbacks del
+Scheduler de la escena (una TimerWheel): el costo por frame es proporcional a los
+estados que vencen o hacen tick, no a los activos. Lo que el resto del juego consulta
+se deriva al aplicar/quitar un estado:
+  entity.status      máscara de bits (SLOW, FROZEN, STUNNED, DOT, HEAL, SHIELDED)
+  entity.speed_mult  multiplicador de velocidad (lentitud)
+Los estados salen de los tags de los poderes (engine/data/status.json) y de
+DamageEvent.apply_status.
+"""
+from __future__ import annotations
+import json
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Tuple
+from core.config import STATUS_FILE
+from engine.scheduler import Scheduler
+
+# bits de entity.status
+SLOW     = 1 << 0
+FROZEN   = 1 << 1
+STUNNED  = 1 << 2
+DOT      = 1 << 3
+HEAL     = 1 << 4
+SHIELDED = 1 << 5
+IMMOBILE = FROZEN | STUNNED
+
+KIND_FLAGS = {"slow": SLOW, "freeze": FROZEN, "stun": STUNNED, "dot": DOT, "heal": HEAL, "shield": SHIELDED}
+
+
+@dataclass(frozen=True)
+class StatusSpec:
+    kind: str                   # clave de KIND_FLAGS
+    duration_ms: int = 1000
+    magnitude: float = 1.0      # slow: multiplicador; dot/heal: hp por tick; shield: daño absorbible
+    period_ms: int = 0          # dot/heal: cada cuánto hace tick
+    target: str = "hit"         # "hit" = al que recibe el golpe; "self" = al lanzador
+
+    @classmethod
+    def from_row(cls, row: dict) -> "StatusSpec":
+        spec = cls(**row)
+        if spec.kind not in KIND_FLAGS:
+            raise ValueError(f"[status] tipo desconocido: {spec.kind}")
+        return spec
+
+
+@lru_cache(maxsize=None)
+def tag_table() -> Dict[str, StatusSpec]:
+    """tag de poder → estado que aplica (se lee del disco una sola vez)."""
+    with open(STATUS_FILE, encoding="utf-8") as f:
+        return {tag: StatusSpec.from_row(row) for tag, row in json.load(f).items()}
+
+
+@lru_cache(maxsize=256)
+def specs_for_tags(tags: frozenset) -> Tuple[StatusSpec, ...]:
+    """Los tags vienen internados (engine.entity.intern_tags): la caché acierta casi siempre."""
+    table = tag_table()
+    return tuple(table[t] for t in sorted(tags) if t in table)
+
+
+class _Table:
+    """Estados de un tipo: una fila por entidad afectada (borrado por swap)."""
+    __slots__ = ("kind", "flag", "rows", "ents", "mag", "period", "expire", "tick")
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.flag = KIND_FLAGS[kind]
+        self.rows = {}           # entidad -> fila
+        self.ents = []
+        self.mag = array("d")
+        self.period = array("l")   # ms entre ticks (0 = sin tick)
+        self.expire = array("q")   # id de temporizador de fin
+        self.tick = array("q")     # id del próximo tick periódico (0 = sin tick)
+
+    def __len__(self):
+        return len(self.ents)
+
+    def add(self, ent, mag: float, period: int) -> int:
+        row = self.rows[ent] = len(self.ents)
+        self.ents.append(ent)
+        self.mag.append(mag)
+        self.period.append(period)
+        self.expire.append(0)
+        self.tick.append(0)
+        return row
+
+    def remove(self, ent) -> Tuple[int, int]:
+        """Quita la fila de 'ent'; devuelve sus temporizadores (fin, tick) para cancelarlos."""
+        row = self.rows.pop(ent)
+        timers = (self.expire[row], self.tick[row])
+        last = len(self.ents) - 1
+        if row != last:
+            moved = self.ents[last]
+            self.ents[row] = moved
+            self.mag[row] = self.mag[last]
+            self.period[row] = self.period[last]
+            self.expire[row] = self.expire[last]
+            self.tick[row] = self.tick[last]
+            self.rows[moved] = row
+        self.ents.pop()
+        self.mag.pop()
+        self.period.pop()
+        self.expire.pop()
+        self.tick.pop()
+        return timers
+
+
+class StatusEngine:
+    def __init__(self, scheduler: Scheduler = None):
+        # sin scheduler propio de la escena (benchmarks, pruebas) usa uno privado
+        self.scheduler = scheduler if scheduler is not None else Scheduler()
+        self.tables: Dict[str, _Table] = {kind: _Table(kind) for kind in KIND_FLAGS}
+
+    # ---------- aplicar ----------
+    def apply(self, ent, spec: StatusSpec, now_ms: float = None):
+        """Aplica o renueva 'spec' en 'ent' (renovar: más duración y la magnitud más fuerte)."""
+        sched = self.scheduler
+        now = sched.now_ms if now_ms is None else now_ms
+        table = self.tables[spec.kind]
+        row = table.rows.get(ent)
+        if row is None:
+            row = table.add(ent, spec.magnitude, spec.period_ms)
+            ent.status |= table.flag
+            if spec.period_ms:
+                table.tick[row] = sched.at(now + spec.period_ms, self._on_tick, table, ent)
+        else:
+            sched.cancel(table.expire[row])
+            if spec.kind == "slow":
+                table.mag[row] = min(table.mag[row], spec.magnitude)
+            else:
+                table.mag[row] = max(table.mag[row], spec.magnitude)
+        table.expire[row] = sched.at(now + spec.duration_ms, self._on_expire, table, ent)
+        if spec.kind == "slow":
+            ent.speed_mult = table.mag[row]
+
+    def apply_event(self, ent, event):
+        """Estados de un golpe: los de sus tags (target 'hit') + event.apply_status."""
+        for spec in specs_for_tags(event.tags):
+            if spec.target == "hit":
+                self.apply(ent, spec)
+        for spec in event.apply_status:
+            self.apply(ent, spec)
+
+    def apply_self(self, caster, tags: frozenset):
+        """Estados que un poder aplica a quien lo lanza (burbuja → escudo, curar → curación)."""
+        for spec in specs_for_tags(tags):
+            if spec.target == "self":
+                self.apply(caster, spec)
+
+    def remove(self, ent, kind: str) -> bool:
+        table = self.tables[kind]
+        if ent not in table.rows:
+            return False
+        self._drop(table, ent)
+        return True
+
+    def _drop(self, table: _Table, ent):
+        expire, tick = table.remove(ent)
+        self.scheduler.cancel(expire)
+        self.scheduler.cancel(tick)
+        ent.status &= ~table.flag
+        if table.flag == SLOW:
+            ent.speed_mult = 1.0
+
+    # ---------- consultas ----------
+    def magnitude(self, ent, kind: str) -> float:
+        table = self.tables[kind]
+        row = table.rows.get(ent)
+        return table.mag[row] if row is not None else 0.0
+
+    def absorb(self, ent, amount: float) -> float:
+        """Descuenta 'amount' del escudo de 'ent'; devuelve el daño que pasa."""
+        table = self.tables["shield"]
+        row = table.rows.get(ent)
+        if row is None:
+            return amount
+        left = table.mag[row] - amount
+        if left > 0:
+            table.mag[row] = left
+            return 0
+        self._drop(table, ent)
+        return int(-left)
+
+    def count(self) -> int:
+        return sum(len(t) for t in self.tables.values())
+
+    # ---------- callbacks del scheduler ----------
+    def _on_expire(self, table: _Table, ent):
+        if ent in table.rows:
+            self._drop(table, ent)
+
+    def _on_tick(self, table: _Table, ent):
+        row = table.rows.get(ent)
+        if row is None:
+            return
+        if not getattr(ent, "alive", True):
+            self._drop(table, ent)
+            return
+        amount = int(table.mag[row])
+        if table.flag == DOT:
+            # daño directo (sin pasar por escudo ni volver a aplicar estados)
+            ent.hp -= amount
+            if ent.hp <= 0:
+                ent.hp = 0
+                if hasattr(ent, "dead"):
+                    ent.dead = True
+                ent.alive = False
+                self._drop(table, ent)
+                return
+        else:
+            ent.hp = min(getattr(ent, "max_hp", ent.hp), ent.hp + amount)
+        table.tick[row] = self.scheduler.after(table.period[row], self._on_tick, table, ent)
+
+    def clear(self):
+        for table in self.tables.values():
+            for ent in list(table.ents):
+                self._drop(table, ent)
+
+    # ---------- snapshots (core/snapshot.py) ----------
+    def reset(self):
+        """Tablas vacías sin tocar entidades ni scheduler (éste ya se reinició aparte)."""
+        self.tables = {kind: _Table(kind) for kind in KIND_FLAGS}
+
+    def restore_row(self, kind: str, ent, mag: float, period: int, expire_ms: float, tick_ms: float):
+        """Vuelve a poner un estado con sus vencimientos absolutos (tick_ms < 0 = sin tick)."""
+        sched = self.scheduler
+        table = self.tables[kind]
+        row = table.add(ent, mag, period)
+        ent.status |= table.flag
+        if table.flag == SLOW:
+            ent.speed_mult = mag
+        if expire_ms >= 0:
+            table.expire[row] = sched.at(expire_ms, self._on_expire, table, ent)
+        if tick_ms >= 0:
+            table.tick[row] = sched.at(tick_ms, self._on_tick, table, ent)
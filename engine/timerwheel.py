@@ -0,0 +1,105 @@
+# engine/timerwheel.py
+"""
+Rueda de temporizadores jerárquica sobre el tiempo de juego (ms del GameClock).
+
+Cada nivel tiene 2^bits casillas; el nivel 0 cuenta ticks de 'resolution_ms' y cada
+nivel siguiente casillas 2^bits veces más anchas. Un temporizador entra en el nivel más
+bajo donde su vencimiento y el tiempo actual coinciden en los dígitos de arriba, y baja
+de nivel ("cascada") cuando el tiempo llega al comienzo de su casilla. advance() cuesta
+lo que los ticks transcurridos más los temporizadores que vencen o bajan: los que siguen
+esperando no se tocan. Cancelar es O(1) (borrado perezoso: la casilla guarda el id y al
+procesarla se saltan los cancelados).
+"""
+from itertools import count
+
+
+class TimerWheel:
+    def __init__(self, resolution_ms: float = 10.0, bits: int = 6, levels: int = 4):
+        self.resolution_ms = resolution_ms
+        self.bits = bits
+        self.levels = levels
+        self._mask = (1 << bits) - 1
+        self._span = 1 << (bits * levels)     # ticks máximos hacia adelante (≈46 h con 10 ms)
+        self._wheels = [[[] for _ in range(1 << bits)] for _ in range(levels)]
+        self._timers = {}                     # id -> (tick de vencimiento, payload)
+        self._ids = count(1)
+        self.now = 0                          # último tick procesado
+
+    def __len__(self):
+        return len(self._timers)
+
+    def __contains__(self, tid) -> bool:
+        return tid in self._timers
+
+    def _tick_of(self, ms: float) -> int:
+        return int(ms // self.resolution_ms)
+
+    def _place(self, tid: int, due: int):
+        diff = due ^ self.now
+        level = 0
+        while level < self.levels - 1 and diff >> (self.bits * (level + 1)):
+            level += 1
+        self._wheels[level][(due >> (self.bits * level)) & self._mask].append(tid)
+
+    def schedule(self, due_ms: float, payload=None) -> int:
+        """Vence en el primer advance() con now_ms >= due_ms (como mínimo el próximo tick)."""
+        due = -int(-due_ms // self.resolution_ms)   # hacia arriba: nunca vence antes de due_ms
+        due = min(max(due, self.now + 1), self.now + self._span - 1)
+        tid = next(self._ids)
+        self._timers[tid] = (due, payload)
+        self._place(tid, due)
+        return tid
+
+    def cancel(self, tid) -> bool:
+        return self._timers.pop(tid, None) is not None
+
+    def due_ms(self, tid) -> float:
+        """Vencimiento (redondeado a la resolución) o -1 si ya no está."""
+        entry = self._timers.get(tid)
+        return entry[0] * self.resolution_ms if entry else -1.0
+
+    def advance(self, now_ms: float) -> list:
+        """Procesa los ticks hasta now_ms; devuelve [(id, payload)] vencidos en orden de vencimiento."""
+        target = self._tick_of(now_ms)
+        out = []
+        if not self._timers:
+            self.now = max(self.now, target)
+            return out
+        timers, wheels, bits, mask = self._timers, self._wheels, self.bits, self._mask
+        while self.now < target:
+            self.now = t = self.now + 1
+            # cascada: niveles cuyo dígito inferior volvió a 0 (de arriba hacia abajo)
+            top = 1
+            while top < self.levels and not t & ((1 << (bits * top)) - 1):
+                top += 1
+            for level in range(top - 1, 0, -1):
+                idx = (t >> (bits * level)) & mask
+                slot = wheels[level][idx]
+                if slot:
+                    wheels[level][idx] = []
+                    for tid in slot:
+                        entry = timers.get(tid)
+                        if entry is not None:
+                            self._place(tid, entry[0])
+            slot = wheels[0][t & mask]
+            if slot:
+                wheels[0][t & mask] = []
+                for tid in slot:
+                    entry = timers.pop(tid, None)
+                    if entry is not None:
+                        out.append((tid, entry[1]))
+            if not timers:
+                self.now = target
+                break
+        return out
+
+    def clear(self):
+        self._timers.clear()
+        for wheel in self._wheels:
+            for i in range(len(wheel)):
+                wheel[i] = []
+
+    def reset(self, now_ms: float):
+        """Vacía la rueda y la pone en now_ms (también hacia atrás: restaurar un snapshot)."""
+        self.clear()
+        self.now = self._tick_of(now_ms)
@@ -1,56 +1,169 @@
 # engine/ui.py
 import pygame
 from core.config import COLOR_HUD, VIRTUAL_W
+from core.resources import render_text
+from core import metrics
+
+_UNSET = object()
+
+
+# ─────────────────────────────────────────────────────────
+# Widgets retenidos: cachean su superficie y sólo se re-renderizan
+# cuando el valor enlazado cambia más que 'threshold'
+# ─────────────────────────────────────────────────────────
+class Widget:
+    def __init__(self, bind, threshold=0):
+        self.bind = bind            # callable -> valor actual (None = oculto)
+        self.threshold = threshold
+        self.surface = None
+        self.dest = (0, 0)
+        self._value = _UNSET
+
+    def _changed(self, value) -> bool:
+        old = self._value
+        if old is _UNSET:
+            return True
+        if self.threshold and isinstance(value, (int, float)) and isinstance(old, (int, float)):
+            return abs(value - old) > self.threshold
+        return value != old
+
+    def refresh(self) -> bool:
+        value = self.bind()
+        if not self._changed(value):
+            return False
+        self._value = value
+        if value is None:
+            self.surface = None
+        else:
+            self.surface, self.dest = self.render(value)
+        metrics.incr("hud_redraws")
+        return True
+
+    def render(self, value):
+        """Devuelve (superficie, posición en pantalla)."""
+        raise NotImplementedError
+
+
+class HeartsWidget(Widget):
+    def __init__(self, bind, pos, size=18, gap=4):
+        super().__init__(bind)
+        self.pos, self.size, self.gap = pos, size, gap
+
+    def render(self, value):
+        hp, max_hp = value
+        step = self.size + self.gap
+        surf = pygame.Surface((max(1, max_hp * step - self.gap), self.size), pygame.SRCALPHA)
+        for i in range(max_hp):
+            color = (255, 80, 80) if i < hp else (60, 30, 30)
+            pygame.draw.rect(surf, color, (i * step, 0, self.size, self.size))
+        return surf, self.pos
+
+
+class BarWidget(Widget):
+    """Barra de relleno; el valor enlazado es el ancho relleno en px."""
+    def __init__(self, bind, pos, w, h, bg, fill, radius=3):
+        super().__init__(bind)
+        self.pos, self.w, self.h = pos, w, h
+        self.bg, self.fill, self.radius = bg, fill, radius
+
+    def render(self, fill_w):
+        surf = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
+        pygame.draw.rect(surf, self.bg, (0, 0, self.w, self.h))
+        pygame.draw.rect(surf, self.fill, (0, 0, fill_w, self.h), border_radius=self.radius)
+        return surf, self.pos
+
+
+class LabelWidget(Widget):
+    """Texto; 'anchor' = "topright" | "midtop" | "topleft" respecto de 'pos'."""
+    def __init__(self, bind, pos, color=(200, 220, 255), font="label", anchor="topleft"):
+        super().__init__(bind)
+        self.pos, self.color, self.font, self.anchor = pos, color, font, anchor
+
+    def render(self, text):
+        surf = render_text(str(text), self.color, self.font)
+        rect = surf.get_rect(**{self.anchor: self.pos})
+        return surf, rect.topleft
+
+
+class BossBarWidget(Widget):
+    """Barra superior de jefe; el valor enlazado es (hp, max_hp) o None si no hay jefe."""
+    def __init__(self, bind, title, y=60):
+        super().__init__(bind)
+        self.title, self.y = title, y
+        self.total_w = int(0.62 * VIRTUAL_W)
+        self.total_h = 16
+
+    def render(self, value):
+        hp, max_hp = value
+        return render_boss_bar(self.title, hp, max_hp, self.total_w, self.total_h), \
+            ((VIRTUAL_W - self.total_w) // 2, self.y - 22)
+
+
+def render_boss_bar(title, hp, max_hp, total_w, total_h) -> pygame.Surface:
+    label = render_text(f"{title}  {hp}/{max_hp}", (230, 220, 220), "label")
+    surf = pygame.Surface((total_w, total_h + 22), pygame.SRCALPHA)
+    bar = pygame.Rect(0, 22, total_w, total_h)
+    pygame.draw.rect(surf, (35, 20, 20), bar)
+    pygame.draw.rect(surf, (120, 40, 40), bar, 2)
+    pct = max(0, hp) / max(1, max_hp)
+    pygame.draw.rect(surf, (255, 80, 80), (0, 22, int(total_w * pct), total_h))
+    surf.blit(label, (total_w // 2 - label.get_width() // 2, 0))
+    return surf
+
+
+def _res_label(scale):
+    return None if scale >= 1.0 else f"Res {round(scale * 100)}%"
+
+
+def _boss_value(entity):
+    if not entity or not getattr(entity, "alive", False):
+        return None
+    return (entity.hp, getattr(entity, "max_hp", 1))
+
 
 class HUD:
     def __init__(self, player, level):
         self.player = player
         self.level = level
-        self.font = pygame.font.SysFont("consolas", 18)
-        self.big_font = pygame.font.SysFont("consolas", 22)
         self.margin = 16
         self.heart_size = 18
         self.energy_w = 160
         self.energy_h = 12
 
+        m = self.margin
+        pool = lambda: self.player.energy_pool
+        self.widgets = [
+            # 1) Vida
+            HeartsWidget(lambda: (self.player.hp, self.player.max_hp), (m, m), size=self.heart_size),
+            # 2) Energía (sólo cambia cuando cambia el ancho en px)
+            BarWidget(lambda: int(self.energy_w * pool().energy / pool().max_energy),
+                      (m, m + self.heart_size + 10), self.energy_w, self.energy_h,
+                      bg=(40, 60, 80), fill=(80, 200, 255)),
+            # 3) Enemigos vivos
+            LabelWidget(lambda: f"Enemigos: {len(self.level.enemies)}",
+                        (VIRTUAL_W - 20, m), anchor="topright"),
+            # 3b) Resolución interna (sólo si la bajó el control de calidad)
+            LabelWidget(lambda: _res_label(getattr(self.level, "render_scale", 1.0)),
+                        (VIRTUAL_W - 20, m + 24), color=(255, 200, 120), anchor="topright"),
+            # 4) Nombre del nivel
+            LabelWidget(lambda: getattr(self.level, "level_name", None),
+                        (VIRTUAL_W // 2, 10), font="title", anchor="midtop"),
+            # 5) Barras de jefes
+            BossBarWidget(lambda: _boss_value(self.level.miniboss), "MINI JEFE"),
+            BossBarWidget(lambda: _boss_value(self.level.boss), "JEFE"),
+        ]
+
     def draw(self, screen):
-        x, y = self.margin, self.margin
-
-        # 1) Vida
-        for i in range(self.player.max_hp):
-            color = (255, 80, 80) if i < self.player.hp else (60, 30, 30)
-            pygame.draw.rect(screen, color, (x + i * (self.heart_size + 4), y, self.heart_size, self.heart_size))
-
-        # 2) Energía
-        pool = self.player.energy_pool
-        pct = pool.energy / pool.max_energy
-        bar_x = self.margin
-        bar_y = y + self.heart_size + 10
-        pygame.draw.rect(screen, (40, 60, 80), (bar_x, bar_y, self.energy_w, self.energy_h))
-        pygame.draw.rect(screen, (80, 200, 255), (bar_x, bar_y, int(self.energy_w * pct), self.energy_h), border_radius=3)
-
-        # 3) Enemigos vivos
-        text = f"Enemigos: {len(self.level.enemies)}"
-        surf = self.font.render(text, True, (200, 220, 255))
-        screen.blit(surf, (VIRTUAL_W - surf.get_width() - 20, self.margin))
-
-        # 4) Nombre del nivel
-        if hasattr(self.level, "level_name"):
-            surf2 = self.big_font.render(self.level.level_name, True, (200, 220, 255))
-            screen.blit(surf2, (VIRTUAL_W/2 - surf2.get_width()/2, 10))
+        for w in self.widgets:
+            w.refresh()
+        # un solo pase de blits con las superficies cacheadas
+        screen.blits([(w.surface, w.dest) for w in self.widgets if w.surface is not None], False)
 
     def draw_boss_bar(self, screen, entity, title="BOSS"):
-        if not entity or not getattr(entity, "alive", False):
+        """Modo inmediato (para jefes fuera de level.boss/miniboss)."""
+        value = _boss_value(entity)
+        if value is None:
             return
         total_w = int(0.62 * VIRTUAL_W)
-        total_h = 16
-        x = (VIRTUAL_W - total_w) // 2
-        y = 60
-        pygame.draw.rect(screen, (35, 20, 20), (x, y, total_w, total_h))
-        pygame.draw.rect(screen, (120, 40, 40), (x, y, total_w, total_h), 2)
-        pct = max(0, entity.hp) / max(1, getattr(entity, "max_hp", 1))
-        fill_w = int(total_w * pct)
-        pygame.draw.rect(screen, (255, 80, 80), (x, y, fill_w, total_h))
-        label = f"{title}  {entity.hp}/{entity.max_hp}"
-        surf = self.font.render(label, True, (230, 220, 220))
-        screen.blit(surf, (VIRTUAL_W/2 - surf.get_width()/2, y - 22))
+        surf = render_boss_bar(title, value[0], value[1], total_w, 16)
+        screen.blit(surf, ((VIRTUAL_W - total_w) // 2, 60 - 22))
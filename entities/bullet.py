@@ -1,39 +1,56 @@
 # entities/bullet.py
 import pygame
-from engine.entity import Entity
-from engine.combat import DamageEvent, Team
+from engine.entity import Entity, intern_tags
+from engine.render import Layer
+from engine.combat import DamageEvent, Team, apply_damage
+from engine.physics import step_pixels, sweep_aabb
 
 class Bullet(Entity):
+    __slots__ = ("damage", "lifespan", "expire_id")
+
     def __init__(self, x, y, direction=1, speed=500, damage=1,
                  lifespan=1.5, color=(255, 255, 255), tags=None):
         # Guardamos color aquí mismo
         super().__init__(x, y, 8, 4, color)
         self.team = Team.PLAYER
+        self.layer = Layer.BULLETS
         self.vel.x = direction * speed
         self.damage = damage
-        self.timer = 0.0
-        self.lifespan = lifespan
-        self.color = color       
-        self.tags = set(tags or [])
+        self.lifespan = lifespan   # segundos; el nivel agenda su muerte al registrarla
+        self.expire_id = 0
+        self.tags = intern_tags(tags)
 
     def update(self, dt, world):
-        self.timer += dt
-        if self.timer >= self.lifespan:
-            self.alive = False
-            return
+        dx, dy = step_pixels(self, dt)
 
-        self.rect.x += int(self.vel.x * dt)
-
-        # Colisión con enemigos
-        for en in getattr(world, "enemies", []):
-            if not en.alive:
-                continue
-            if self.rect.colliderect(en.rect):
-                event = DamageEvent(amount=self.damage, tags=self.tags, source=self)
-                en.take_damage(event)
-                self.alive = False
-                break
+        # Primer impacto a lo largo del recorrido (no sólo en el destino): tiles y enemigos
+        path = self.rect.union(self.rect.move(dx, dy))
+        wall_t = None
+        query = getattr(world, "solids_near", None)
+        for tile in (query(path) if query is not None else getattr(world, "tiles", ())):
+            t = sweep_aabb(self.rect, dx, dy, tile)
+            if t is not None and (wall_t is None or t < wall_t):
+                wall_t = t
+        first, first_t = None, None
+        for en in world.query_rect(path, team=Team.ENEMY):
+            t = sweep_aabb(self.rect, dx, dy, en.rect)
+            if t is not None and (first_t is None or t < first_t):
+                first, first_t = en, t
+        if first is not None and wall_t is not None and wall_t < first_t:
+            first = None   # la pared está antes: el enemigo queda cubierto
+        if first is None and wall_t is None:
+            self.rect.move_ip(dx, dy)
+            return
+        hit_t = first_t if first is not None else wall_t
+        self.rect.move_ip(int(dx * hit_t), int(dy * hit_t))
+        if first is not None:
+            event = DamageEvent(amount=self.damage, tags=self.tags, source=self)
+            apply_damage(first, event, world)
+        self.alive = False
+        sched = getattr(world, "scheduler", None)
+        if sched is not None:
+            sched.cancel(self.expire_id)
 
-    def draw(self, screen):
+    def draw(self, screen, offset=(0, 0)):
         # Usa self.color para cada bala
-        pygame.draw.rect(screen, self.color, self.rect)
+        pygame.draw.rect(screen, self.color, self.rect.move(-offset[0], -offset[1]))
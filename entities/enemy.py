@@ -1,13 +1,21 @@
 # entities/enemy.py
 import pygame
-from engine.entity import Entity
-from engine.physics import move_and_collide, apply_gravity
+from engine.entity import Entity, intern_tags
+from engine.render import Layer
+from engine.physics import move_and_collide, apply_gravity, nearby_solids
 from engine.combat import Team, DamageEvent
+from engine.status import IMMOBILE, FROZEN
 
 class EnemyBase(Entity):
+    __slots__ = ("max_hp", "hp", "damage", "speed", "patrol_range", "start_x", "dead",
+                 "is_boss", "is_miniboss", "show_hp_until", "show_hp_duration", "hpbar_fade")
+
+    COLOR_FROZEN = (150, 220, 255)   # feedback de congelado
+
     def __init__(self, x, y, w=26, h=30, color=(255, 120, 120)):
         super().__init__(x, y, w, h, color)
         self.team = Team.ENEMY
+        self.layer = Layer.ENEMIES
         self.use_gravity = True
         self.on_ground = False
         self.max_hp = 3
@@ -17,32 +25,34 @@ class EnemyBase(Entity):
         self.facing = -1
         self.patrol_range = (x - 60, x + 60)
         self.start_x = x
-        self.tags = {"enemy"}
+        self.tags = intern_tags(("enemy",))
         self.dead = False
         self.is_boss = False
         self.is_miniboss = False
 
         # Mostrar barra de vida temporalmente al recibir daño
-        self.show_hp_timer = 0.0
+        self.show_hp_until = 0.0      # ms de juego
         self.show_hp_duration = 2.5
         self.hpbar_fade = True
 
     def patrol_ai(self, dt, tiles):
         if self.dead:
             return
-        self.vel.x = self.facing * self.speed
+        # congelado/aturdido: no camina (la gravedad sigue)
+        self.vel.x = 0 if self.status & IMMOBILE else self.facing * self.speed * self.speed_mult
         move_and_collide(self, tiles, dt)
         if self.rect.left <= self.patrol_range[0]:
             self.facing = 1
         elif self.rect.right >= self.patrol_range[1]:
             self.facing = -1
 
-    def take_damage(self, dmg_event: DamageEvent):
+    def take_damage(self, dmg_event: DamageEvent, world=None):
         if self.dead:
             return
         dmg = getattr(dmg_event, "amount", 1)
         self.hp -= dmg
-        self.show_hp_timer = self.show_hp_duration
+        now = world.now_ms() if hasattr(world, "now_ms") else pygame.time.get_ticks()
+        self.show_hp_until = now + self.show_hp_duration * 1000.0
         if self.hp <= 0:
             self.dead = True
             self.alive = False
@@ -50,13 +60,8 @@ class EnemyBase(Entity):
     def update(self, dt, world):
         if not self.alive:
             return
-        tiles = getattr(world, "tiles", [])
         apply_gravity(self, dt)
-        self.patrol_ai(dt, tiles)
-        if self.show_hp_timer > 0:
-            self.show_hp_timer -= dt
-            if self.show_hp_timer < 0:
-                self.show_hp_timer = 0
+        self.patrol_ai(dt, nearby_solids(self, world, dt))
 
     def _health_fill_color(self, pct: float):
         if pct > 0.6:
@@ -66,16 +71,20 @@ class EnemyBase(Entity):
         else:
             return (255, 120, 120)
 
-    def _draw_health_bar(self, screen):
-        bar_w = self.rect.w
-        bar_h = 4
-        x = self.rect.x
-        y = self.rect.y - (bar_h + 4)
+    def _draw_health_bar(self, screen, offset=(0, 0), scale=1.0, now_ms=None):
+        bar_w = max(1, int(self.rect.w * scale))
+        bar_h = max(1, int(4 * scale))
+        x = int((self.rect.x - offset[0]) * scale)
+        y = int((self.rect.y - offset[1]) * scale) - (bar_h + int(4 * scale))
 
         pct = max(0.0, self.hp) / max(1, self.max_hp)
 
         # Alpha (fade): 255 → 0
-        a = int(255 * min(1.0, self.show_hp_timer / self.show_hp_duration)) if self.hpbar_fade else 255
+        if self.hpbar_fade and now_ms is not None:
+            left = (self.show_hp_until - now_ms) / 1000.0
+            a = int(255 * max(0.0, min(1.0, left / self.show_hp_duration)))
+        else:
+            a = 255
 
         bar = pygame.Surface((bar_w, bar_h), pygame.SRCALPHA)
         bar.fill((40, 40, 40, int(a * 0.75)))
@@ -89,9 +98,27 @@ class EnemyBase(Entity):
         screen.blit(bar, (x, y))
         pygame.draw.rect(screen, (12, 12, 12), (x, y, bar_w, bar_h), 1)
 
-    def draw(self, screen):
+    def _shows_health_bar(self, now_ms=None) -> bool:
+        if self.is_boss or self.is_miniboss or self.hp >= self.max_hp:
+            return False
+        return now_ms is None or now_ms < self.show_hp_until
+
+    def submit(self, queue):
+        if not self.alive:
+            return
+        now = queue.now_ms
+        surf = self.clip.frame_at(now - self.anim_start_ms) if self.clip else None
+        if surf is not None:
+            queue.sprite(surf, self.rect.topleft, self.layer, flip_x=self.facing < 0,
+                         tint=self.COLOR_FROZEN if self.status & FROZEN else None)
+        else:
+            queue.fill(self.rect, self.COLOR_FROZEN if self.status & FROZEN else self.color, self.layer)
+        if self._shows_health_bar(now):
+            queue.call(lambda screen, off, k: self._draw_health_bar(screen, off, k, now), self.layer)
+
+    def draw(self, screen, offset=(0, 0)):
         if not self.alive:
             return
-        pygame.draw.rect(screen, self.color, self.rect)
-        if (not self.is_boss and not self.is_miniboss and self.hp < self.max_hp and self.show_hp_timer > 0):
-            self._draw_health_bar(screen)
+        pygame.draw.rect(screen, self.color, self.rect.move(-offset[0], -offset[1]))
+        if self._shows_health_bar():
+            self._draw_health_bar(screen, offset)
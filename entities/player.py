@@ -1,152 +1,188 @@
 # entities/player.py
+from functools import lru_cache
 import pygame
 from engine.entity import Entity
-from engine.physics import apply_gravity, move_and_collide
+from engine.physics import apply_gravity, move_and_collide, nearby_solids
 from engine.combat import Team
-from engine.powers import EnergyPool, SimpleShotPower
-from core.config import MOVE_SPEED, JUMP_SPEED, DASH_SPEED, DASH_DURATION, DASH_COOLDOWN, PLAYER_W, PLAYER_H, DRAW_HITBOX
+from engine.powers import EnergyPool, CasterPowers, default_book
+from core.config import (MOVE_SPEED, JUMP_SPEED, DASH_SPEED, DASH_DURATION, DASH_COOLDOWN, PLAYER_W, PLAYER_H,
+                         DRAW_HITBOX, JUMP_BUFFER_MS, ATTACK_BUFFER_MS)
+from core.input import ActionState
 from core import resources
-from engine.anim import Animation
+from engine.anim import AnimClip
+from engine.particles import EmitterSpec
+from engine.render import Layer
+
+STEP_DUST = EmitterSpec(color=(170, 160, 150), count=5, speed=(20, 70), spread=0.5, direction=-2.8,
+                        life=(0.15, 0.3), size=2, gravity=300)
+
+
+@lru_cache(maxsize=None)
+def player_clips() -> dict:
+    """Clips compartidos por todos los jugadores (las superficies salen de la caché de resources)."""
+    return {
+        "idle": AnimClip((resources.load_player_idle(),), fps=1),                       # 1 frame
+        "run":  AnimClip(resources.load_player_run(), fps=10, events=((1, "step"), (3, "step"))),
+    }
 
 
 class Player(Entity):
+    __slots__ = ("max_hp", "hp", "is_dashing", "dash_timer", "dash_end_ms", "dash_ready_ms", "shoot_cd_ms",
+                 "last_shot_ms", "hurt_until_ms", "energy_pool", "powers", "input",
+                 "_anim_seen_ms")
+
     # Colores de feedback (evita literales repetidos)
     COLOR_NORMAL = (230, 245, 255)
     COLOR_DASH   = (255, 200, 220)
     COLOR_HURT   = (255, 160, 160)
 
+    ATTACK_POWER = "golpe"   # J
+
     def __init__(self, x, y):
         super().__init__(x, y, PLAYER_W, PLAYER_H, color=self.COLOR_NORMAL)
         self.team = Team.PLAYER
+        self.layer = Layer.PLAYER
         self.use_gravity = True
         self.on_ground = False
         self.facing = 1
+        self.input = ActionState()   # el nivel le pasa la máscara de cada tick
 
         # Vida / energía
         self.max_hp = 6
         self.hp = self.max_hp
 
-        # Dash
+        # Dash (plazos en ms de juego; el fin lo dispara el scheduler del nivel si lo hay)
         self.is_dashing = False
-        self.dash_time = 0.0
-        self.dash_cd_left = 0.0
+        self.dash_timer = 0
+        self.dash_end_ms = 0.0     # plazo que vence update() en mundos sin scheduler
+        self.dash_ready_ms = 0.0
 
         # Disparo básico (placeholder)
         self.shoot_cd_ms = 220
         self.last_shot_ms = -9999
 
-        # Estado de daño (invulnerabilidad corta)
-        self.hurt_timer = 0.0
+        # Estado de daño (invulnerabilidad corta hasta este plazo)
+        self.hurt_until_ms = 0.0
 
         # Energía y poderes
         self.energy_pool = EnergyPool(max_energy=100, regen_rate=12)
 
-        # Inventario por nombre (para voz)
-        self.power_registry = {}   # name -> Power
-        self.unlocked = set()      # nombres habilitados
-        self._register_default_powers()
+        # Poderes: definiciones compartidas + estado propio (cooldowns/desbloqueos por id)
+        self.powers = CasterPowers(default_book(), unlocked=("golpe", "rayo", "latigo"))
 
         #Sprite
-        idle_img = resources.load_player_idle()
-        run_frames = resources.load_player_run()
-
-        self.anim_idle = Animation([idle_img], fps=1, loop=True)   # 1 frame
-        self.anim_run  = Animation(run_frames, fps=10, loop=True)  # 4 frames @ 10 fps
-        self._current_anim = self.anim_idle
+        self.clip = player_clips()["idle"]
+        self._anim_seen_ms = -1.0   # último instante (del clip) cuyos eventos ya se emitieron
 
     # ----------------- Helpers internos -----------------
-    def _update_timers(self, dt: float):
-        # clamp a 0 sin ramificaciones
-        self.hurt_timer   = max(0.0, self.hurt_timer - dt)
-        self.dash_cd_left = max(0.0, self.dash_cd_left - dt)
-        # energía
-        self.energy_pool.regen(dt)
-
-    def _handle_move_jump(self, intents, dt: float):
-        """WASD/espacio → movimiento y salto (sin cambiar comportamiento actual)."""
+    def _handle_move_jump(self, inp, now_ms: float):
+        """WASD/espacio → movimiento y salto (el salto pide una pulsación nueva, con buffer)."""
         if self.is_dashing:
             return  # Durante dash se ignora input de movimiento
 
         vx = 0
-        if intents.get("move_left"):
+        if inp.down("move_left"):
             vx = -MOVE_SPEED
             self.facing = -1
-        if intents.get("move_right"):
+        if inp.down("move_right"):
             vx = MOVE_SPEED
             self.facing = 1
 
         self.vel.x = vx
 
-        # salto
-        if intents.get("jump") and self.on_ground:
+        # salto: pulsado hace poco (aunque fuera en el aire) y ahora en el suelo
+        if self.on_ground and inp.buffered("jump", now_ms, JUMP_BUFFER_MS):
+            inp.consume("jump")
             self.vel.y = -JUMP_SPEED
             self.on_ground = False
 
-    def _try_dash(self, intents):
-        """Inicia dash si está disponible; cooldown se aplica al terminar (como antes)."""
-        if self.is_dashing or self.dash_cd_left > 0.0:
+    def _try_dash(self, inp, world, now_ms: float):
+        """Inicia dash en el flanco de pulsación; cooldown se aplica al terminar (como antes)."""
+        if self.is_dashing or now_ms < self.dash_ready_ms:
             return
-        if intents.get("dash"):
+        if inp.just_pressed("dash"):
+            inp.consume("dash")
             self.is_dashing = True
-            self.dash_time = DASH_DURATION
+            end_ms = now_ms + DASH_DURATION * 1000.0
+            self.dash_end_ms = end_ms
+            sched = getattr(world, "scheduler", None)
+            self.dash_timer = sched.at(end_ms, self._end_dash, end_ms) if sched is not None else 0
             # reset vertical para sensación más responsiva
             self.vel.y = 0
             self.vel.x = (self.facing if self.facing != 0 else 1) * DASH_SPEED
 
+    def _end_dash(self, end_ms: float):
+        self.is_dashing = False
+        self.dash_timer = 0
+        self.dash_ready_ms = end_ms + DASH_COOLDOWN * 1000.0
+        # freno lateral al terminar dash para no “patinar”
+        self.vel.x = 0
+
+    def is_hurt(self, now_ms: float) -> bool:
+        return now_ms < self.hurt_until_ms
+
     # ----------------- Daño / estados -----------------
-    def take_damage(self, amount=1):
+    def take_damage(self, amount=1, world=None):
+        # acepta un número o un DamageEvent (engine.combat.apply_damage)
+        amount = getattr(amount, "amount", amount)
+        now = world.now_ms() if hasattr(world, "now_ms") else pygame.time.get_ticks()
         # invulnerabilidad simple por 0.4s tras recibir golpe (igual que antes)
-        if self.hurt_timer > 0:
+        if self.is_hurt(now):
             return
         self.hp -= amount
-        self.hurt_timer = 0.4
+        self.hurt_until_ms = now + 400.0
         if self.hp <= 0:
             self.alive = False
 
     # ----------------- Ciclo principal -----------------
     def update(self, dt, world):
-        tiles = getattr(world, "tiles", [])
-
-        # timers + energía
-        self._update_timers(dt)
-
-        # input → movimiento / dash
-        intents = getattr(self, "intents", {})  # robusto por si no fue seteado
-        self._handle_move_jump(intents, dt)
-        self._try_dash(intents)
+        self.energy_pool.regen(dt)
 
-        # actualizar dash
-        if self.is_dashing:
-            self.dash_time -= dt
-            if self.dash_time <= 0:
-                self.is_dashing = False
-                self.dash_cd_left = DASH_COOLDOWN
-                # freno lateral al terminar dash para no “patinar”
-                self.vel.x = 0
+        # input → movimiento / dash / ataque
+        inp = self.input
+        now = world.now_ms() if hasattr(world, "now_ms") else pygame.time.get_ticks()
+        if self.is_dashing and not self.dash_timer and now >= self.dash_end_ms:
+            self._end_dash(self.dash_end_ms)   # sin scheduler: vence por plazo
+        self._handle_move_jump(inp, now)
+        self._try_dash(inp, world, now)
+        if inp.buffered("attack", now, ATTACK_BUFFER_MS) and self.try_power_by_name(self.ATTACK_POWER, world):
+            inp.consume("attack")
 
         # física
         apply_gravity(self, dt)
-        move_and_collide(self, tiles, dt)
+        move_and_collide(self, nearby_solids(self, world, dt), dt)
+
+        self._select_anim(now)
+        self._anim_events(world, now)
 
-        self._select_anim()
-        self._current_anim.update(dt)
 
+    def submit(self, queue):
+        # sprite del clip (flip cacheado por la cola) o relleno si no hay
+        super().submit(queue)
+        if DRAW_HITBOX:
+            queue.call(self._draw_hitbox, Layer.EFFECTS)
 
-    def draw(self, screen):
-        # 1) imagen
-        surf = self._current_anim.get()
+    def _draw_hitbox(self, screen, off, scale=1.0):
+        r = self.rect.move(-off[0], -off[1])
+        pygame.draw.rect(screen, (0, 255, 0), (int(r.x * scale), int(r.y * scale),
+                                               int(r.w * scale), int(r.h * scale)), 1)
+
+    def draw(self, screen, offset=(0, 0)):
+        r = self.rect.move(-offset[0], -offset[1])
+        # 1) imagen (sin reloj: primer cuadro del clip)
+        surf = self.clip.frame_at(0) if self.clip else None
         if surf:
             # flip horizontal según facing
             draw_img = pygame.transform.flip(surf, self.facing < 0, False)
             # alinear por topleft del rect de colisión
-            screen.blit(draw_img, self.rect.topleft)
+            screen.blit(draw_img, r.topleft)
         else:
             # fallback si no hay sprite
-            pygame.draw.rect(screen, self.color, self.rect)
+            pygame.draw.rect(screen, self.color, r)
 
         # 2) (opcional) mostrar hitbox
         if DRAW_HITBOX:
-            pygame.draw.rect(screen, (0,255,0), self.rect, 1)
+            pygame.draw.rect(screen, (0,255,0), r, 1)
 
 
     # ===== Disparo básico (cooldown y punto de salida) =====
@@ -164,55 +200,45 @@ class Player(Entity):
             return (self.rect.left, self.rect.centery)
 
     # ----------------- Poderes por voz -----------------
-    def _register_default_powers(self):
-        reg = self.power_registry
-        from engine.powers import MeleePower
-        reg["golpe"] = MeleePower("golpe", energy_cost=0, cooldown_ms=280, damage=100,out_tags={"melee"})
-        reg["rayo"]       = SimpleShotPower("rayo",       color=(255, 220, 80),energy_cost=8,cooldown_ms=150,out_tags={"electric"})
-        reg["pulso"]      = SimpleShotPower("pulso",      color=(120,220,255), energy_cost=16, cooldown_ms=1200, out_tags={"emp"})
-        reg["ralentizar"] = SimpleShotPower("ralentizar", color=(180,220,255), energy_cost=18, cooldown_ms=1400, out_tags={"time"})
-        reg["congelar"]   = SimpleShotPower("congelar",   color=(160,240,255), energy_cost=20, cooldown_ms=1600, out_tags={"freeze"})
-        reg["remache"]    = SimpleShotPower("remache",    color=(200,200,200), energy_cost=10, cooldown_ms=700,  out_tags={"metal"})
-        reg["robot"]      = SimpleShotPower("robot",      color=(255,200,120), energy_cost=24, cooldown_ms=2200, out_tags={"summon"})
-        reg["control"]    = SimpleShotPower("control",    color=(255,160,240), energy_cost=22, cooldown_ms=2500, out_tags={"mind"})
-        reg["posesion"]   = SimpleShotPower("posesion",   color=(255,120,220), energy_cost=26, cooldown_ms=3000, out_tags={"possess"})
-        reg["curar"]      = SimpleShotPower("curar",      color=(120,255,120), energy_cost=14, cooldown_ms=1800, out_tags={"heal"})
-        reg["quimica"]    = SimpleShotPower("quimica",    color=(120,255,180), energy_cost=16, cooldown_ms=1600, out_tags={"chem"})
-        reg["fuerza"]     = SimpleShotPower("fuerza",     color=(240,200,120), energy_cost=12, cooldown_ms=900,  out_tags={"force"})
-        reg["sismo"]      = SimpleShotPower("sismo",      color=(255,140,80),  energy_cost=18, cooldown_ms=1800, out_tags={"quake"})
-        reg["latigo"]     = SimpleShotPower("latigo",     color=(120,180,255), energy_cost=12, cooldown_ms=200,  out_tags={"water"})
-        reg["burbuja"]    = SimpleShotPower("burbuja",    color=(100,200,255), energy_cost=20, cooldown_ms=2200, out_tags={"shield"})
-        reg["pincel"]     = SimpleShotPower("pincel",     color=(255,200,255), energy_cost=10, cooldown_ms=800,  out_tags={"paint"})
-        reg["revelar"]    = SimpleShotPower("revelar",    color=(255,255,160), energy_cost=16, cooldown_ms=1500, out_tags={"reveal"})
-        self.unlock_power("golpe")
-        self.unlock_power("rayo")
-        self.unlock_power("latigo")
+    @property
+    def power_registry(self):
+        """name -> Power (definición compartida, sólo lectura)."""
+        return self.powers.book.by_name
 
     def unlock_power(self, name: str):
-        name = name.lower()
-        if name in self.power_registry:
-            self.unlocked.add(name)
+        self.powers.unlock(name)
 
     def has_power(self, name: str) -> bool:
-        return name.lower() in self.unlocked
+        return self.powers.has(self.powers.book.id_of(name))
 
     def try_power_by_name(self, name: str, world) -> bool:
-        name = name.lower()
-        if name not in self.unlocked:
-            return False
-        p = self.power_registry.get(name)
-        if not p:
-            return False
-        now = pygame.time.get_ticks()
-        if not p.can_use(self, world, now):
+        return self.try_power(self.powers.book.id_of(name), world)
+
+    def try_power(self, pid: int, world) -> bool:
+        if pid < 0:
             return False
-        return p.use(self, world, now)
-    
-    def _select_anim(self):
+        now = world.now_ms() if hasattr(world, "now_ms") else pygame.time.get_ticks()
+        return self.powers.try_use(pid, self, world, now)
+
+    def _select_anim(self, now_ms: float):
         # prioridades simples: dash > moverse > idle
+        clips = player_clips()
         if self.is_dashing:
             # mientras no tengamos anim de dash, usa run (rápida) como placeholder
-            self._current_anim = self.anim_run
+            clip = clips["run"]
         else:
             moving = abs(self.vel.x) > 1e-3
-            self._current_anim = self.anim_run if moving else self.anim_idle
+            clip = clips["run"] if moving else clips["idle"]
+        if clip is not self.clip:
+            self.play(clip, now_ms)
+            self._anim_seen_ms = -1.0
+
+    def _anim_events(self, world, now_ms: float):
+        """Eventos de cuadro del clip actual (pasos → polvo)."""
+        t = now_ms - self.anim_start_ms
+        for name in self.clip.events_between(self._anim_seen_ms, t):
+            if name == "step" and self.on_ground and not self.is_dashing:
+                particles = getattr(world, "particles", None)
+                if particles is not None:
+                    particles.burst(STEP_DUST, self.rect.centerx, self.rect.bottom - 2, self.facing)
+        self._anim_seen_ms = t
@@ -0,0 +1,248 @@
+# levels/compiler.py
+"""
+Compilador de niveles: JSON (levels/tilemap.py) → binario compacto mapeable en memoria.
+
+  - tiles sólidos fusionados de forma voraz en rectángulos máximos
+  - esos rects + los objetos sólidos forman una sola tabla de colisión
+  - tabla de chunks → índices de rects que tocan cada chunk (para el streaming)
+  - grilla de colisión en bits y tabla de spawns
+
+'load_level' usa el binario en caché si es más nuevo que el JSON y se compiló con el
+mismo CHUNK_TILES; si no, lo recompila.
+Todo el archivo es little-endian y está alineado a 4 bytes.
+"""
+import hashlib, mmap, os, struct
+import pygame
+from core.config import LEVEL_CACHE_DIR, CHUNK_TILES
+from levels.tilemap import TileMap
+
+MAGIC = b"EQLV"
+VERSION = 1
+# magic, version, chunk_tiles, tile_w, tile_h, width, height, bounds(4), extent(4),
+# n_rects, n_chunks, n_refs, n_spawns, n_kinds, name_len
+_HEADER = struct.Struct("<4sHHHHII4i4iIIIIHH")
+_CHUNK = struct.Struct("<iiII")    # cx, cy, primer ref, cantidad
+_SPAWN = struct.Struct("<B3xii")   # kind, x, y
+
+
+def merge_solids(solid: bytearray, width: int, height: int) -> list:
+    """Fusión voraz: rects máximos (en tiles) que cubren todas las celdas sólidas."""
+    used = bytearray(len(solid))
+    out = []
+    for ty in range(height):
+        row = ty * width
+        tx = 0
+        while tx < width:
+            i = row + tx
+            if not solid[i] or used[i]:
+                tx += 1
+                continue
+            # ancho máximo en esta fila
+            w = 1
+            while tx + w < width and solid[i + w] and not used[i + w]:
+                w += 1
+            # crecer hacia abajo mientras la fila completa siga libre y sólida
+            h = 1
+            while ty + h < height:
+                j = (ty + h) * width + tx
+                if all(solid[j + k] and not used[j + k] for k in range(w)):
+                    h += 1
+                else:
+                    break
+            for dy in range(h):
+                j = (ty + dy) * width + tx
+                used[j:j + w] = b"\x01" * w
+            out.append((tx, ty, w, h))
+            tx += w
+    return out
+
+
+def _pad4(b: bytes) -> bytes:
+    return b + b"\x00" * (-len(b) % 4)
+
+
+def compile_map(tm: TileMap) -> bytes:
+    tw, th = tm.tile_w, tm.tile_h
+    rects = [(x * tw, y * th, w * tw, h * th) for x, y, w, h in merge_solids(tm.solid, tm.width, tm.height)]
+    rects += list(tm.objects)
+
+    chunks = {}
+    for i, r in enumerate(rects):
+        for key in tm.chunks_in(pygame.Rect(r)):
+            chunks.setdefault(key, []).append(i)
+    keys = sorted(chunks, key=lambda k: (k[1], k[0]))
+
+    kinds = sorted({k for k, _, _ in tm.spawns})
+    kind_id = {k: i for i, k in enumerate(kinds)}
+    name = tm.name.encode("utf-8")
+
+    parts = [_HEADER.pack(MAGIC, VERSION, tm.chunk_tiles, tw, th, tm.width, tm.height,
+                          *tm.bounds, *tm.extent,
+                          len(rects), len(keys), sum(len(v) for v in chunks.values()),
+                          len(tm.spawns), len(kinds), len(name)),
+             _pad4(name)]
+    parts.append(struct.pack(f"<{4 * len(rects)}i", *[v for r in rects for v in r]))
+    refs, start = [], 0
+    for key in keys:
+        ids = chunks[key]
+        parts.append(_CHUNK.pack(key[0], key[1], start, len(ids)))
+        refs.extend(ids)
+        start += len(ids)
+    parts.append(struct.pack(f"<{len(refs)}I", *refs))
+    for kind, x, y in tm.spawns:
+        parts.append(_SPAWN.pack(kind_id[kind], x, y))
+    parts.append(_pad4(b"".join(bytes([len(k.encode())]) + k.encode() for k in kinds)))
+    # grilla de colisión: 1 bit por tile, fila por fila
+    bits = bytearray((len(tm.solid) + 7) // 8)
+    for i, v in enumerate(tm.solid):
+        if v:
+            bits[i >> 3] |= 1 << (i & 7)
+    parts.append(bytes(bits))
+    return b"".join(parts)
+
+
+class _RectTable:
+    """Vista de solo lectura sobre los rects del archivo: t[i] -> (x, y, w, h)."""
+    __slots__ = ("_ints", "_n")
+
+    def __init__(self, ints, n):
+        self._ints = ints
+        self._n = n
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        k = 4 * i
+        return tuple(self._ints[k:k + 4])
+
+
+class CompiledLevel:
+    """
+    Nivel compilado y mapeado en memoria. Misma interfaz que TileMap para el streaming:
+    en el binario no hay tiles sueltos, todo es rect compartido ('objects').
+    """
+    def __init__(self, path: str, chunk_tiles: int = None):
+        """
+        chunk_tiles: si se indica y el binario usa otro tamaño de chunk, ValueError.
+        Archivo vacío, truncado o de otro formato: también ValueError (y nada queda abierto).
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = None
+        error = None
+        try:
+            if os.fstat(self._file.fileno()).st_size < _HEADER.size:
+                raise struct.error("sin cabecera completa")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._parse(memoryview(self._mm), chunk_tiles)
+        except ValueError as exc:
+            error = str(exc)
+        except (struct.error, IndexError, TypeError) as exc:   # TypeError: cast de un tramo cortado
+            error = f"[compiler] archivo truncado: {path} ({exc})"
+        if error is not None:
+            # fuera del except: el traceback ya no retiene vistas sobre el mmap
+            self.close()
+            raise ValueError(error)
+
+    def _parse(self, mv, chunk_tiles):
+        path = self.path
+        h = _HEADER.unpack_from(mv, 0)
+        if h[0] != MAGIC or h[1] != VERSION:
+            raise ValueError(f"[compiler] formato inválido: {path}")
+        if chunk_tiles is not None and h[2] != chunk_tiles:
+            raise ValueError(f"[compiler] {path}: chunks de {h[2]} tiles, se esperaban {chunk_tiles}")
+        (_, _, self.chunk_tiles, self.tile_w, self.tile_h, self.width, self.height,
+         bx, by, bw, bh, ex, ey, ew, eh, n_rects, n_chunks, n_refs, n_spawns, n_kinds, name_len) = h
+        self.bounds = pygame.Rect(bx, by, bw, bh)
+        self.extent = pygame.Rect(ex, ey, ew, eh)
+        self.chunk_w = self.chunk_tiles * self.tile_w
+        self.chunk_h = self.chunk_tiles * self.tile_h
+
+        off = _HEADER.size
+        self.name = bytes(mv[off:off + name_len]).decode("utf-8")
+        off += name_len + (-name_len % 4)
+        self.objects = _RectTable(mv[off:off + 16 * n_rects].cast("i"), n_rects)
+        off += 16 * n_rects
+        self._chunks = {}
+        for i in range(n_chunks):
+            cx, cy, start, count = _CHUNK.unpack_from(mv, off + i * _CHUNK.size)
+            self._chunks[(cx, cy)] = (start, count)
+        off += n_chunks * _CHUNK.size
+        self._refs = mv[off:off + 4 * n_refs].cast("I")
+        off += 4 * n_refs
+        raw_spawns = [_SPAWN.unpack_from(mv, off + i * _SPAWN.size) for i in range(n_spawns)]
+        off += n_spawns * _SPAWN.size
+        kinds, p = [], off
+        for _ in range(n_kinds):
+            n = mv[p]
+            kinds.append(bytes(mv[p + 1:p + 1 + n]).decode("utf-8"))
+            p += 1 + n
+        off = p + (-(p - off) % 4)
+        self.spawns = [(kinds[k], x, y) for k, x, y in raw_spawns]
+        self._grid = mv[off:off + (self.width * self.height + 7) // 8]
+        if len(self._grid) < (self.width * self.height + 7) // 8:
+            raise struct.error("grilla de colisión incompleta")
+
+    # ---------- interfaz de streaming (igual que TileMap) ----------
+    chunks_in = TileMap.chunks_in
+
+    def chunk_rects(self, key) -> list:
+        return []
+
+    def chunk_objects(self, key) -> list:
+        span = self._chunks.get(key)
+        if span is None:
+            return []
+        start, count = span
+        return self._refs[start:start + count].tolist()
+
+    def is_solid(self, tx: int, ty: int) -> bool:
+        """Consulta O(1) a la grilla de colisión precomputada (coords en tiles)."""
+        if not (0 <= tx < self.width and 0 <= ty < self.height):
+            return False
+        i = ty * self.width + tx
+        return bool(self._grid[i >> 3] & (1 << (i & 7)))
+
+    def close(self):
+        # soltar las vistas antes de cerrar el mmap
+        for name in ("objects", "_refs", "_grid"):
+            if hasattr(self, name):
+                delattr(self, name)
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+
+def cache_path(src_path: str, cache_dir: str = LEVEL_CACHE_DIR) -> str:
+    # nombre legible + hash de la ruta absoluta: a/nivel.json y b/nivel.json no se pisan
+    base = os.path.splitext(os.path.basename(src_path))[0]
+    digest = hashlib.sha1(os.path.normcase(os.path.abspath(src_path)).encode("utf-8")).hexdigest()[:10]
+    return os.path.join(cache_dir, f"{base}-{digest}.lvlc")
+
+
+def compile_file(src_path: str, out_path: str = None, chunk_tiles: int = CHUNK_TILES) -> str:
+    out_path = out_path or cache_path(src_path)
+    blob = compile_map(TileMap.load(src_path, chunk_tiles=chunk_tiles))
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, out_path)   # atómico: nunca se mapea un archivo a medio escribir
+    return out_path
+
+
+def load_level(src_path: str, cache_dir: str = LEVEL_CACHE_DIR) -> CompiledLevel:
+    """Abre el nivel compilado; recompila si falta, está viejo, es de otra versión o de otro CHUNK_TILES."""
+    out = cache_path(src_path, cache_dir)
+    fresh = os.path.exists(out) and os.path.getmtime(out) >= os.path.getmtime(src_path)
+    if fresh:
+        try:
+            return CompiledLevel(out, chunk_tiles=CHUNK_TILES)
+        except (ValueError, struct.error):
+            pass
+    compile_file(src_path, out, chunk_tiles=CHUNK_TILES)
+    return CompiledLevel(out, chunk_tiles=CHUNK_TILES)
@@ -1,44 +1,182 @@
 # levels/level_base.py
+import struct, zlib
 import pygame
 from core.scene import Scene
-from core.input import read_intents
+from core.input import KeyboardInput, pack_intents
 from entities.player import Player
 from entities.enemy import EnemyBase
 from engine.ui import HUD
+from engine.camera import Camera
+from engine.spatial import SpatialGrid, Broadphase
+from engine.registry import EntityRegistry
+from engine.particles import ParticleSystem
+from engine.scheduler import Scheduler
+from engine.status import StatusEngine
+from engine.render import RenderQueue, Layer
+from core import metrics
 from core.voice_commands import VOICE_TO_POWER
 from collections import deque
-from core.config import COLOR_BG, COLOR_TILE
+from core.config import COLOR_BG, COLOR_TILE, COLOR_HUD, REWIND_SECONDS, REWIND_STEP
+from core.snapshot import RewindBuffer
+from core import resources
+
+TIME_SCALES_SLOW = (1.0, 0.5, 0.25)
+TIME_SCALES_FAST = (1.0, 2.0, 4.0)
 
 
 class LevelBase(Scene):
+    # imágenes propias del nivel (fondos, tilesets...): las subclases las agregan acá
+    level_assets = ()
+
     def __init__(self, game):
         super().__init__(game)
         self.bg_color = COLOR_BG
         self.tiles = []
+        self.tile_index = SpatialGrid()   # culling / consultas locales de tiles
+        # límites del mundo: crecen con add_tile salvo que el nivel los fije
+        self.world_bounds = pygame.Rect(0, 0, 0, 0)
+        self._bounds_locked = False
+        self.entities = EntityRegistry()
+        self.broadphase = Broadphase()    # consultas de combate (balas, golpes, áreas) y culling
+        self._broadphase_spawned = -1     # registry.spawned cuando se armó (-1 = nunca)
+        self.particles = ParticleSystem()  # efectos visuales de poderes
+        self.scheduler = Scheduler()       # plazos y callbacks sobre self.clock
+        self.status = StatusEngine(self.scheduler)   # estados alterados (congelado, veneno, escudo...)
+        self.render_queue = RenderQueue()
+        self.render_scale = 1.0           # resolución interna (la fija el QualityController)
         self.player = Player(80, 420)
-        self.enemies = []
-        self.bullets = []
+        self.entities.persistent.add("player")   # el jugador muerto sigue en team/tag
+        self.entities.add(self.player, "player")
         self.hud = HUD(self.player, self)
-        self.boss = None
-        self.miniboss = None
+        self.boss_handle = None       # handles: no retienen entidades ya borradas
+        self.miniboss_handle = None
+        self.show_metrics = False
         self.mic_msg = ""
-        self.mic_msg_timer = 0.0
+        self.mic_msg_until = 0.0      # ms de juego
         self.voice_cast_queue = deque()
+        # Fuentes de entrada inyectables (replay / simulación sin teclado ni micrófono):
+        # input_source() devuelve la máscara de intents del tick (o un dict de intents)
+        self.keyboard = KeyboardInput()
+        self.input_source = self.keyboard.poll
+        self.voice_source = self._live_voice_commands
+        self.recorder = None
+        # historia para rebobinar (Backspace); None = desactivado
+        self.rewind = RewindBuffer(REWIND_SECONDS) if REWIND_SECONDS > 0 else None
+        self.camera = Camera(bounds=self.world_bounds)
+        self.camera.follow(self.player)
+
+    def assets(self):
+        """Sprites del jugador + los del nivel (los tiles se dibujan como rects, sin imágenes)."""
+        return resources.PLAYER_ASSETS + tuple(self.level_assets)
+
+    # ---------- Entidades ----------
+    @property
+    def enemies(self):
+        return self.entities.group("enemies")
+
+    @property
+    def bullets(self):
+        return self.entities.group("bullets")
+
+    @property
+    def boss(self):
+        return self.entities.get(self.boss_handle)
+
+    @boss.setter
+    def boss(self, entity):
+        self.boss_handle = entity.handle if entity is not None else None
+
+    @property
+    def miniboss(self):
+        return self.entities.get(self.miniboss_handle)
+
+    @miniboss.setter
+    def miniboss(self, entity):
+        self.miniboss_handle = entity.handle if entity is not None else None
+
+    def add_entity(self, entity, group=None):
+        """Registra una entidad (bala, enemigo, invocación...) y devuelve su handle."""
+        handle = self.entities.add(entity, group)
+        # vida limitada (balas): muere por callback, sin contar tiempo en su update
+        lifespan = getattr(entity, "lifespan", None)
+        if lifespan:
+            entity.expire_id = self.scheduler.after(lifespan * 1000.0, entity.kill)
+        return handle
+
+    # ---------- Consultas de combate ----------
+    def query_rect(self, rect, team=None, tags=None):
+        return self.broadphase.query_rect(rect, team, tags)
+
+    def query_circle(self, center, radius, team=None, tags=None):
+        return self.broadphase.query_circle(center, radius, team, tags)
+
+    def query_segment(self, p0, p1, team=None, tags=None):
+        return self.broadphase.query_segment(p0, p1, team, tags)
 
     def add_tile(self, x, y, w, h):
-        self.tiles.append(pygame.Rect(x, y, w, h))
+        t = pygame.Rect(x, y, w, h)
+        self.tiles.append(t)
+        self.tile_index.insert(t)
+        if not self._bounds_locked:
+            if self.world_bounds.size == (0, 0):
+                self.world_bounds.update(t)
+            else:
+                self.world_bounds.union_ip(t)
+        return t
+
+    def remove_tiles(self, rects):
+        """Quita tiles (p.ej. al descargar un chunk)."""
+        ids = {id(r) for r in rects}
+        for r in rects:
+            self.tile_index.remove(r)
+        self.tiles = [t for t in self.tiles if id(t) not in ids]
+
+    def solids_near(self, rect):
+        """Tiles que se solapan con 'rect' (consulta al índice espacial)."""
+        return self.tile_index.query(rect)
+
+    def is_simulated(self, entity) -> bool:
+        """Los niveles con streaming congelan lo que está fuera de los chunks cargados."""
+        return True
+
+    def set_world_bounds(self, x, y, w, h):
+        """Fija los límites del mundo (la cámara no sale de ellos)."""
+        self.world_bounds.update(x, y, w, h)   # mismo Rect que usa la cámara
+        self._bounds_locked = True
+        self.camera.snap()
 
     def spawn_enemy(self, x, y):
-        self.enemies.append(EnemyBase(x, y))
+        return self.add_entity(EnemyBase(x, y), "enemies")
+
+    def now_ms(self) -> int:
+        """Tiempo simulado (self.clock): base de cooldowns y ráfagas de voz."""
+        return self.clock.now_ms
+
+    def _live_voice_commands(self):
+        if hasattr(self.game, "voice") and self.game.voice:
+            return self.game.voice.get_commands()
+        return []
 
     def update(self, dt):
-        intents = read_intents()
-        self.player.intents = intents
+        self.clock.tick(dt)
+        # plazos vencidos (fin de dash, balas, estados...) antes de que nadie se mueva
+        self.scheduler.update(self.clock.ms)
+        # broadphase con las posiciones de fin del tick anterior (orden de alta); ya se armó
+        # al cerrar ese tick, salvo que desde entonces se hayan agregado entidades
+        if self.entities.spawned != self._broadphase_spawned:
+            self._rebuild_broadphase()
+
+        mask = self.input_source()
+        if isinstance(mask, dict):
+            mask = pack_intents(mask)
+        phrases = self.voice_source()
+        self.player.input.step(mask, self.now_ms())
         self.player.update(dt, self)
+        self.keyboard.acted(self.player.input.fired)
 
         # --- VOZ: leer frases, mostrar SIEMPRE y encolar ráfagas ---
-        if hasattr(self.game, "voice") and self.game.voice:
-            for phrase in self.game.voice.get_commands():
+        if phrases:
+            for phrase in phrases:
                 print(f"[VOICE] → {phrase}")
                 self._show_mic_msg(phrase)  # siempre mostrar lo dicho
 
@@ -46,88 +184,184 @@ class LevelBase(Scene):
                 if not words:
                     continue
 
-                now = pygame.time.get_ticks()
+                now = self.now_ms()
                 offset = 0
                 for word in words:
                     name = self._map_voice_to_power(word)
                     if not name:
                         continue
-                    p = self.player.power_registry.get(name)
-                    gap = max(80, (p.cooldown_ms if p else 0))  # 80 ms mínimo
+                    pid = self.player.powers.book.id_of(name)
+                    if pid < 0:
+                        continue
+                    gap = max(80, self.player.powers.book.specs[pid].cooldown_ms)  # 80 ms mínimo
                     due = now + offset
-                    self.voice_cast_queue.append((due, name))
+                    self.voice_cast_queue.append((due, pid))
                     offset += gap
 
         # --- Procesar la cola de ráfagas (una vez por frame) ---
-        now = pygame.time.get_ticks()
+        now = self.now_ms()
         while self.voice_cast_queue and self.voice_cast_queue[0][0] <= now:
-            _, name = self.voice_cast_queue.popleft()
-            self.player.try_power_by_name(name, self)  # si no está disponible: no hace nada
+            _, pid = self.voice_cast_queue.popleft()
+            self.player.try_power(pid, self)  # si no está disponible: no hace nada
 
         # --- Balas ---
+        # copia: una bala o un enemigo puede agregar otros al mismo grupo durante su update
         for b in list(self.bullets):
-            b.update(dt, self)
-            if not b.alive:
-                self.bullets.remove(b)
+            if b.alive:
+                b.update(dt, self)
 
         # --- Enemigos ---
         for e in list(self.enemies):
-            e.update(dt, self)
-            if not e.alive:
-                self.enemies.remove(e)
+            if e.alive and self.is_simulated(e):
+                e.update(dt, self)
+
+        # --- Partículas ---
+        self.particles.update(dt)
+
+        # --- Bajas del tick (swap-remove) + instrumentación ---
+        self.entities.compact()
+        for name, n in self.entities.counts().items():
+            metrics.gauge(name, n)
+        metrics.gauge("particles", self.particles.live)
+        metrics.gauge("status_active", self.status.count())
+        metrics.incr("broadphase_queries", self.broadphase.queries)
+        self.broadphase.queries = 0
 
-        # --- Respawn seguro (sin número mágico 540) ---
-        screen_h = self.game.screen.get_height()
-        if self.player.rect.top > screen_h + 200:
+        # --- Respawn seguro (caída bajo el borde inferior del mundo) ---
+        if self.player.rect.top > self.world_bounds.bottom + 200:
             self.player.rect.topleft = (80, 420)
             self.player.vel.xy = (0, 0)
+            self.camera.snap()
 
-        # --- Mensaje micrófono ---
-        if self.mic_msg_timer > 0:
-            self.mic_msg_timer -= dt
-            if self.mic_msg_timer < 0:
-                self.mic_msg_timer = 0
+        # posiciones finales del tick: las usan el culling de draw_world y las consultas del próximo
+        self._rebuild_broadphase()
+        self.camera.update(dt)
+
+        if self.recorder is not None:
+            self.recorder.record_tick(self, dt, mask, phrases)
+        if self.rewind is not None:
+            self.rewind.push(self)
+
+    def _rebuild_broadphase(self):
+        self.broadphase.rebuild(self._iter_entities())
+        self._broadphase_spawned = self.entities.spawned
+
+    def rewind_by(self, seconds: float) -> bool:
+        """Vuelve 'seconds' atrás en la historia (no mientras se graba: el replay no lo sabría)."""
+        if self.rewind is None or self.recorder is not None:
+            return False
+        if not self.rewind.rewind(self, seconds):
+            return False
+        self.camera.update()
+        self._show_mic_msg(f"Rebobinar {seconds:g} s")
+        return True
+
+    def retry(self) -> bool:
+        """Reinicia con la escena de repuesto (no mientras se graba: el .eqr es de una sola escena)."""
+        if self.manager is None:   # headless, batch, servidor de red: nadie construye repuestos
+            return False
+        if self.recorder is not None:
+            self._show_mic_msg("Grabando: reintentar desactivado")
+            return False
+        self.manager.retry()
+        return True
+
+    def state_checksum(self) -> int:
+        """CRC32 del estado de simulación (para verificar replays)."""
+        p = self.player
+        buf = bytearray(struct.pack("<d4i2did", self.clock.ms, *p.rect, p.vel.x, p.vel.y, p.hp,
+                                    p.energy_pool.energy))
+        for e in self.enemies:
+            buf += struct.pack("<4iiB", *e.rect, e.hp, e.status)
+        for b in self.bullets:
+            buf += struct.pack("<4i", *b.rect)
+        buf += struct.pack("<I", len(self.voice_cast_queue))
+        return zlib.crc32(buf)
+
+    def _iter_entities(self):
+        yield self.player
+        yield from self.enemies
+        yield from self.bullets
+        for name in self.entities.groups():
+            if name not in ("player", "enemies", "bullets"):
+                yield from self.entities.group(name)
 
     def draw_world(self, screen):
-        # Fondo
-        screen.fill(self.bg_color)
-        # Tiles
-        for t in self.tiles:
-            pygame.draw.rect(screen, COLOR_TILE, t)
-        # Enemigos y balas
-        for e in self.enemies: e.draw(screen)
-        for b in self.bullets: b.draw(screen)
-        # Jugador
-        self.player.draw(screen)
+        view = self.camera.view
+        q = self.render_queue
+        k = self.render_scale
+        q.begin(self.camera.offset, k, self.clock.ms)
+        # Fondo (sólo la región que se va a escalar a la ventana)
+        if k == 1.0:
+            screen.fill(self.bg_color)
+        else:
+            screen.fill(self.bg_color, (0, 0, round(screen.get_width() * k), round(screen.get_height() * k)))
+        # Tiles (sólo los que caen en la vista)
+        self.submit_tiles(q, view)
+        # Entidades visibles (consulta al broadphase del fin del tick); cada una en su capa
+        player = self.player
+        if self.entities.spawned != self._broadphase_spawned:   # altas sin tick de por medio
+            self._rebuild_broadphase()
+        for e in self.broadphase.query_rect(view):
+            if e is not player:
+                e.submit(q)
+        player.submit(q)
+        # Efectos
+        q.call(self.particles.draw, Layer.EFFECTS)
+        q.flush(screen)
+
+    def submit_tiles(self, queue, view):
+        for t in self.tile_index.query(view):
+            queue.fill(t, COLOR_TILE, Layer.TILES)
 
     def draw_ui(self, screen, dst_rect=None):
-        # HUD sobre pantalla final (nítido)
+        # HUD sobre pantalla final (nítido; incluye barras de jefe)
         self.hud.draw(screen)
 
-        # Barras superiores
-        if self.miniboss and getattr(self.miniboss, "alive", False):
-            self.hud.draw_boss_bar(screen, self.miniboss, title="MINI JEFE")
-        if self.boss and getattr(self.boss, "alive", False):
-            self.hud.draw_boss_bar(screen, self.boss, title="JEFE")
+        if self.show_metrics:
+            self._draw_metrics(screen)
 
         # Mensaje de mic (toast abajo)
-        if self.mic_msg_timer > 0:
-            font = pygame.font.SysFont("consolas", 18)
-            surf = font.render(self.mic_msg, True, (220, 240, 255))
+        if self.clock.ms < self.mic_msg_until:
+            surf = resources.render_text(self.mic_msg, (220, 240, 255), "label")
             x = (screen.get_width() - surf.get_width()) // 2
             y = int(screen.get_height() - 36)
-            bg = pygame.Surface((surf.get_width()+16, surf.get_height()+8), pygame.SRCALPHA)
-            bg.fill((20, 30, 50, 150))
+            bg = resources.panel(surf.get_width()+16, surf.get_height()+8, (20, 30, 50, 150))
             screen.blit(bg, (x-8, y-4))
             screen.blit(surf, (x, y))
 
+    def _draw_metrics(self, screen):
+        stats = metrics.snapshot()
+        stats.update({"text_" + k: v for k, v in resources.text_cache_stats().items()})
+        y = 80
+        for name, value in sorted(stats.items()):
+            surf = resources.render_text(f"{name}: {value}", COLOR_HUD, "debug")
+            screen.blit(surf, (16, y))
+            y += surf.get_height()
+
     # Compatibilidad: draw llama a ambos en la misma surface
     def draw(self, screen):
         self.draw_world(screen)
         self.draw_ui(screen)
     def handle_events(self, events):
+        self.keyboard.feed(events)
         for e in events:
             if e.type == pygame.KEYDOWN:
+                if e.key == pygame.K_F3:   # overlay de métricas
+                    self.show_metrics = not self.show_metrics
+                if e.key == pygame.K_F5 and self.manager is not None:   # reintentar el nivel
+                    self.retry()
+                if e.key == pygame.K_BACKSPACE:   # rebobinar
+                    self.rewind_by(REWIND_STEP)
+                if e.key == pygame.K_p:    # pausa
+                    paused = self.clock.toggle_pause()
+                    self._show_mic_msg("Pausa" if paused else "Continuar")
+                if e.key in (pygame.K_F6, pygame.K_F7):   # cámara lenta / avance rápido
+                    steps = TIME_SCALES_SLOW if e.key == pygame.K_F6 else TIME_SCALES_FAST
+                    nxt = steps[(steps.index(self.clock.scale) + 1) % len(steps)] \
+                        if self.clock.scale in steps else steps[1]
+                    self.clock.set_scale(nxt)
+                    self._show_mic_msg(f"Tiempo x{nxt:g}")
                 if e.key == pygame.K_F10:
                     if hasattr(self.game, "voice") and self.game.voice:
                         idx, name = self.game.voice.next_device()
@@ -144,7 +378,7 @@ class LevelBase(Scene):
 
     def _show_mic_msg(self, text):
         self.mic_msg = text
-        self.mic_msg_timer = 2.0
+        self.mic_msg_until = self.clock.ms + 2000.0
 
     def _map_voice_to_power(self, phrase: str):
         s = phrase.lower().strip()
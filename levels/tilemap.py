@@ -0,0 +1,269 @@
+# levels/tilemap.py
+"""
+Formato de nivel en datos (subconjunto de JSON de Tiled) + streaming por chunks.
+
+Mapa soportado (orthogonal, no 'infinite'):
+  - capas "tilelayer": cualquier gid != 0 es sólido (salvo propiedad collision=false).
+    'data' como lista o base64 (sin compresión, zlib o gzip).
+  - capas "objectgroup": objetos con type/class "solid" (rect de colisión libre),
+    "player" y "enemy" (puntos de spawn).
+  - propiedades del mapa: "name" (nombre del nivel), "bounds" ("x,y,w,h").
+"""
+import base64, gzip, json, zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from core.config import COLOR_TILE, CHUNK_TILES, CHUNK_LOAD_RADIUS, CHUNK_KEEP_RADIUS
+
+_COLORKEY = (255, 0, 255)
+
+
+def _props(obj) -> dict:
+    return {p.get("name"): p.get("value") for p in obj.get("properties", [])}
+
+
+def _decode_layer(layer) -> list:
+    data = layer.get("data", [])
+    if layer.get("encoding") != "base64":
+        return data
+    raw = base64.b64decode(data)
+    comp = layer.get("compression")
+    if comp == "zlib":
+        raw = zlib.decompress(raw)
+    elif comp == "gzip":
+        raw = gzip.decompress(raw)
+    elif comp:
+        raise ValueError(f"[tilemap] compresión no soportada: {comp}")
+    gids = array("I")
+    gids.frombytes(raw)
+    return gids
+
+
+class TileMap:
+    """Geometría y spawns de un nivel cargado desde JSON, consultable por chunk."""
+    def __init__(self, data: dict, chunk_tiles: int = CHUNK_TILES):
+        if data.get("infinite"):
+            raise ValueError("[tilemap] mapas 'infinite' de Tiled no soportados")
+        self.width = int(data["width"])
+        self.height = int(data["height"])
+        self.tile_w = int(data["tilewidth"])
+        self.tile_h = int(data["tileheight"])
+        self.chunk_tiles = chunk_tiles
+        self.chunk_w = chunk_tiles * self.tile_w
+        self.chunk_h = chunk_tiles * self.tile_h
+
+        props = _props(data)
+        self.name = props.get("name", "")
+        self.solid = bytearray(self.width * self.height)   # 1 = celda sólida
+        self.objects = []   # rects sólidos libres (x, y, w, h)
+        self.spawns = []    # (kind, x, y)
+
+        for layer in data.get("layers", []):
+            kind = layer.get("type")
+            if kind == "tilelayer":
+                if _props(layer).get("collision", True) is False:
+                    continue
+                for i, gid in enumerate(_decode_layer(layer)):
+                    if gid:
+                        self.solid[i] = 1
+            elif kind == "objectgroup":
+                for ob in layer.get("objects", []):
+                    okind = ob.get("type") or ob.get("class") or ""
+                    x, y = int(ob.get("x", 0)), int(ob.get("y", 0))
+                    if okind == "solid":
+                        self.objects.append((x, y, int(ob["width"]), int(ob["height"])))
+                    elif okind:
+                        self.spawns.append((okind, x, y))
+
+        # extent = toda la geometría; bounds = límites de cámara (por defecto, el extent)
+        self.extent = pygame.Rect(0, 0, self.width * self.tile_w, self.height * self.tile_h)
+        for r in self.objects:
+            self.extent.union_ip(r)
+        if "bounds" in props:
+            self.bounds = pygame.Rect(*[int(v) for v in str(props["bounds"]).split(",")])
+        else:
+            self.bounds = self.extent.copy()
+
+        # índices de objetos por chunk (el rect se comparte entre todos los chunks que toca)
+        self._chunk_objects = {}
+        for i, r in enumerate(self.objects):
+            for key in self.chunks_in(pygame.Rect(r)):
+                self._chunk_objects.setdefault(key, []).append(i)
+
+    @classmethod
+    def load(cls, path: str, chunk_tiles: int = CHUNK_TILES) -> "TileMap":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), chunk_tiles=chunk_tiles)
+
+    def chunks_in(self, rect: pygame.Rect):
+        """Claves (cx, cy) de los chunks que toca 'rect'."""
+        cw, ch = self.chunk_w, self.chunk_h
+        for cy in range(rect.top // ch, (rect.bottom - 1) // ch + 1):
+            for cx in range(rect.left // cw, (rect.right - 1) // cw + 1):
+                yield (cx, cy)
+
+    def chunk_objects(self, key) -> list:
+        """Índices (en self.objects) de los rects sólidos libres que tocan el chunk."""
+        return self._chunk_objects.get(key, [])
+
+    def chunk_rects(self, key) -> list:
+        """Rects sólidos de la capa de tiles dentro del chunk (corridas horizontales)."""
+        cx, cy = key
+        n, w = self.chunk_tiles, self.width
+        tw, th = self.tile_w, self.tile_h
+        out = []
+        tx0, ty0 = cx * n, cy * n
+        for ty in range(max(0, ty0), min(self.height, ty0 + n)):
+            row = ty * w
+            tx, tx_end = max(0, tx0), min(w, tx0 + n)
+            while tx < tx_end:
+                if not self.solid[row + tx]:
+                    tx += 1
+                    continue
+                start = tx
+                while tx < tx_end and self.solid[row + tx]:
+                    tx += 1
+                out.append((start * tw, ty * th, (tx - start) * tw, th))
+        return out
+
+
+class Chunk:
+    """
+    Chunk cargado: rects de tiles propios, índices de objetos sólidos compartidos
+    y superficie pre-renderizada (None si está vacío).
+    La copia a resolución interna < 1 vive en el chunk: se va con él al descargarlo.
+    """
+    __slots__ = ("key", "origin", "rects", "objects", "surface", "_scaled")
+
+    def __init__(self, key, origin, rects, objects, surface):
+        self.key = key
+        self.origin = origin
+        self.rects = rects
+        self.objects = objects
+        self.surface = surface
+        self._scaled = None   # (escala, superficie)
+
+    def surface_at(self, scale: float):
+        """Superficie del chunk a la escala de render (se reescala sólo al cambiar la escala)."""
+        if scale == 1.0 or self.surface is None:
+            return self.surface
+        cached = self._scaled
+        if cached is None or cached[0] != scale:
+            w, h = self.surface.get_size()
+            surf = pygame.transform.scale(self.surface, (max(1, round(w * scale)), max(1, round(h * scale))))
+            cached = self._scaled = (scale, surf)
+        return cached[1]
+
+
+def build_chunk(source, key) -> Chunk:
+    """Construye un chunk (se ejecuta en el hilo de fondo)."""
+    x0, y0 = key[0] * source.chunk_w, key[1] * source.chunk_h
+    rects = [pygame.Rect(r) for r in source.chunk_rects(key)]
+    objects = source.chunk_objects(key)
+    surface = None
+    if rects or objects:
+        surface = pygame.Surface((source.chunk_w, source.chunk_h))
+        surface.fill(_COLORKEY)
+        surface.set_colorkey(_COLORKEY)
+        for r in rects:
+            pygame.draw.rect(surface, COLOR_TILE, r.move(-x0, -y0))
+        for i in objects:   # lo que sale del chunk se recorta solo
+            x, y, w, h = source.objects[i]
+            pygame.draw.rect(surface, COLOR_TILE, (x - x0, y - y0, w, h))
+    return Chunk(key, (x0, y0), rects, objects, surface)
+
+
+class ChunkStreamer:
+    """
+    Mantiene cargados los chunks alrededor de la vista.
+      - región activa (vista + 'load_radius' chunks): siempre lista; se simula lo que está dentro.
+      - anillo siguiente: se precarga en segundo plano para que la región activa no espere.
+      - fuera de 'keep_radius': se descargan (memoria acotada).
+    La región activa sólo depende de la cámara (no del hilo de fondo): la simulación es
+    determinista aunque las cargas terminen en frames distintos.
+    'on_load' / 'on_unload' reciben el Chunk para indexar/desindexar su colisión.
+    """
+    def __init__(self, source, on_load=None, on_unload=None,
+                 load_radius=CHUNK_LOAD_RADIUS, keep_radius=CHUNK_KEEP_RADIUS):
+        self.source = source
+        self.on_load = on_load
+        self.on_unload = on_unload
+        self.load_radius = load_radius
+        self.keep_radius = max(keep_radius, load_radius + 1)
+        self.active = pygame.Rect(0, 0, 0, 0)
+        self.loaded = {}    # key -> Chunk
+        self._pending = {}  # key -> Future
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunks")
+        self.stats = {"loaded": 0, "evicted": 0, "sync_loads": 0}
+
+    def _region(self, view, radius):
+        return view.inflate(2 * radius * self.source.chunk_w, 2 * radius * self.source.chunk_h)
+
+    def _in_map(self, key):
+        b = self.source.extent
+        cw, ch = self.source.chunk_w, self.source.chunk_h
+        return (b.left // cw <= key[0] <= (b.right - 1) // cw and
+                b.top // ch <= key[1] <= (b.bottom - 1) // ch)
+
+    def _accept(self, chunk):
+        self.loaded[chunk.key] = chunk
+        self.stats["loaded"] += 1
+        if self.on_load:
+            self.on_load(chunk)
+
+    def _ensure(self, region):
+        for key in self.source.chunks_in(region):
+            if key in self.loaded or not self._in_map(key):
+                continue
+            fut = self._pending.pop(key, None)
+            if fut is None or not fut.done():
+                self.stats["sync_loads"] += 1
+            self._accept(fut.result() if fut is not None else build_chunk(self.source, key))
+
+    def update(self, view: pygame.Rect):
+        src = self.source
+        # 1) recoger lo que terminó en segundo plano
+        for key, fut in list(self._pending.items()):
+            if fut.done():
+                del self._pending[key]
+                self._accept(fut.result())
+
+        # 2) la región activa tiene que estar lista ya (normalmente ya lo está por el prefetch)
+        self.active = self._region(view, self.load_radius)
+        self._ensure(self.active)
+
+        # 3) prefetch del anillo exterior
+        for key in src.chunks_in(self._region(view, self.load_radius + 1)):
+            if key not in self.loaded and key not in self._pending and self._in_map(key):
+                self._pending[key] = self._pool.submit(build_chunk, src, key)
+
+        # 4) descargar lo lejano
+        keep = set(src.chunks_in(self._region(view, self.keep_radius)))
+        for key in [k for k in self.loaded if k not in keep]:
+            chunk = self.loaded.pop(key)
+            self.stats["evicted"] += 1
+            if self.on_unload:
+                self.on_unload(chunk)
+        for key in [k for k in self._pending if k not in keep]:
+            self._pending.pop(key).cancel()
+
+    def load_now(self, view: pygame.Rect):
+        """Carga síncrona de la región activa (al entrar al nivel)."""
+        self.active = self._region(view, self.load_radius)
+        for key in self.source.chunks_in(self.active):
+            if key not in self.loaded and self._in_map(key):
+                self._accept(build_chunk(self.source, key))
+
+    def visible(self, view: pygame.Rect):
+        for key in self.source.chunks_in(view):
+            chunk = self.loaded.get(key)
+            if chunk is not None:
+                yield chunk
+
+    def covers(self, rect: pygame.Rect, margin: int = 0) -> bool:
+        """True si 'rect' (más 'margin') cae entero en la región activa."""
+        return self.active.contains(rect.inflate(2 * margin, 2 * margin))
+
+    def shutdown(self, wait: bool = False):
+        """wait: esperar el chunk en construcción (antes de cerrar la fuente que lee)."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,94 @@
+# levels/tilemap_level.py
+import os
+import pygame
+from levels.level_base import LevelBase
+from levels.tilemap import ChunkStreamer
+from levels.compiler import load_level
+from engine.render import Layer
+from core.config import LEVELS_DIR
+
+SIM_MARGIN = 128   # px
+
+
+class TileMapLevel(LevelBase):
+    """
+    Nivel definido en un archivo de datos (ver levels/tilemap.py).
+    La colisión y el render de tiles vienen de los chunks cargados alrededor de la cámara.
+    """
+    map_file = None   # ruta relativa a LEVELS_DIR (las subclases la fijan)
+
+    def __init__(self, game, path=None):
+        super().__init__(game)
+        path = path or os.path.join(LEVELS_DIR, self.map_file)
+        self.map = self.load_map(path)
+        self.level_name = self.map.name or os.path.splitext(os.path.basename(path))[0]
+
+        b = self.map.bounds
+        self.set_world_bounds(b.x, b.y, b.w, b.h)
+
+        self._objects = {}   # índice de objeto sólido -> [Rect, nº de chunks cargados que lo usan]
+        self._spawn_from_map()
+        self.camera.snap()
+
+        self.streamer = ChunkStreamer(self.map, on_load=self._on_chunk_load,
+                                      on_unload=self._on_chunk_unload)
+        self.streamer.load_now(self.camera.view)
+
+    def load_map(self, path):
+        # binario compilado (se regenera solo si el JSON es más nuevo)
+        return load_level(path)
+
+    def _spawn_from_map(self):
+        for kind, x, y in self.map.spawns:
+            if kind == "player":
+                self.player.rect.topleft = (x, y)
+            elif kind == "enemy":
+                self.spawn_enemy(x, y)
+
+    # ---------- Streaming ----------
+    def _on_chunk_load(self, chunk):
+        for r in chunk.rects:
+            self.tiles.append(r)
+            self.tile_index.insert(r)
+        for i in chunk.objects:
+            ref = self._objects.get(i)
+            if ref is None:
+                r = pygame.Rect(self.map.objects[i])
+                self.tiles.append(r)
+                self.tile_index.insert(r)
+                self._objects[i] = [r, 1]
+            else:
+                ref[1] += 1
+
+    def _on_chunk_unload(self, chunk):
+        gone = list(chunk.rects)
+        for i in chunk.objects:
+            ref = self._objects[i]
+            ref[1] -= 1
+            if ref[1] == 0:
+                gone.append(ref[0])
+                del self._objects[i]
+        self.remove_tiles(gone)
+
+    def is_simulated(self, entity) -> bool:
+        # margen: sus consultas de colisión no deben llegar al anillo que carga en segundo plano
+        return self.streamer.covers(entity.rect, margin=SIM_MARGIN)
+
+    def update(self, dt):
+        # la cámara ya se movió el frame anterior: primero asegurar chunks
+        self.streamer.update(self.camera.view)
+        super().update(dt)
+
+    def dispose(self):
+        # primero que ningún hilo lea el mapa; después soltar el .lvlc (archivo + mmap)
+        self.streamer.shutdown(wait=True)
+        close = getattr(self.map, "close", None)
+        if close is not None:
+            close()
+
+    def submit_tiles(self, queue, view):
+        # la copia escalada la guarda cada chunk: fuera de la caché de variantes de la cola
+        scale = queue.scale
+        for chunk in self.streamer.visible(view):
+            if chunk.surface is not None:
+                queue.sprite(chunk.surface_at(scale), chunk.origin, Layer.TILES, prescaled=True)
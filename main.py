@@ -1,15 +1,21 @@
 # main.py
-import sys, pygame
-from core.config import VIRTUAL_W, VIRTUAL_H, FPS, FULLSCREEN, BORDERLESS, SCALE_MODE, LETTERBOX, MIC_DEVICE_INDEX, MIC_LANGUAGE
+import sys, argparse, pygame
+import time
+from core.config import (VIRTUAL_W, VIRTUAL_H, FPS, SIM_MAX_STEP, FULLSCREEN, BORDERLESS, PRESENT_PIPELINED,
+                         DYNAMIC_RES, RES_SCALES, MIC_DEVICE_INDEX, MIC_LANGUAGE, NET_PORT)
 from core.scene import SceneManager
 from levels.test_level import TestLevel
 from core.resources import load_fonts
 from core.voice import VoiceListener
+from core import metrics
+from core.replay import Recorder
+from core.present import SerialPresenter, PipelinedPresenter
+from engine.quality import QualityController
 
 WINDOW_TITLE = "ESPOL Quest — Beta"
 
 class Game:
-    def __init__(self):
+    def __init__(self, record_path=None, pipelined=PRESENT_PIPELINED, connect=None):
         pygame.init()
         # Crear ventana según FULLSCREEN/BORDERLESS
         if FULLSCREEN:
@@ -28,11 +34,23 @@ class Game:
                 self.screen = pygame.display.set_mode((VIRTUAL_W, VIRTUAL_H), pygame.RESIZABLE)
         pygame.display.set_caption(WINDOW_TITLE)
 
-        # canvas lógico donde el nivel dibuja el mundo
-        self.canvas = pygame.Surface((VIRTUAL_W, VIRTUAL_H)).convert_alpha()
+        # canvas lógico donde el nivel dibuja el mundo (doble buffer si el present va en otro hilo)
+        self.presenter = PipelinedPresenter() if pipelined else SerialPresenter()
+        self.canvas = self.presenter.begin_frame()
+        # resolución interna adaptativa según el costo de los últimos frames
+        self.quality = QualityController(1000.0 / FPS, RES_SCALES, enabled=DYNAMIC_RES)
 
         load_fonts()
-        self.manager = SceneManager(TestLevel(self))
+        if connect:
+            # cliente de red: el servidor simula, acá sólo se dibuja (sin escenas de repuesto)
+            from core.net import NetClient, NetClientScene
+            client = NetClient(connect).connect()
+            self.manager = SceneManager(NetClientScene(self, client), warm_slots=0)
+        else:
+            # grabando no hay reintento (ver LevelBase.retry): no hace falta el repuesto
+            self.manager = SceneManager(TestLevel(self), warm_start=record_path is None)
+        # grabación determinista de la sesión (ver tools/replay.py)
+        self.recorder = Recorder(record_path, self.manager.scene) if record_path else None
 
         self.voice = VoiceListener(language=MIC_LANGUAGE, device_index=MIC_DEVICE_INDEX)
         self.voice.start()
@@ -40,81 +58,49 @@ class Game:
         self.clock = pygame.time.Clock()
         self.running = True
 
-    def _scale_rect(self, win_w, win_h):
-        # calcula tamaño destino y offset según modo
-        if SCALE_MODE == "pixel_crisp":
-            # factor entero máximo
-            scale = min(win_w // VIRTUAL_W, win_h // VIRTUAL_H)
-            if scale < 1: scale = 1
-            dst_w, dst_h = VIRTUAL_W * scale, VIRTUAL_H * scale
-            ox = (win_w - dst_w) // 2 if LETTERBOX else 0
-            oy = (win_h - dst_h) // 2 if LETTERBOX else 0
-            return dst_w, dst_h, ox, oy, "nearest"
-
-        if SCALE_MODE == "integer_smooth":
-            scale = min(win_w // VIRTUAL_W, win_h // VIRTUAL_H)
-            if scale >= 1:
-                dst_w, dst_h = VIRTUAL_W * scale, VIRTUAL_H * scale
-                ox = (win_w - dst_w) // 2 if LETTERBOX else 0
-                oy = (win_h - dst_h) // 2 if LETTERBOX else 0
-                return dst_w, dst_h, ox, oy, "smooth"
-            # si no cabe entero, cae a smooth a pantalla completa con letterbox
-            ratio = min(win_w / VIRTUAL_W, win_h / VIRTUAL_H)
-            dst_w, dst_h = int(VIRTUAL_W * ratio), int(VIRTUAL_H * ratio)
-            ox = (win_w - dst_w) // 2 if LETTERBOX else 0
-            oy = (win_h - dst_h) // 2 if LETTERBOX else 0
-            return dst_w, dst_h, ox, oy, "smooth"
-
-        # smooth_only
-        ratio = min(win_w / VIRTUAL_W, win_h / VIRTUAL_H)
-        dst_w, dst_h = int(VIRTUAL_W * ratio), int(VIRTUAL_H * ratio)
-        ox = (win_w - dst_w) // 2 if LETTERBOX else 0
-        oy = (win_h - dst_h) // 2 if LETTERBOX else 0
-        return dst_w, dst_h, ox, oy, "smooth"
-
     def run(self):
         while self.running:
-            dt = min(self.clock.tick(FPS) / 1000.0, 0.05)
+            dt = min(self.clock.tick(FPS) / 1000.0, SIM_MAX_STEP)
+            t_frame = time.perf_counter()
             events = pygame.event.get()
             for e in events:
                 if e.type == pygame.QUIT:
                     self.running = False
 
+            # eventos antes de simular: lo pulsado en este frame ya se juega en este frame
+            self.manager.handle_events(events)
             if not self.manager.update(dt):
                 self.running = False
                 break
-            self.manager.handle_events(events)
+
+            t_ready = time.perf_counter()
 
             # 1) dibuja mundo en canvas lógico
-            self.canvas.fill((0,0,0,0))
+            canvas = self.canvas
+            scene = self.manager.scene
+            k = scene.render_scale = self.quality.scale
+            canvas.fill((0,0,0,0), (0, 0, round(VIRTUAL_W * k), round(VIRTUAL_H * k)))
             # << NUEVO: solo mundo, sin HUD >>
             if hasattr(self.manager.scene, "draw_world"):
-                self.manager.scene.draw_world(self.canvas)
+                self.manager.scene.draw_world(canvas)
             else:
-                self.manager.draw(self.canvas)  # fallback
+                self.manager.draw(canvas)  # fallback
 
-            # 2) escala canvas al tamaño de la ventana
-            win_w, win_h = self.screen.get_size()
-            dst_w, dst_h, ox, oy, method = self._scale_rect(win_w, win_h)
-
-            if method == "nearest":
-                scaled = pygame.transform.scale(self.canvas, (dst_w, dst_h))
-            else:
-                scaled = pygame.transform.smoothscale(self.canvas, (dst_w, dst_h))
-
-            # 3) limpia pantalla y blitea con letterbox
-            self.screen.fill((0,0,0))
-            self.screen.blit(scaled, (ox, oy))
-
-            # 4) HUD “post-scale” (nítido 1:1 sobre la pantalla final)
+            # 2) escala a la ventana + HUD nítido + flip (en este hilo o en el de presentación)
             if hasattr(self.manager.scene, "draw_ui"):
-                self.manager.scene.draw_ui(self.screen, (ox, oy, dst_w, dst_h))
+                draw_ui = self.manager.scene.draw_ui
             else:
                 # fallback: si no existe draw_ui, que el nivel dibuje HUD normal
-                self.manager.scene.hud.draw(self.screen)
-
-            pygame.display.flip()
-
+                draw_ui = lambda screen, dst: self.manager.scene.hud.draw(screen)
+            self.presenter.present(canvas, draw_ui, t_ready, getattr(scene, "render_scale", 1.0))
+            self.canvas = self.presenter.begin_frame()
+            self.quality.observe((time.perf_counter() - t_frame) * 1000.0)
+            metrics.end_frame()
+
+        if self.recorder:
+            self.recorder.close()
+        self.manager.shutdown()
+        self.presenter.stop()
         pygame.quit()
         try: self.voice.stop()
         except Exception: pass
@@ -123,4 +109,20 @@ class Game:
 
 
 if __name__ == "__main__":
-    Game().run()
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--record", metavar="ARCHIVO", help="graba intents y voz para replay (.eqr)")
+    ap.add_argument("--pipelined", action="store_true", default=PRESENT_PIPELINED,
+                    help="escala/flip en un hilo aparte (doble buffer)")
+    ap.add_argument("--serve", nargs="?", type=int, const=NET_PORT, metavar="PUERTO",
+                    help="servidor headless autoritativo (sin ventana)")
+    ap.add_argument("--connect", metavar="HOST:PUERTO", help="cliente de red: se une a un servidor")
+    args = ap.parse_args()
+    if args.serve:
+        from core.net import run_server
+        run_server(port=args.serve)
+        sys.exit()
+    connect = None
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        connect = (host or "127.0.0.1", int(port))
+    Game(record_path=args.record, pipelined=args.pipelined, connect=connect).run()
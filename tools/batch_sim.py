@@ -0,0 +1,75 @@
+# tools/batch_sim.py
+"""
+Barrido de parámetros de poderes con simulaciones headless en paralelo.
+
+    python -m tools.batch_sim --rotation rayo,golpe \\
+        --param rayo.cooldown_ms=100,150,300 --param rayo.damage=1,2 \\
+        --cast-every 150 --repeat 2 --workers 8 [--json resultados.json]
+
+Cada valor de --param se combina con los demás (producto cartesiano).
+"""
+import argparse, itertools, json, os, time
+from core.batch import run_batch, aggregate
+
+
+def _parse_value(s):
+    for cast in (int, float):
+        try:
+            return cast(s)
+        except ValueError:
+            pass
+    return s
+
+
+def build_jobs(args) -> list:
+    axes = []
+    for spec in args.param:
+        key, _, values = spec.partition("=")
+        power, _, attr = key.partition(".")
+        axes.append([(power, attr, _parse_value(v)) for v in values.split(",")])
+    jobs = []
+    for combo in itertools.product(*axes) if axes else [()]:
+        powers = {}
+        for power, attr, value in combo:
+            powers.setdefault(power, {})[attr] = value
+        for _ in range(args.repeat):
+            jobs.append({"id": len(jobs), "level": args.level, "powers": powers,
+                         "rotation": args.rotation.split(","), "cast_every_ms": args.cast_every,
+                         "hz": args.hz, "max_seconds": args.max_seconds})
+    return jobs
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--level", default="levels.test_level:TestLevel")
+    ap.add_argument("--rotation", default="golpe")
+    ap.add_argument("--param", action="append", default=[], metavar="PODER.ATTR=v1,v2")
+    ap.add_argument("--cast-every", type=int, default=200, help="ms entre intentos")
+    ap.add_argument("--hz", type=int, default=30)
+    ap.add_argument("--max-seconds", type=float, default=60)
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--json", help="guardar resultados crudos + agregados")
+    args = ap.parse_args()
+
+    jobs = build_jobs(args)
+    t0 = time.perf_counter()
+    results = run_batch(jobs, workers=args.workers)
+    wall = time.perf_counter() - t0
+    sim = sum(r["sim_seconds"] for r in results)
+    print(f"{len(jobs)} simulaciones en {wall:.2f} s con {args.workers} procesos "
+          f"({sim:.0f} s simulados, {sim / wall:.0f}x tiempo real)")
+
+    summary = aggregate(results)
+    for a in summary:
+        ttc = f"{a['mean_time_to_clear']:.1f}s" if a["mean_time_to_clear"] is not None else "  -  "
+        print(f"{json.dumps(a['params'], ensure_ascii=False):50s} clear {a['clear_rate']:4.0%} "
+              f"t={ttc:>6}  bajas {a['mean_killed']:3.1f}  casts {a['mean_casts']:5.1f}  energía {a['mean_energy_used']:6.1f}  "
+              f"rech. cd {a['mean_rejected_cooldown']:5.1f}  rech. energía {a['mean_rejected_energy']:5.1f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "summary": summary}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
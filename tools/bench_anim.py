@@ -0,0 +1,65 @@
+# tools/bench_anim.py
+"""
+Animación de muchas entidades: Animation por instancia (update de todas + get de las
+visibles cada frame) frente a un AnimClip compartido con desfase por entidad (sólo
+frame_at de las visibles, al dibujar).
+
+    python -m tools.bench_anim [--n 5000] [--frames 300] [--visible 0.2]
+"""
+import argparse, os, time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from engine.anim import Animation, AnimClip
+from entities.enemy import EnemyBase
+
+
+def per_frame(fn, frames: int) -> float:
+    t0 = time.perf_counter()
+    for f in range(frames):
+        fn(f)
+    return (time.perf_counter() - t0) / frames * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=5000)
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--visible", type=float, default=0.2, help="fracción en pantalla")
+    args = ap.parse_args()
+
+    surfaces = [pygame.Surface((26, 30)) for _ in range(6)]
+    dt = 1 / 60
+    n, shown = args.n, max(1, int(args.n * args.visible))
+
+    anims = [Animation(surfaces, fps=10) for _ in range(n)]
+    for i, a in enumerate(anims):
+        a.update((i % 97) / 100.0)   # fases distintas
+    visible_anims = anims[:shown]
+
+    def old(f):
+        for a in anims:
+            a.update(dt)
+        return [a.get() for a in visible_anims]
+
+    clip = AnimClip(surfaces, fps=10)
+    enemies = [EnemyBase(0, 0) for _ in range(n)]
+    for i, e in enumerate(enemies):
+        e.play(clip, -(i % 97) * 10.0)
+    visible = enemies[:shown]
+
+    def new(f):
+        now = f * dt * 1000.0
+        return [e.clip.frame_at(now - e.anim_start_ms) for e in visible]
+
+    def new_all(f):
+        now = f * dt * 1000.0
+        return [e.clip.frame_at(now - e.anim_start_ms) for e in enemies]
+
+    t_old, t_new, t_all = per_frame(old, args.frames), per_frame(new, args.frames), per_frame(new_all, args.frames)
+    print(f"Animation por instancia ({n} update + {shown} get): {t_old:6.3f} ms/frame")
+    print(f"AnimClip ({shown} visibles):                 {t_new:6.3f} ms/frame  ({t_old / t_new:.1f}x)")
+    print(f"AnimClip (las {n} visibles):              {t_all:6.3f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# tools/bench_camera.py
+"""
+Benchmark de cámara + culling: nivel de 50 pantallas de ancho.
+Compara draw_world con culling contra dibujar todo (comportamiento anterior).
+
+    python -m tools.bench_camera [--frames 300] [--screens 50]
+"""
+import argparse, random, time
+import pygame
+from core.headless import HeadlessGame
+from core.config import VIRTUAL_W, VIRTUAL_H, COLOR_TILE
+from levels.level_base import LevelBase
+
+
+class WideLevel(LevelBase):
+    def __init__(self, game, screens=50, seed=1):
+        super().__init__(game)
+        self.level_name = f"Bench {screens} pantallas"
+        rnd = random.Random(seed)
+        width = VIRTUAL_W * screens
+        ground_y = VIRTUAL_H - 160
+        self.add_tile(-48, 0, 48, VIRTUAL_H)
+        self.add_tile(width, 0, 48, VIRTUAL_H)
+        # suelo en tramos de 32 px (peor caso: muchos tiles chicos)
+        for x in range(0, width, 32):
+            self.add_tile(x, ground_y, 32, 80)
+        # plataformas y enemigos repartidos por todo el nivel
+        for x in range(200, width, 300):
+            self.add_tile(x, ground_y - rnd.randint(1, 6) * 110, 240, 32)
+            if rnd.random() < 0.5:
+                self.spawn_enemy(x + 40, ground_y - 40)
+        self.player.rect.topleft = (120, ground_y - 200)
+        self.camera.snap()
+
+
+def draw_all(level, screen):
+    """Dibujo sin cámara ni culling (como antes de este cambio)."""
+    screen.fill(level.bg_color)
+    for t in level.tiles:
+        pygame.draw.rect(screen, COLOR_TILE, t)
+    for e in level.enemies: e.draw(screen)
+    for b in level.bullets: b.draw(screen)
+    level.player.draw(screen)
+
+
+def _time(fn, frames):
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    return (time.perf_counter() - t0) * 1000.0 / frames
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--screens", type=int, default=50)
+    args = ap.parse_args()
+
+    game = HeadlessGame()
+    level = WideLevel(game, screens=args.screens)
+    canvas = game.canvas
+    print(f"nivel: {args.screens} pantallas, {len(level.tiles)} tiles, {len(level.enemies)} enemigos")
+
+    naive = _time(lambda: draw_all(level, canvas), args.frames)
+    culled = _time(lambda: level.draw_world(canvas), args.frames)
+    visible = len(level.tile_index.query(level.camera.view))
+    print(f"sin culling : {naive:7.3f} ms/frame")
+    print(f"con culling : {culled:7.3f} ms/frame  ({visible} tiles visibles)")
+    print(f"speedup     : {naive / max(culled, 1e-9):7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
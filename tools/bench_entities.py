@@ -0,0 +1,110 @@
+# tools/bench_entities.py
+"""
+Memoria y velocidad de las entidades: bytes por instancia (tracemalloc, incluye Rect,
+Vector2 y tags) y actualizaciones por segundo de enemigos/balas sobre un suelo plano.
+Cada medida sale dos veces: clases actuales (__slots__) y una copia con __dict__ como
+línea base (mismos métodos, ver 'unslotted').
+
+    python -m tools.bench_entities [--n 5000] [--ticks 200]
+"""
+import argparse, functools, gc, time, tracemalloc, types
+import pygame
+from engine.combat import DamageEvent
+from entities.enemy import EnemyBase
+from entities.bullet import Bullet
+
+
+class FlatWorld:
+    """Mundo mínimo: un suelo largo y un broadphase vacío."""
+    def __init__(self):
+        self.floor = [pygame.Rect(-10_000, 400, 1_000_000, 64)]
+
+    def solids_near(self, rect):
+        return self.floor
+
+    def query_rect(self, rect, team=None, tags=None):
+        return []
+
+
+@functools.cache
+def unslotted(cls):
+    """Copia de 'cls' y sus bases sin __slots__: mismos métodos, atributos en __dict__."""
+    bases = tuple(unslotted(b) for b in cls.__bases__ if b is not object)
+    slots = set(cls.__dict__.get("__slots__", ()))
+    ns = {k: v for k, v in cls.__dict__.items()
+          if k not in slots and k not in ("__slots__", "__dict__", "__weakref__")}
+    new = type(cls.__name__ + "Dict", bases, ns)
+    # super() sin argumentos lee la celda __class__: apuntarla a la copia
+    for k, v in ns.items():
+        code = getattr(v, "__code__", None)
+        if code is not None and "__class__" in code.co_freevars:
+            cells = tuple(types.CellType(new) if name == "__class__" else cell
+                          for name, cell in zip(code.co_freevars, v.__closure__))
+            f = types.FunctionType(code, v.__globals__, v.__name__, v.__defaults__, cells)
+            f.__kwdefaults__ = v.__kwdefaults__
+            setattr(new, k, f)
+    return new
+
+
+def bytes_per(factory, n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    items = [factory(i) for i in range(n)]
+    used = tracemalloc.get_traced_memory()[0] - base - (len(items) * 8 + 56)   # sin la lista
+    tracemalloc.stop()
+    return used / n
+
+
+def updates_per_sec(items, world, ticks: int, dt: float = 1 / 60, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(ticks):
+            for e in items:
+                e.update(dt, world)
+        best = min(best, time.perf_counter() - t0)
+    return len(items) * ticks / best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=5000)
+    ap.add_argument("--ticks", type=int, default=200)
+    args = ap.parse_args()
+
+    n = args.n
+    world = FlatWorld()
+    melee = frozenset({"melee"})   # los poderes pasan sus tags ya construidos
+    rows = {}
+    for label, wrap in (("slots", lambda c: c), ("dict", unslotted)):
+        enemy_cls, bullet_cls, event_cls = wrap(EnemyBase), wrap(Bullet), wrap(DamageEvent)
+        mk_enemy = lambda i: enemy_cls((i % 500) * 40, 360)
+        mk_bullet = lambda i: bullet_cls(i % 500, 100, lifespan=1e9, tags={"electric"})
+        mk_event = lambda i: event_cls(amount=1, tags=melee)
+
+        col = rows[label] = {}
+        col["bytes/enemigo"] = bytes_per(mk_enemy, n)
+        col["bytes/bala"] = bytes_per(mk_bullet, n)
+        col["bytes/evento"] = bytes_per(mk_event, n)
+        enemies = [mk_enemy(i) for i in range(n)]
+        bullets = [mk_bullet(i) for i in range(n)]
+        col["enemigos/s"] = updates_per_sec(enemies, world, args.ticks)
+        col["balas/s"] = updates_per_sec(bullets, world, args.ticks)
+        best = float("inf")
+        for _ in range(3):
+            t0 = time.perf_counter()
+            for i in range(n * 20):
+                mk_event(i)
+            best = min(best, time.perf_counter() - t0)
+        col["eventos/s"] = n * 20 / best
+        del enemies, bullets
+
+    print(f"{'':14}{'slots':>10}{'dict':>10}{'slots/dict':>12}")
+    for key in rows["slots"]:
+        a, b = rows["slots"][key], rows["dict"][key]
+        print(f"{key:14}{a:10.0f}{b:10.0f}{a / b:11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
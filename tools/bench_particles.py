@@ -0,0 +1,52 @@
+# tools/bench_particles.py
+"""
+Partículas: mantiene N partículas vivas repartidas en los efectos de la tabla de poderes
+y mide ms de update y de dibujo por frame sobre el canvas virtual.
+
+    python -m tools.bench_particles [--n PARTICLES_MAX] [--frames 300]
+"""
+import argparse, time
+from core.headless import HeadlessGame
+from core.config import VIRTUAL_W, VIRTUAL_H, PARTICLES_MAX
+from engine.particles import ParticleSystem, EmitterSpec
+from engine.powers import default_book
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=PARTICLES_MAX)
+    ap.add_argument("--frames", type=int, default=300)
+    args = ap.parse_args()
+
+    game = HeadlessGame()
+    ps = ParticleSystem(seed=1, max_live=args.n)
+    if not ps.enabled:
+        print("numpy no disponible: sistema de partículas inactivo")
+        return
+    specs = [s.fx for s in default_book().specs if s.fx is not None] or [EmitterSpec()]
+    dt = 1 / 60
+    upd = draw = 0.0
+    worst = 0.0
+    for f in range(args.frames):
+        # reponer hasta N vivas, en ráfagas por toda la pantalla
+        i = 0
+        while ps.live < args.n:
+            spec = specs[i % len(specs)]
+            ps.burst(spec, (i * 97 + f * 31) % VIRTUAL_W, (i * 53) % VIRTUAL_H, 1 if i % 2 else -1)
+            i += 1
+        t0 = time.perf_counter()
+        ps.update(dt)
+        t1 = time.perf_counter()
+        game.canvas.fill((0, 0, 0))
+        ps.draw(game.canvas)
+        t2 = time.perf_counter()
+        upd += t1 - t0
+        draw += t2 - t1
+        worst = max(worst, t2 - t0)
+    fr = args.frames
+    print(f"{args.n} partículas, {len(ps.emitters)} emisores: update {upd / fr * 1000:.2f} ms  "
+          f"dibujo {draw / fr * 1000:.2f} ms  peor frame {worst * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# tools/bench_present.py
+"""
+Presentación serie vs en hilo aparte: corre el nivel de prueba sin tope de FPS con una
+ventana (dummy) que obliga a escalar, y mide frames/s y latencia fin de simulación → flip.
+
+    python -m tools.bench_present [--frames 600] [--window 3840x2160]
+"""
+import argparse, os, time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from core.headless import HeadlessGame
+from core.present import SerialPresenter, PipelinedPresenter
+from levels.test_level import TestLevel
+
+
+def run(presenter_cls, frames, dt=1 / 60):
+    game = HeadlessGame()
+    level = TestLevel(game)
+    level.input_source = lambda: {"move_right": True}
+    level.voice_source = lambda: []
+    presenter = presenter_cls()
+    canvas = presenter.begin_frame()
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        level.update(dt)
+        t_ready = time.perf_counter()
+        canvas.fill((0, 0, 0, 0))
+        level.draw_world(canvas)
+        presenter.present(canvas, level.draw_ui, t_ready)
+        canvas = presenter.begin_frame()
+    presenter.stop()
+    wall = time.perf_counter() - t0
+    return frames / wall, presenter.mean_latency_ms
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=600)
+    ap.add_argument("--window", default="3840x2160")
+    args = ap.parse_args()
+
+    w, h = (int(v) for v in args.window.split("x"))
+    HeadlessGame()   # init pygame/fuentes
+    pygame.display.set_mode((w, h))
+    for name, cls in (("serie", SerialPresenter), ("pipeline", PipelinedPresenter)):
+        fps, lat = run(cls, args.frames)
+        print(f"{name:9s} {fps:7.1f} fps  latencia media {lat:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# tools/bench_quality.py
+"""
+Resolución dinámica: costo de dibujar + presentar el nivel de prueba en cada escalón de
+RES_SCALES, y cómo se asienta el QualityController con un presupuesto dado.
+
+    python -m tools.bench_quality [--frames 200] [--window 1920x1080] [--budget-ms 8]
+"""
+import argparse, os, time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from core.config import RES_SCALES, VIRTUAL_W, VIRTUAL_H
+from core.headless import HeadlessGame
+from core.present import SerialPresenter
+from engine.quality import QualityController
+from levels.test_level import TestLevel
+
+
+def frame(level, presenter, canvas, scale):
+    t0 = time.perf_counter()
+    level.update(1 / 60)
+    level.render_scale = scale
+    canvas.fill((0, 0, 0, 0), (0, 0, round(VIRTUAL_W * scale), round(VIRTUAL_H * scale)))
+    level.draw_world(canvas)
+    presenter.present(canvas, level.draw_ui, render_scale=scale)
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=200)
+    ap.add_argument("--window", default="1920x1080")
+    ap.add_argument("--budget-ms", type=float, default=8.0, help="presupuesto para la prueba del controlador")
+    args = ap.parse_args()
+
+    w, h = (int(v) for v in args.window.split("x"))
+    game = HeadlessGame()
+    pygame.display.set_mode((w, h))
+    level = TestLevel(game)
+    level.input_source = lambda: {"move_right": True}
+    level.voice_source = lambda: []
+    presenter = SerialPresenter()
+    canvas = presenter.begin_frame()
+
+    for scale in RES_SCALES:
+        ms = sorted(frame(level, presenter, canvas, scale) for _ in range(args.frames))
+        print(f"escala {scale:4.2f}: mediana {ms[len(ms) // 2]:6.2f} ms  p95 {ms[int(len(ms) * 0.95)]:6.2f} ms")
+
+    q = QualityController(args.budget_ms, RES_SCALES)
+    trace = []
+    for _ in range(args.frames * 3):
+        q.observe(frame(level, presenter, canvas, q.scale))
+        trace.append(q.scale)
+    print(f"controlador (presupuesto {args.budget_ms} ms): escala final {q.scale}, "
+          f"{q.changes} cambios en {len(trace)} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# tools/bench_render.py
+"""
+Cola de dibujo vs dibujo inmediato: una pantalla llena de enemigos, balas y suelo en
+tramos de 32 px. Compara draw() entidad por entidad con submit() + flush().
+
+    python -m tools.bench_render [--enemies 300] [--bullets 600] [--frames 300]
+"""
+import argparse, time
+import pygame
+from core.headless import HeadlessGame
+from core.config import VIRTUAL_W, VIRTUAL_H, COLOR_TILE
+from engine.render import RenderQueue, Layer
+from entities.enemy import EnemyBase
+from entities.bullet import Bullet
+from entities.player import Player
+
+
+def make_scene(n_enemies, n_bullets):
+    ground_y = VIRTUAL_H - 160
+    tiles = [pygame.Rect(x, ground_y, 32, 80) for x in range(0, VIRTUAL_W, 32)]
+    enemies = [EnemyBase(40 + (i * 37) % (VIRTUAL_W - 80), 100 + (i * 53) % (ground_y - 140))
+               for i in range(n_enemies)]
+    for e in enemies[::3]:
+        e.hp, e.show_hp_until = 2, 1e12     # un tercio con barra de vida
+    bullets = [Bullet((i * 29) % VIRTUAL_W, 80 + (i * 17) % (ground_y - 100), color=(255, 220, 80))
+               for i in range(n_bullets)]
+    player = Player(400, ground_y - 128)
+    return tiles, enemies, bullets, player
+
+
+def draw_immediate(screen, tiles, enemies, bullets, player):
+    screen.fill((0, 0, 0))
+    for t in tiles:
+        pygame.draw.rect(screen, COLOR_TILE, t)
+    for e in enemies: e.draw(screen)
+    for b in bullets: b.draw(screen)
+    player.draw(screen)
+
+
+def draw_queued(screen, q, tiles, enemies, bullets, player):
+    q.begin((0, 0))
+    screen.fill((0, 0, 0))
+    for t in tiles:
+        q.fill(t, COLOR_TILE, Layer.TILES)
+    for e in enemies: e.submit(q)
+    for b in bullets: b.submit(q)
+    player.submit(q)
+    q.flush(screen)
+
+
+def _time(fn, frames):
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for _ in range(frames):
+            fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0 / frames
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--enemies", type=int, default=300)
+    ap.add_argument("--bullets", type=int, default=600)
+    ap.add_argument("--frames", type=int, default=300)
+    args = ap.parse_args()
+
+    game = HeadlessGame()
+    scene = make_scene(args.enemies, args.bullets)
+    q = RenderQueue()
+    canvas = game.canvas
+    imm = _time(lambda: draw_immediate(canvas, *scene), args.frames)
+    que = _time(lambda: draw_queued(canvas, q, *scene), args.frames)
+    n = len(scene[0]) + len(scene[1]) + len(scene[2]) + 1
+    print(f"{n} objetos en pantalla")
+    print(f"inmediato : {imm:7.3f} ms/frame")
+    print(f"cola      : {que:7.3f} ms/frame  ({q.commands} comandos)")
+    print(f"speedup   : {imm / max(que, 1e-9):7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
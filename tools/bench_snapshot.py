@@ -0,0 +1,79 @@
+# tools/bench_snapshot.py
+"""
+Costo de los snapshots del nivel: tiempo por tick (snapshot solo y push al buffer de
+rebobinado), tamaño crudo / keyframe / delta, memoria por segundo de historia y
+tiempo de restaurar y de rebobinar.
+
+    python -m tools.bench_snapshot [--seconds 30] [--hz 60] [--enemies 40]
+"""
+import argparse, contextlib, io, time
+from core.headless import HeadlessGame
+from core.snapshot import snapshot, restore, RewindBuffer
+from levels.test_level import TestLevel
+
+WORDS = ("rayo ralentizar", "congelar quimica", "burbuja curar golpe", "pulso remache")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=30.0)
+    ap.add_argument("--hz", type=int, default=60)
+    ap.add_argument("--enemies", type=int, default=40, help="enemigos extra además de los del mapa")
+    args = ap.parse_args()
+
+    level = TestLevel(HeadlessGame())
+    level.rewind = None   # se mide aparte
+    for name in level.player.powers.book.by_name:
+        level.player.unlock_power(name)
+    x0 = level.player.rect.x
+    for i in range(args.enemies):
+        level.spawn_enemy(x0 + 200 + 60 * (i % 20), level.player.rect.y - 40 * (i // 20))
+    tick = [0]
+    level.input_source = lambda: {"move_right": (tick[0] // 90) % 2 == 0, "move_left": (tick[0] // 90) % 2 == 1,
+                                  "jump": tick[0] % 45 == 0, "attack": tick[0] % 30 == 5}
+    level.voice_source = lambda: [WORDS[(tick[0] // 40) % 4]] if tick[0] % 40 == 3 else []
+
+    buf = RewindBuffer(seconds=args.seconds)
+    frames = int(args.seconds * args.hz)
+    dt = 1.0 / args.hz
+    sim = snap = push = 0.0
+    raw_bytes = 0
+    with contextlib.redirect_stdout(io.StringIO()):   # el nivel imprime las frases de voz
+        for f in range(frames):
+            tick[0] = f
+            t0 = time.perf_counter()
+            level.update(dt)
+            t1 = time.perf_counter()
+            raw_bytes += len(snapshot(level))
+            t2 = time.perf_counter()
+            buf.push(level)
+            t3 = time.perf_counter()
+            sim += t1 - t0
+            snap += t2 - t1
+            push += t3 - t2
+
+    keys = [g[1][0][2] for g in buf._groups]
+    deltas = [e[2] for g in buf._groups for e in g[1][1:]]
+    print(f"entidades: {len(level.enemies)} enemigos, {len(level.bullets)} balas, "
+          f"{level.status.count()} estados activos al final")
+    print(f"simulación:  {sim / frames * 1000:6.3f} ms/tick")
+    print(f"snapshot:    {snap / frames * 1000:6.3f} ms/tick  ({raw_bytes / frames:.0f} B crudos)")
+    print(f"push:        {push / frames * 1000:6.3f} ms/tick  (snapshot + delta + zlib)")
+    print(f"keyframe:    {sum(map(len, keys)) / max(1, len(keys)):.0f} B   "
+          f"delta: {sum(map(len, deltas)) / max(1, len(deltas)):.0f} B (promedio)")
+    print(f"historia:    {buf.span_seconds:.1f} s en {buf.bytes / 1024:.0f} KB "
+          f"= {buf.bytes / 1024 / max(buf.span_seconds, 1e-9):.1f} KB/s a {args.hz} Hz")
+
+    blob = snapshot(level)
+    t0 = time.perf_counter()
+    for _ in range(100):
+        restore(level, blob)
+    print(f"restore:     {(time.perf_counter() - t0) * 10:6.3f} ms")
+    t0 = time.perf_counter()
+    buf.rewind(level, min(5.0, args.seconds / 2))
+    print(f"rebobinar {min(5.0, args.seconds / 2):g} s: {(time.perf_counter() - t0) * 1000:6.3f} ms "
+          f"(keyframe + deltas hasta el instante pedido)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# tools/bench_status.py
+"""
+Estados alterados sobre muchos enemigos: costo por frame del StatusEngine (rueda de
+temporizadores) frente a la alternativa ingenua de descontar un timer por estado activo.
+
+    python -m tools.bench_status [--n 5000] [--seconds 10] [--hz 60]
+"""
+import argparse, random, time
+from engine.status import StatusEngine, StatusSpec
+from entities.enemy import EnemyBase
+
+SPECS = (StatusSpec("slow", 3000, 0.4), StatusSpec("freeze", 2000), StatusSpec("stun", 1200),
+         StatusSpec("dot", 4000, 1, 1000))
+
+
+def run_wheel(enemies, hits, frames, dt_ms):
+    engine = StatusEngine()
+    fired = 0
+    t0 = time.perf_counter()
+    for f in range(frames):
+        now = f * dt_ms
+        for e, spec in hits.get(f, ()):
+            engine.apply(e, spec, now)
+        engine.scheduler.update(now)
+        fired += engine.scheduler.fired
+    return time.perf_counter() - t0, fired, engine.count()
+
+
+def run_naive(enemies, hits, frames, dt_ms):
+    """Un dict de timers por enemigo que se descuenta todos los frames."""
+    timers = {}
+    t0 = time.perf_counter()
+    for f in range(frames):
+        for e, spec in hits.get(f, ()):
+            timers.setdefault(e, {})[spec.kind] = [spec.duration_ms, spec.period_ms]
+        for e, active in timers.items():
+            for kind in list(active):
+                t = active[kind]
+                t[0] -= dt_ms
+                if t[1]:
+                    t[1] -= dt_ms
+                    if t[1] <= 0:
+                        t[1] += 1000
+                if t[0] <= 0:
+                    del active[kind]
+    return time.perf_counter() - t0, sum(len(a) for a in timers.values())
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=5000)
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--hz", type=int, default=60)
+    args = ap.parse_args()
+
+    rnd = random.Random(1)
+    enemies = [EnemyBase(i * 40, 0) for i in range(args.n)]
+    for e in enemies:
+        e.hp = e.max_hp = 10 ** 6   # que el veneno no los mate
+    frames = int(args.seconds * args.hz)
+    dt_ms = 1000.0 / args.hz
+    # cada enemigo recibe ~1 estado por segundo
+    hits = {}
+    for _ in range(int(args.n * args.seconds)):
+        hits.setdefault(rnd.randrange(frames), []).append((rnd.choice(enemies), rnd.choice(SPECS)))
+
+    wall, fired, active = run_wheel(enemies, hits, frames, dt_ms)
+    print(f"rueda:   {wall / frames * 1000:6.3f} ms/frame  ({fired / frames:.0f} vencimientos+ticks/frame, "
+          f"{active} activos al final)")
+    wall, active = run_naive(enemies, hits, frames, dt_ms)
+    print(f"ingenuo: {wall / frames * 1000:6.3f} ms/frame  ({active} activos al final)")
+
+
+if __name__ == "__main__":
+    main()
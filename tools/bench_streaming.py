@@ -0,0 +1,69 @@
+# tools/bench_streaming.py
+"""
+Streaming de chunks: genera un mapa de tiles enorme, recorre la cámara de punta a punta
+y mide el peor frame de update, chunks cargados (memoria) y cargas síncronas (hitches).
+
+    python -m tools.bench_streaming [--screens 50] [--speed 900]
+"""
+import argparse, json, os, random, tempfile, time
+from core.headless import HeadlessGame
+from core.config import VIRTUAL_W, VIRTUAL_H
+from levels.tilemap_level import TileMapLevel
+
+
+def make_map(screens: int, seed: int = 1) -> dict:
+    tw = 32
+    w, h = VIRTUAL_W * screens // tw, VIRTUAL_H // tw
+    rnd = random.Random(seed)
+    data = [0] * (w * h)
+    for x in range(w):                      # suelo de 3 tiles
+        for y in range(h - 3, h):
+            data[y * w + x] = 1
+    for x in range(6, w - 8, 10):           # plataformas
+        y = rnd.randint(h // 3, h - 6)
+        for dx in range(rnd.randint(3, 8)):
+            data[y * w + x + dx] = 1
+    spawns = [{"type": "player", "x": 96, "y": (h - 8) * tw}]
+    spawns += [{"type": "enemy", "x": x * tw, "y": (h - 5) * tw} for x in range(40, w, 60)]
+    return {"width": w, "height": h, "tilewidth": tw, "tileheight": tw, "orientation": "orthogonal",
+            "properties": [{"name": "name", "type": "string", "value": f"Stream {screens}"}],
+            "layers": [{"type": "tilelayer", "name": "solids", "width": w, "height": h, "data": data},
+                       {"type": "objectgroup", "name": "spawns", "objects": spawns}]}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--screens", type=int, default=50)
+    ap.add_argument("--speed", type=float, default=900.0, help="px/s de la cámara")
+    args = ap.parse_args()
+
+    game = HeadlessGame()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stream.json")
+        with open(path, "w") as f:
+            json.dump(make_map(args.screens), f)
+        t0 = time.perf_counter()
+        level = TileMapLevel(game, path=path)
+        t_load = (time.perf_counter() - t0) * 1000.0
+
+    dt = 1 / 60
+    worst, total, frames, max_loaded = 0.0, 0.0, 0, 0
+    end_x = level.world_bounds.right
+    while level.player.rect.right < end_x - 64:
+        level.player.rect.x += int(args.speed * dt)
+        t0 = time.perf_counter()
+        level.update(dt)
+        level.draw_world(game.canvas)
+        ms = (time.perf_counter() - t0) * 1000.0
+        worst, total, frames = max(worst, ms), total + ms, frames + 1
+        max_loaded = max(max_loaded, len(level.streamer.loaded))
+    level.streamer.shutdown()
+
+    chunks_total = len(set(level.map.chunks_in(level.map.extent)))
+    print(f"mapa: {level.map.width}x{level.map.height} tiles, {chunks_total} chunks (carga inicial {t_load:.1f} ms)")
+    print(f"frames: {frames}  medio {total / frames:.3f} ms  peor {worst:.3f} ms")
+    print(f"chunks cargados máx: {max_loaded}  stats: {level.streamer.stats}")
+
+
+if __name__ == "__main__":
+    main()
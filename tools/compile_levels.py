@@ -0,0 +1,44 @@
+# tools/compile_levels.py
+"""
+Compila los niveles JSON de LEVELS_DIR a binario (LEVEL_CACHE_DIR) y mide la carga.
+
+    python -m tools.compile_levels [--force] [archivos.json ...]
+"""
+import argparse, glob, os, time
+from core.config import LEVELS_DIR
+from levels.compiler import CompiledLevel, cache_path, compile_file, load_level
+from levels.tilemap import TileMap
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("files", nargs="*")
+    ap.add_argument("--force", action="store_true", help="recompilar aunque la caché esté al día")
+    args = ap.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(LEVELS_DIR, "*.json")))
+    for src in files:
+        t0 = time.perf_counter()
+        if args.force:
+            compile_file(src)
+            lvl = CompiledLevel(cache_path(src))
+        else:
+            lvl = load_level(src)
+        t_build = (time.perf_counter() - t0) * 1000.0
+
+        t0 = time.perf_counter()
+        TileMap.load(src)
+        t_json = (time.perf_counter() - t0) * 1000.0
+        t0 = time.perf_counter()
+        CompiledLevel(lvl.path).close()
+        t_bin = (time.perf_counter() - t0) * 1000.0
+
+        cells = sum(lvl.is_solid(x, y) for y in range(lvl.height) for x in range(lvl.width))
+        size = os.path.getsize(lvl.path)
+        print(f"{src}: {cells} tiles sólidos → {len(lvl.objects)} rects, {size} bytes "
+              f"(compilar/abrir {t_build:.1f} ms, JSON {t_json:.1f} ms, binario {t_bin:.2f} ms)")
+        lvl.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# tools/net_loopback.py
+"""
+Servidor y clientes de red en la misma máquina (UDP por 127.0.0.1): el servidor corre en
+un hilo a su tick fijo y los clientes (sin ventana) mandan intents a 60 Hz, reciben
+snapshots e interpolan. Reporta costo del tick del servidor y ancho de banda por cliente.
+
+    python -m tools.net_loopback [--clients 2] [--seconds 10] [--hz 30] [--enemies 0]
+"""
+import argparse, contextlib, io, threading, time
+from core.headless import HeadlessGame
+from core.net import NetServer, NetClient, ROLE_PLAYER, KIND_PLAYER
+from core.input import pack_intents
+from levels.test_level import TestLevel
+
+CLIENT_HZ = 60
+
+
+def _server_loop(server, stop, tick_ms):
+    t_next = time.perf_counter()
+    while not stop.is_set():
+        server.step()
+        tick_ms.append(server.tick_ms)
+        t_next += server.dt
+        delay = t_next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=2)
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--hz", type=int, default=30)
+    ap.add_argument("--enemies", type=int, default=0, help="enemigos extra además de los del mapa")
+    ap.add_argument("--port", type=int, default=0, help="0 = cualquiera libre")
+    args = ap.parse_args()
+
+    level = TestLevel(HeadlessGame())
+    x0 = level.player.rect.x
+    for i in range(args.enemies):
+        level.spawn_enemy(x0 + 200 + 60 * (i % 20), level.player.rect.y - 40 * (i // 20))
+    server = NetServer(level, port=args.port, hz=args.hz)
+    stop, tick_ms = threading.Event(), []
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):   # avisos de conexión y frases de voz del nivel
+        thread = threading.Thread(target=_server_loop, args=(server, stop, tick_ms), daemon=True)
+        thread.start()
+        clients = [NetClient(server.addr).connect() for _ in range(args.clients)]
+        t0 = time.perf_counter()
+        frame, seen = 0, 0
+        while time.perf_counter() - t0 < args.seconds:
+            for c in clients:
+                c.poll()
+                if c.role == ROLE_PLAYER:
+                    mask = pack_intents({"move_right": (frame // 120) % 2 == 0, "move_left": (frame // 120) % 2 == 1,
+                                         "jump": frame % 50 == 0, "attack": frame % 40 == 5})
+                    phrases = ["rayo"] if frame % 90 == 10 else []
+                    c.send_input(mask, phrases)
+                else:
+                    c.send_input(0)
+                view = c.sample()
+                seen += any(r[0] == KIND_PLAYER for r in view.values())
+            frame += 1
+            time.sleep(max(0.0, t0 + frame / CLIENT_HZ - time.perf_counter()))
+        wall = time.perf_counter() - t0
+        stop.set()
+        thread.join(timeout=1.0)
+        for c in clients:
+            c.close()
+    server.close()
+
+    ticks = sorted(tick_ms)
+    budget = 1000.0 / args.hz
+    print(f"servidor: {len(ticks)} ticks a {args.hz} Hz, {len(level.enemies)} enemigos vivos al final")
+    print(f"  tick: media {sum(ticks) / len(ticks):.3f} ms  p95 {ticks[int(len(ticks) * 0.95)]:.3f} ms  "
+          f"máx {ticks[-1]:.3f} ms  (presupuesto {budget:.1f} ms)")
+    for n, c in enumerate(clients):
+        role = "jugador" if c.role == ROLE_PLAYER else "espectador"
+        print(f"cliente {n} ({role}): baja {c.bytes_in / wall / 1024:.2f} KB/s, sube {c.bytes_out / wall / 1024:.2f} KB/s, "
+              f"{c.snapshots / wall:.1f} snapshots/s de {c.bytes_in / max(1, c.snapshots):.0f} B, "
+              f"rtt {c.rtt_ms:.1f} ms, descartados {c.dropped}")
+    for n, peer in enumerate(server.peers.values()):
+        if peer.full_bytes:
+            print(f"  delta vs completo (cliente {n}): {peer.bytes_out / peer.full_bytes:.0%} de los bytes")
+    print(f"frames con el jugador a la vista (interpolado): {seen / max(1, frame * len(clients)):.0%}")
+
+
+if __name__ == "__main__":
+    main()
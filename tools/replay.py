@@ -0,0 +1,30 @@
+# tools/replay.py
+"""
+Reproduce una sesión grabada (python main.py --record sesion.eqr) sin ventana,
+tan rápido como se pueda, verificando los checksums del estado.
+
+    python -m tools.replay sesion.eqr [--repeat 3]
+"""
+import argparse, sys
+from core.replay import replay
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("path")
+    ap.add_argument("--repeat", type=int, default=1, help="repeticiones (para benchmark)")
+    args = ap.parse_args()
+
+    ok = True
+    for n in range(args.repeat):
+        res = replay(args.path)
+        print(f"[{n + 1}] {res.ticks} ticks, {res.sim_seconds:.1f} s simulados en {res.wall_seconds:.2f} s "
+              f"({res.speedup:.1f}x tiempo real), checksums {res.checked - len(res.mismatches)}/{res.checked} ok")
+        for tick, want, got in res.mismatches[:5]:
+            print(f"    divergencia en tick {tick}: esperado {want:08x}, obtenido {got:08x}")
+        ok = ok and not res.mismatches
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()